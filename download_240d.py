@@ -8,6 +8,8 @@ import json
 import redis
 from datetime import datetime, timedelta
 
+from src.metrics import summarize
+
 YAHOO_SYMBOLS = {
     "MNQ": "^IXIC",
     "NVDA": "NVDA",
@@ -106,36 +108,6 @@ def store_in_redis(data, redis_host="localhost", redis_port=6379):
     return total_records
 
 
-def calculate_240d_changes(data):
-    changes = {}
-    for symbol, records in data.items():
-        if len(records) >= 2:
-            start_price = records[0]["close"]
-            end_price = records[-1]["close"]
-            change = ((end_price - start_price) / start_price) * 100
-            changes[symbol] = round(change, 2)
-        else:
-            changes[symbol] = 0.0
-    return changes
-
-
-def get_current_prices(data):
-    current_prices = {}
-    for symbol, records in data.items():
-        if records:
-            current_prices[symbol] = round(records[-1]["close"], 4)
-    return current_prices
-
-
-def calculate_volumes(data):
-    volumes = {}
-    for symbol, records in data.items():
-        if records:
-            avg_vol = sum(r["volume"] for r in records) / len(records)
-            volumes[symbol] = int(avg_vol)
-    return volumes
-
-
 if __name__ == "__main__":
     print("=" * 60)
     print("Downloading 240 days of historical data from Yahoo Finance")
@@ -156,9 +128,10 @@ if __name__ == "__main__":
     print("Calculating metrics...")
     print("=" * 60)
 
-    changes = calculate_240d_changes(data)
-    current_prices = get_current_prices(data)
-    volumes = calculate_volumes(data)
+    summary = summarize(data)
+    changes = summary["changes_240d"]
+    current_prices = summary["current_prices"]
+    volumes = summary["avg_volumes"]
 
     print("\nCurrent Prices:")
     for symbol, price in sorted(current_prices.items()):
@@ -173,14 +146,6 @@ if __name__ == "__main__":
     for symbol, vol in sorted(volumes.items(), key=lambda x: -x[1])[:10]:
         print(f"  {symbol}: {vol:,}")
 
-    summary = {
-        "current_prices": current_prices,
-        "changes_240d": changes,
-        "avg_volumes": volumes,
-        "symbols": list(current_prices.keys()),
-        "total_records": sum(len(records) for records in data.values()),
-    }
-
     with open("/home/printer/Desktop/bot/sugi1/historical_240d_summary.json", "w") as f:
         json.dump(summary, f, indent=2)
 
@@ -9,6 +9,8 @@ import redis
 import pandas as pd
 from datetime import datetime, timedelta
 
+from src.metrics import summarize
+
 # Yahoo Finance symbols mapping
 YAHOO_SYMBOLS = {
     "MNQ": "^IXIC",
@@ -115,51 +117,6 @@ def store_in_redis(data, redis_host="localhost", redis_port=6379):
     return total_records
 
 
-def calculate_100d_changes(data):
-    """Calculate 100-day changes for each symbol"""
-
-    changes = {}
-
-    for symbol, records in data.items():
-        if len(records) >= 100:
-            start_price = records[0]["close"]
-            end_price = records[-1]["close"]
-            change = ((end_price - start_price) / start_price) * 100
-            changes[symbol] = round(change, 2)
-        else:
-            # Use available data
-            if len(records) >= 2:
-                start_price = records[0]["close"]
-                end_price = records[-1]["close"]
-                change = ((end_price - start_price) / start_price) * 100
-                changes[symbol] = round(change, 2)
-            else:
-                changes[symbol] = 0.0
-
-    return changes
-
-
-def get_current_prices(data):
-    """Get current (most recent) prices from historical data"""
-
-    current_prices = {}
-    for symbol, records in data.items():
-        if records:
-            current_prices[symbol] = round(records[-1]["close"], 4)
-    return current_prices
-
-
-def calculate_volumes(data):
-    """Calculate average volumes"""
-
-    volumes = {}
-    for symbol, records in data.items():
-        if records:
-            avg_vol = sum(r["volume"] for r in records) / len(records)
-            volumes[symbol] = int(avg_vol)
-    return volumes
-
-
 if __name__ == "__main__":
     print("=" * 60)
     print("Downloading 100 days of historical data from Yahoo Finance")
@@ -183,9 +140,10 @@ if __name__ == "__main__":
     print("Calculating metrics...")
     print("=" * 60)
 
-    changes = calculate_100d_changes(data)
-    current_prices = get_current_prices(data)
-    volumes = calculate_volumes(data)
+    summary = summarize(data)
+    changes = summary["changes_100d"]
+    current_prices = summary["current_prices"]
+    volumes = summary["avg_volumes"]
 
     print("\nCurrent Prices:")
     for symbol, price in sorted(current_prices.items()):
@@ -200,15 +158,6 @@ if __name__ == "__main__":
     for symbol, vol in sorted(volumes.items(), key=lambda x: -x[1])[:10]:
         print(f"  {symbol}: {vol:,}")
 
-    # Save summary to JSON
-    summary = {
-        "current_prices": current_prices,
-        "changes_100d": changes,
-        "avg_volumes": volumes,
-        "symbols": list(current_prices.keys()),
-        "total_records": sum(len(records) for records in data.values()),
-    }
-
     with open("/home/printer/Desktop/bot/sugi1/historical_data_summary.json", "w") as f:
         json.dump(summary, f, indent=2)
 
@@ -0,0 +1,171 @@
+package com.financial.backend.api;
+
+import com.financial.backend.model.EquityData;
+
+import java.io.ByteArrayOutputStream;
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
+import java.nio.charset.StandardCharsets;
+import java.util.ArrayList;
+import java.util.HashMap;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.function.Function;
+import java.util.function.ToDoubleFunction;
+
+/**
+ * Encodes equity records as a self-describing, little-endian columnar buffer.
+ *
+ * Layout: 8-byte magic {@code EQCOL1\0\0}, int32 row count, int32 column count,
+ * then per column an int16 name length, the UTF-8 name and a type byte,
+ * zero padding to an 8-byte boundary and the column data:
+ * FLOAT64 and INT64 columns hold one value per row (NaN for missing doubles),
+ * DICT_UTF8 columns hold an int32 dictionary size, int32-length-prefixed
+ * UTF-8 entries, padding to 8 bytes and one int32 code per row (-1 for null).
+ * Every column ends padded to 8 bytes so readers can map values in place.
+ */
+public final class ColumnarEncoder {
+    public static final String MEDIA_TYPE = "application/vnd.equity.columnar";
+
+    static final byte[] MAGIC = {'E', 'Q', 'C', 'O', 'L', '1', 0, 0};
+    static final byte FLOAT64 = 1;
+    static final byte INT64 = 2;
+    static final byte DICT_UTF8 = 3;
+
+    private static final Map<String, ToDoubleFunction<EquityData>> DOUBLE_COLUMNS = new LinkedHashMap<>();
+
+    static {
+        DOUBLE_COLUMNS.put("open", EquityData::getOpen);
+        DOUBLE_COLUMNS.put("high", EquityData::getHigh);
+        DOUBLE_COLUMNS.put("low", EquityData::getLow);
+        DOUBLE_COLUMNS.put("close", EquityData::getClose);
+        DOUBLE_COLUMNS.put("volume", EquityData::getVolume);
+        DOUBLE_COLUMNS.put("adjusted_close", EquityData::getAdjustedClose);
+        DOUBLE_COLUMNS.put("rsi", eq -> eq.getRsi() != null ? eq.getRsi() : Double.NaN);
+        for (String key : new String[] {"ma_5", "ma_10", "ma_20", "ma_50"}) {
+            DOUBLE_COLUMNS.put(key, eq -> lookup(eq.getMovingAverages(), key));
+        }
+        DOUBLE_COLUMNS.put("macd", eq -> lookup(eq.getMacd(), "macd"));
+        DOUBLE_COLUMNS.put("macd_signal", eq -> lookup(eq.getMacd(), "signal"));
+        DOUBLE_COLUMNS.put("macd_histogram", eq -> lookup(eq.getMacd(), "histogram"));
+    }
+
+    private ColumnarEncoder() {
+    }
+
+    /** True when an Accept header asks for the columnar format. */
+    public static boolean accepts(String acceptHeader) {
+        return acceptHeader != null && acceptHeader.contains(MEDIA_TYPE);
+    }
+
+    public static byte[] encode(List<EquityData> data) {
+        Writer out = new Writer();
+        int n = data.size();
+
+        out.write(MAGIC);
+        out.writeInt(n);
+        out.writeInt(3 + DOUBLE_COLUMNS.size());
+
+        writeStrings(out, "symbol", data, EquityData::getSymbol);
+
+        out.writeColumnHeader("timestamp", INT64);
+        ByteBuffer timestamps = out.buffer(n * 8);
+        for (EquityData eq : data) {
+            timestamps.putLong(eq.getTimestamp());
+        }
+        out.write(timestamps);
+
+        writeStrings(out, "date", data, EquityData::getDate);
+
+        for (Map.Entry<String, ToDoubleFunction<EquityData>> column : DOUBLE_COLUMNS.entrySet()) {
+            out.writeColumnHeader(column.getKey(), FLOAT64);
+            ByteBuffer values = out.buffer(n * 8);
+            ToDoubleFunction<EquityData> getter = column.getValue();
+            for (EquityData eq : data) {
+                values.putDouble(getter.applyAsDouble(eq));
+            }
+            out.write(values);
+        }
+
+        return out.toByteArray();
+    }
+
+    private static void writeStrings(Writer out, String name, List<EquityData> data,
+                                     Function<EquityData, String> getter) {
+        Map<String, Integer> codes = new HashMap<>();
+        List<byte[]> dictionary = new ArrayList<>();
+        ByteBuffer indices = out.buffer(data.size() * 4);
+
+        for (EquityData eq : data) {
+            String value = getter.apply(eq);
+            if (value == null) {
+                indices.putInt(-1);
+                continue;
+            }
+            Integer code = codes.get(value);
+            if (code == null) {
+                code = dictionary.size();
+                codes.put(value, code);
+                dictionary.add(value.getBytes(StandardCharsets.UTF_8));
+            }
+            indices.putInt(code);
+        }
+
+        out.writeColumnHeader(name, DICT_UTF8);
+        out.writeInt(dictionary.size());
+        for (byte[] entry : dictionary) {
+            out.writeInt(entry.length);
+            out.write(entry);
+        }
+        out.pad();
+        out.write(indices);
+    }
+
+    private static double lookup(Map<String, Double> values, String key) {
+        if (values == null) {
+            return Double.NaN;
+        }
+        Double value = values.get(key);
+        return value != null ? value : Double.NaN;
+    }
+
+    private static final class Writer {
+        private final ByteArrayOutputStream bytes = new ByteArrayOutputStream();
+
+        ByteBuffer buffer(int size) {
+            return ByteBuffer.allocate(size).order(ByteOrder.LITTLE_ENDIAN);
+        }
+
+        void write(byte[] data) {
+            bytes.write(data, 0, data.length);
+        }
+
+        void write(ByteBuffer buffer) {
+            bytes.write(buffer.array(), 0, buffer.position());
+            pad();
+        }
+
+        void writeInt(int value) {
+            write(buffer(4).putInt(value).array());
+        }
+
+        void writeColumnHeader(String name, byte type) {
+            byte[] encoded = name.getBytes(StandardCharsets.UTF_8);
+            write(buffer(2).putShort((short) encoded.length).array());
+            write(encoded);
+            bytes.write(type);
+            pad();
+        }
+
+        void pad() {
+            while (bytes.size() % 8 != 0) {
+                bytes.write(0);
+            }
+        }
+
+        byte[] toByteArray() {
+            return bytes.toByteArray();
+        }
+    }
+}
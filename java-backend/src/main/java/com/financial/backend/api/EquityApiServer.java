@@ -1,5 +1,6 @@
 package com.financial.backend.api;
 
+import com.fasterxml.jackson.core.JsonGenerator;
 import com.fasterxml.jackson.databind.ObjectMapper;
 import com.financial.backend.model.EquityData;
 import com.financial.backend.service.RedisService;
@@ -9,31 +10,55 @@ import com.sun.net.httpserver.HttpServer;
 import org.slf4j.Logger;
 import org.slf4j.LoggerFactory;
 
+import java.io.BufferedOutputStream;
 import java.io.IOException;
 import java.io.OutputStream;
 import java.net.InetSocketAddress;
 import java.nio.charset.StandardCharsets;
 import java.util.List;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.atomic.AtomicInteger;
+import java.util.zip.GZIPOutputStream;
 
 public class EquityApiServer {
     private static final Logger logger = LoggerFactory.getLogger(EquityApiServer.class);
     private static final int PORT = 8080;
+    private static final int DEFAULT_WORKERS = Integer.getInteger("api.workers", 16);
+    private static final int BUFFER_SIZE = 64 * 1024;
     
     private final HttpServer server;
+    private final ExecutorService executor;
     private final RedisService redisService;
     private final ObjectMapper objectMapper;
     
     public EquityApiServer(RedisService redisService) throws IOException {
+        this(redisService, DEFAULT_WORKERS);
+    }
+    
+    /**
+     * @param workers size of the request worker pool; the default can be set
+     *                with {@code -Dapi.workers=N}
+     */
+    public EquityApiServer(RedisService redisService, int workers) throws IOException {
         this.redisService = redisService;
         this.objectMapper = new ObjectMapper();
+        // Response streams are closed by the handlers, not by Jackson
+        this.objectMapper.getFactory().disable(JsonGenerator.Feature.AUTO_CLOSE_TARGET);
         this.server = HttpServer.create(new InetSocketAddress(PORT), 0);
         
         server.createContext("/api/equity/symbol", new SymbolHandler());
         server.createContext("/api/equity/all", new AllDataHandler());
         server.createContext("/api/health", new HealthHandler());
         
-        server.setExecutor(null);
-        logger.info("API server started on port {}", PORT);
+        AtomicInteger threadIndex = new AtomicInteger();
+        this.executor = Executors.newFixedThreadPool(workers, runnable -> {
+            Thread thread = new Thread(runnable, "api-worker-" + threadIndex.incrementAndGet());
+            thread.setDaemon(true);
+            return thread;
+        });
+        server.setExecutor(executor);
+        logger.info("API server started on port {} with {} workers", PORT, workers);
     }
     
     public void start() {
@@ -42,6 +67,7 @@ public class EquityApiServer {
     
     public void stop() {
         server.stop(0);
+        executor.shutdown();
     }
     
     private class SymbolHandler implements HttpHandler {
@@ -60,16 +86,31 @@ public class EquityApiServer {
                 if (limitStr != null) {
                     limit = Integer.parseInt(limitStr);
                 }
+                Long from = parseTimestamp(getQueryParam(query, "from"));
+                Long to = parseTimestamp(getQueryParam(query, "to"));
                 
                 if (symbol == null) {
                     sendResponse(exchange, 400, "Missing symbol");
                     return;
                 }
                 
-                List<EquityData> data = redisService.getEquityDataBySymbol(symbol, limit);
-                String response = objectMapper.writeValueAsString(data);
-                sendResponse(exchange, 200, response);
+                // The ETag covers the data set version and everything that
+                // changes the representation (range, limit, format)
+                boolean columnar = ColumnarEncoder.accepts(exchange.getRequestHeaders().getFirst("Accept"));
+                String etag = "\"" + symbol + "-" + from + "-" + to + "-" + limit + "-"
+                        + redisService.getSymbolVersion(symbol) + (columnar ? "-c" : "-j") + "\"";
+                exchange.getResponseHeaders().set("ETag", etag);
+                if (etag.equals(exchange.getRequestHeaders().getFirst("If-None-Match"))) {
+                    exchange.sendResponseHeaders(304, -1);
+                    exchange.close();
+                    return;
+                }
+                
+                List<EquityData> data = redisService.getEquityDataRange(symbol, from, to, limit);
+                sendData(exchange, data);
                 
+            } catch (NumberFormatException e) {
+                sendResponse(exchange, 400, "Invalid numeric parameter");
             } catch (Exception e) {
                 logger.error("Error: {}", e.getMessage());
                 sendResponse(exchange, 500, "Internal Server Error");
@@ -82,8 +123,7 @@ public class EquityApiServer {
         public void handle(HttpExchange exchange) throws IOException {
             try {
                 List<EquityData> data = redisService.getAllRecentData();
-                String response = objectMapper.writeValueAsString(data);
-                sendResponse(exchange, 200, response);
+                sendData(exchange, data);
             } catch (Exception e) {
                 logger.error("Error: {}", e.getMessage());
                 sendResponse(exchange, 500, "Internal Server Error");
@@ -99,11 +139,48 @@ public class EquityApiServer {
         }
     }
     
+    /**
+     * Serialize records straight into the (optionally gzipped) response
+     * stream, in the columnar format when the client accepts it.
+     */
+    private void sendData(HttpExchange exchange, List<EquityData> data) throws IOException {
+        boolean columnar = ColumnarEncoder.accepts(exchange.getRequestHeaders().getFirst("Accept"));
+        String contentType = columnar ? ColumnarEncoder.MEDIA_TYPE : "application/json";
+        
+        try (OutputStream os = openBody(exchange, 200, contentType)) {
+            if (columnar) {
+                os.write(ColumnarEncoder.encode(data));
+            } else {
+                objectMapper.writeValue(os, data);
+            }
+        }
+    }
+    
+    /**
+     * Start a chunked response, gzip-compressed when the client sends
+     * {@code Accept-Encoding: gzip}. Closing the stream completes the exchange.
+     */
+    private OutputStream openBody(HttpExchange exchange, int statusCode, String contentType) throws IOException {
+        exchange.getResponseHeaders().set("Content-Type", contentType);
+        exchange.getResponseHeaders().set("Vary", "Accept-Encoding");
+        
+        String acceptEncoding = exchange.getRequestHeaders().getFirst("Accept-Encoding");
+        if (acceptEncoding != null && acceptEncoding.contains("gzip")) {
+            exchange.getResponseHeaders().set("Content-Encoding", "gzip");
+            exchange.sendResponseHeaders(statusCode, 0);
+            return new GZIPOutputStream(exchange.getResponseBody(), BUFFER_SIZE);
+        }
+        
+        exchange.sendResponseHeaders(statusCode, 0);
+        return new BufferedOutputStream(exchange.getResponseBody(), BUFFER_SIZE);
+    }
+    
     private void sendResponse(HttpExchange exchange, int statusCode, String response) throws IOException {
+        byte[] body = response.getBytes(StandardCharsets.UTF_8);
         exchange.getResponseHeaders().set("Content-Type", "application/json");
-        exchange.sendResponseHeaders(statusCode, response.getBytes(StandardCharsets.UTF_8).length);
+        exchange.sendResponseHeaders(statusCode, body.length);
         try (OutputStream os = exchange.getResponseBody()) {
-            os.write(response.getBytes(StandardCharsets.UTF_8));
+            os.write(body);
         }
     }
     
@@ -117,4 +194,8 @@ public class EquityApiServer {
         }
         return null;
     }
+    
+    private static Long parseTimestamp(String value) {
+        return value != null ? Long.valueOf(value) : null;
+    }
 }
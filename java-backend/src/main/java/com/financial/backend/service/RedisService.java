@@ -7,16 +7,25 @@ import org.slf4j.LoggerFactory;
 import redis.clients.jedis.Jedis;
 import redis.clients.jedis.JedisPool;
 import redis.clients.jedis.JedisPoolConfig;
+import redis.clients.jedis.params.XAddParams;
 
 import java.io.IOException;
 import java.time.Duration;
 import java.util.ArrayList;
+import java.util.Collections;
+import java.util.HashMap;
 import java.util.List;
-import java.util.Set;
+import java.util.Map;
 
 public class RedisService {
     private static final Logger logger = LoggerFactory.getLogger(RedisService.class);
     
+    /** Stream (consumer groups) and pub/sub channel carrying new-bar events. */
+    public static final String EVENTS_KEY = "events:equity";
+    private static final long EVENTS_MAX_LEN = 100_000;
+    /** Per-symbol counter bumped on every write, used for ETags. */
+    private static final String VERSION_KEY_PREFIX = "version:";
+    
     private final JedisPool jedisPool;
     private final ObjectMapper objectMapper;
     private final int ttlSeconds;
@@ -40,6 +49,8 @@ public class RedisService {
     public void storeBatch(List<EquityData> dataList) {
         try (Jedis jedis = jedisPool.getResource()) {
             redis.clients.jedis.Pipeline pipeline = jedis.pipelined();
+            Map<String, EquityData> newest = new HashMap<>();
+            Map<String, Integer> counts = new HashMap<>();
             
             for (EquityData data : dataList) {
                 String key = generateKey(data.getSymbol(), data.getTimestamp());
@@ -50,8 +61,16 @@ public class RedisService {
                 String symbolIndexKey = "symbol:" + data.getSymbol();
                 pipeline.zadd(symbolIndexKey, data.getTimestamp(), key);
                 pipeline.expire(symbolIndexKey, ttlSeconds);
+                
+                newest.merge(data.getSymbol(), data,
+                        (a, b) -> a.getTimestamp() >= b.getTimestamp() ? a : b);
+                counts.merge(data.getSymbol(), 1, Integer::sum);
             }
             
+            for (String symbol : counts.keySet()) {
+                pipeline.incr(VERSION_KEY_PREFIX + symbol);
+            }
+            publishNewBars(pipeline, newest, counts);
             pipeline.sync();
             logger.info("Batch stored {} records with {} day TTL", dataList.size(), ttlSeconds / 86400);
         } catch (IOException e) {
@@ -59,22 +78,71 @@ public class RedisService {
         }
     }
     
+    /**
+     * Announce one event per symbol with the newest stored timestamp and
+     * the number of bars written, on a capped stream for consumer groups
+     * and on the pub/sub channel of the same name for simple listeners.
+     */
+    private void publishNewBars(redis.clients.jedis.Pipeline pipeline,
+                                Map<String, EquityData> newest, Map<String, Integer> counts)
+            throws IOException {
+        for (Map.Entry<String, EquityData> entry : newest.entrySet()) {
+            String symbol = entry.getKey();
+            long timestamp = entry.getValue().getTimestamp();
+            int count = counts.get(symbol);
+            
+            Map<String, String> event = new HashMap<>();
+            event.put("symbol", symbol);
+            event.put("timestamp", Long.toString(timestamp));
+            event.put("count", Integer.toString(count));
+            pipeline.xadd(EVENTS_KEY, XAddParams.xAddParams().maxLen(EVENTS_MAX_LEN).approximateTrimming(), event);
+            pipeline.publish(EVENTS_KEY, objectMapper.writeValueAsString(event));
+        }
+    }
+    
     public List<EquityData> getEquityDataBySymbol(String symbol, int limit) {
+        return getEquityDataRange(symbol, null, null, limit);
+    }
+    
+    /**
+     * The newest {@code limit} records of a symbol with {@code from <= timestamp <= to},
+     * in chronological order. Reads the {@code symbol:{symbol}} sorted set
+     * with one ZREVRANGEBYSCORE and fetches the records with one MGET, so the
+     * cost depends on the rows returned rather than on the keyspace size.
+     *
+     * @param from inclusive lower timestamp bound, or null for no bound
+     * @param to   inclusive upper timestamp bound, or null for no bound
+     */
+    public List<EquityData> getEquityDataRange(String symbol, Long from, Long to, int limit) {
+        List<EquityData> results = new ArrayList<>();
+        if (limit <= 0) {
+            return results;
+        }
+        
         try (Jedis jedis = jedisPool.getResource()) {
-            String pattern = "equity:" + symbol + ":*";
-            List<EquityData> results = new ArrayList<>();
-            Set<String> keys = jedis.keys(pattern);
+            double max = to != null ? to : Double.POSITIVE_INFINITY;
+            double min = from != null ? from : Double.NEGATIVE_INFINITY;
+            List<String> keys = jedis.zrevrangeByScore("symbol:" + symbol, max, min, 0, limit);
+            if (keys.isEmpty()) {
+                return results;
+            }
             
-            if (keys != null && !keys.isEmpty()) {
-                List<String> keyList = new ArrayList<>(keys);
-                int start = Math.max(0, keyList.size() - limit);
-                for (int i = start; i < keyList.size(); i++) {
-                    String value = jedis.get(keyList.get(i));
-                    if (value != null) {
-                        results.add(objectMapper.readValue(value, EquityData.class));
-                    }
+            // Newest first from the index; reverse to chronological order
+            Collections.reverse(keys);
+            List<String> values = jedis.mget(keys.toArray(new String[0]));
+            List<String> expired = new ArrayList<>();
+            for (int i = 0; i < values.size(); i++) {
+                String value = values.get(i);
+                // Index members can outlive their expired records
+                if (value != null) {
+                    results.add(objectMapper.readValue(value, EquityData.class));
+                } else {
+                    expired.add(keys.get(i));
                 }
             }
+            if (!expired.isEmpty()) {
+                pruneExpired(jedis, symbol, expired);
+            }
             
             return results;
         } catch (IOException e) {
@@ -83,6 +151,61 @@ public class RedisService {
         }
     }
     
+    /**
+     * Version of a symbol's data set, from the {@code version:{symbol}}
+     * counter that {@link #storeBatch} increments on every write, so new,
+     * rewritten and corrected bars all change it.
+     *
+     * <p>Record expiry is folded in lazily: index members whose record has
+     * expired are removed, and the counter bumped, when a range read finds
+     * them or when the oldest indexed record is gone here. The oldest bars
+     * are written first and expire first, so checking one member per call
+     * keeps this O(1) in the common case.
+     */
+    public String getSymbolVersion(String symbol) {
+        try (Jedis jedis = jedisPool.getResource()) {
+            List<String> oldest = jedis.zrange("symbol:" + symbol, 0, 0);
+            if (!oldest.isEmpty() && !jedis.exists(oldest.get(0))) {
+                pruneExpiredPrefix(jedis, symbol);
+            }
+            String version = jedis.get(VERSION_KEY_PREFIX + symbol);
+            return version != null ? version : "0";
+        }
+    }
+    
+    /** Drop index members of expired records and bump the symbol's version. */
+    private void pruneExpired(Jedis jedis, String symbol, List<String> expiredKeys) {
+        jedis.zrem("symbol:" + symbol, expiredKeys.toArray(new String[0]));
+        jedis.incr(VERSION_KEY_PREFIX + symbol);
+    }
+    
+    /** Prune expired records from the oldest end of the index, in pages. */
+    private void pruneExpiredPrefix(Jedis jedis, String symbol) {
+        final int page = 1000;
+        List<String> expired = new ArrayList<>();
+        for (long start = 0; ; start += page) {
+            List<String> keys = jedis.zrange("symbol:" + symbol, start, start + page - 1);
+            if (keys.isEmpty()) {
+                break;
+            }
+            List<String> values = jedis.mget(keys.toArray(new String[0]));
+            boolean reachedLive = false;
+            for (int i = 0; i < values.size(); i++) {
+                if (values.get(i) != null) {
+                    reachedLive = true;
+                    break;
+                }
+                expired.add(keys.get(i));
+            }
+            if (reachedLive || keys.size() < page) {
+                break;
+            }
+        }
+        if (!expired.isEmpty()) {
+            pruneExpired(jedis, symbol, expired);
+        }
+    }
+    
     public List<EquityData> getAllRecentData() {
         List<EquityData> allData = new ArrayList<>();
         String[] symbols = {"MNQ", "NVDA", "AMD", "WDC", "SLV", "GS", "NET", "EWJ", "EURUSD", "INRJPY", "BRLGBP", "STLD", "CRCL", "UBS", "TTWO", "ETHUSD"};
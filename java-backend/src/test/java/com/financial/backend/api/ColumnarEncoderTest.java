@@ -0,0 +1,74 @@
+package com.financial.backend.api;
+
+import com.financial.backend.model.EquityData;
+import org.junit.Test;
+
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
+import java.nio.charset.StandardCharsets;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.List;
+
+import static org.junit.Assert.*;
+
+public class ColumnarEncoderTest {
+
+    @Test
+    public void testAccepts() {
+        assertTrue(ColumnarEncoder.accepts(ColumnarEncoder.MEDIA_TYPE));
+        assertTrue(ColumnarEncoder.accepts("application/json;q=0.5, " + ColumnarEncoder.MEDIA_TYPE));
+        assertFalse(ColumnarEncoder.accepts("application/json"));
+        assertFalse(ColumnarEncoder.accepts(null));
+    }
+
+    @Test
+    public void testEncodeLayout() {
+        List<EquityData> data = new ArrayList<>();
+        data.add(new EquityData("NVDA", 1000L, 1.0, 2.0, 0.5, 1.5, 100.0, 1.5));
+        data.add(new EquityData("AMD", 2000L, 3.0, 4.0, 2.5, 3.5, 200.0, 3.5));
+        data.add(new EquityData("NVDA", 3000L, 5.0, 6.0, 4.5, 5.5, 300.0, 5.5));
+
+        byte[] encoded = ColumnarEncoder.encode(data);
+        ByteBuffer buf = ByteBuffer.wrap(encoded).order(ByteOrder.LITTLE_ENDIAN);
+
+        assertEquals(0, encoded.length % 8);
+        assertArrayEquals(ColumnarEncoder.MAGIC, Arrays.copyOfRange(encoded, 0, 8));
+        buf.position(8);
+        assertEquals(3, buf.getInt());
+        buf.getInt();
+
+        // symbol: dictionary of two entries, codes 0, 1, 0
+        assertEquals("symbol", readName(buf));
+        assertEquals(ColumnarEncoder.DICT_UTF8, buf.get());
+        align(buf);
+        assertEquals(2, buf.getInt());
+        int len = buf.getInt();
+        byte[] first = new byte[len];
+        buf.get(first);
+        assertEquals("NVDA", new String(first, StandardCharsets.UTF_8));
+        buf.position(buf.position() + buf.getInt());
+        align(buf);
+        assertEquals(0, buf.getInt());
+        assertEquals(1, buf.getInt());
+        assertEquals(0, buf.getInt());
+        align(buf);
+
+        assertEquals("timestamp", readName(buf));
+        assertEquals(ColumnarEncoder.INT64, buf.get());
+        align(buf);
+        assertEquals(1000L, buf.getLong());
+        assertEquals(2000L, buf.getLong());
+        assertEquals(3000L, buf.getLong());
+    }
+
+    private static String readName(ByteBuffer buf) {
+        byte[] name = new byte[buf.getShort()];
+        buf.get(name);
+        return new String(name, StandardCharsets.UTF_8);
+    }
+
+    private static void align(ByteBuffer buf) {
+        buf.position((buf.position() + 7) & ~7);
+    }
+}
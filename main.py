@@ -105,9 +105,13 @@ def main():
 
             simulations = pipeline.simulate_scenarios(n_simulations=1000, n_steps=10)
 
+            if simulations.size == 0:
+                print("\nNo simulation data available")
+                return
+
             print(f"\nSimulation shape: {simulations.shape}")
             print(f"Mean returns across all simulations:")
-            for i, asset in enumerate(pipeline.assets):
+            for i, asset in enumerate(pipeline.scenario_engine.symbols):
                 mean_return = simulations[:, :, i].mean()
                 print(f"  {asset}: {mean_return:.6f}")
 
@@ -13,6 +13,7 @@ Usage:
     python3 run_system.py --window 240
     python3 run_system.py --window 100 --build
     python3 run_system.py --window 50 --clean
+    python3 run_system.py --window 240 --restore
 """
 
 import argparse
@@ -31,6 +32,7 @@ PROJECT_DIR = Path("/home/printer/Desktop/bot/sugi1")
 RUST_DIR = PROJECT_DIR / "rust-model"
 JAVA_DIR = PROJECT_DIR / "java-backend"
 REPORT_PATH = PROJECT_DIR / "Report.md"
+SNAPSHOT_DIR = PROJECT_DIR / "data"
 DOCKER_COMPOSE_PATH = PROJECT_DIR / "docker-compose.yml"
 
 # Default symbols
@@ -66,6 +68,8 @@ class Config:
     clean: bool = False
     skip_docker: bool = False
     verbose: bool = False
+    snapshot: bool = False
+    restore: bool = False
 
 
 class Colors:
@@ -164,20 +168,87 @@ def clean_redis():
         log("Redis cleaned", "SUCCESS")
 
 
-def download_data(window: int, verbose: bool = False) -> bool:
-    """Download historical data for the specified window."""
-    if window not in WINDOWS:
-        log(f"Invalid window: {window}. Valid: {list(WINDOWS.keys())}", "ERROR")
+def redis_client():
+    import redis
+
+    return redis.Redis(host="localhost", port=6379)
+
+
+def snapshot_path(window: int) -> Path:
+    """Snapshot file of one analysis window (TTLs and history differ per window)."""
+    return SNAPSHOT_DIR / f"redis_snapshot_{window}d.npz"
+
+
+def save_snapshot(window: int) -> bool:
+    """Export the Redis bar store to the window's snapshot file."""
+    from src.snapshot import export_snapshot
+
+    path = snapshot_path(window)
+    try:
+        start = time.time()
+        counts = export_snapshot(redis_client(), path, window=window)
+    except Exception as e:
+        log(f"Snapshot export failed: {e}", "ERROR")
         return False
 
-    config = WINDOWS[window]
-    script_name = config["python"]
+    log(
+        f"Snapshot saved: {counts['bars']} bars, {counts['symbols']} symbols "
+        f"in {time.time() - start:.1f}s ({path})",
+        "SUCCESS",
+    )
+    return True
+
+
+def restore_snapshot(window: int) -> bool:
+    """Bulk-load the window's snapshot into Redis, keeping the saved expiries."""
+    path = snapshot_path(window)
+    if not path.exists():
+        log(f"No {window}-day snapshot at {path}", "WARN")
+        return False
+
+    from src.snapshot import import_snapshot
+
+    try:
+        start = time.time()
+        counts = import_snapshot(redis_client(), path, window=window)
+    except Exception as e:
+        log(f"Snapshot restore failed: {e}", "ERROR")
+        return False
+
+    log(
+        f"Snapshot restored: {counts['bars']} bars, {counts['symbols']} symbols "
+        f"in {time.time() - start:.1f}s ({counts['expired']} expired bars skipped)",
+        "SUCCESS",
+    )
+    return counts["bars"] > 0
+
+
+def download_script(window: int) -> str:
+    """Download script run for a window."""
+    script_name = WINDOWS[window]["python"]
 
     # Check if custom 100d script exists, otherwise use 50d
     if window == 100 and not (PROJECT_DIR / script_name).exists():
         script_name = "download_50d.py"  # Fallback
 
-    script_path = PROJECT_DIR / script_name
+    return script_name
+
+
+def metrics_summary_path(window: int) -> Path:
+    """Summary written by the window's download script (src/metrics.py)."""
+    # download_{n}d.py writes historical_{n}d_summary.json
+    days = download_script(window).removeprefix("download_").removesuffix(".py")
+    return PROJECT_DIR / f"historical_{days}_summary.json"
+
+
+def download_data(window: int, verbose: bool = False) -> bool:
+    """Download historical data for the specified window."""
+    if window not in WINDOWS:
+        log(f"Invalid window: {window}. Valid: {list(WINDOWS.keys())}", "ERROR")
+        return False
+
+    config = WINDOWS[window]
+    script_path = PROJECT_DIR / download_script(window)
 
     if not script_path.exists():
         log(f"Script not found: {script_path}", "ERROR")
@@ -323,12 +394,46 @@ def parse_rust_output(output: str) -> dict:
     return results
 
 
+def load_metrics_summary(window: int) -> dict:
+    """Metrics written by the window's download script, if present."""
+    try:
+        with open(metrics_summary_path(window)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def format_metrics_table(metrics: dict, window: int) -> str:
+    """Markdown table of every horizon's change plus the window's risk metrics."""
+    horizons = metrics.get("horizons", [])
+    per_symbol = metrics.get("metrics", {})
+    if not horizons or not per_symbol:
+        return ""
+
+    def pct(value) -> str:
+        return f"{value:+.2f}%" if value is not None else "N/A"
+
+    header = " | ".join(f"{h}d" for h in horizons)
+    table = f"| Symbol | {header} | Volatility ({window}d) | Max Drawdown ({window}d) |\n"
+    table += "|--------|" + "------|" * len(horizons) + "------------|--------------|\n"
+
+    for symbol in sorted(per_symbol):
+        row = per_symbol[symbol]
+        changes = " | ".join(pct(row.get(f"{h}d", {}).get("change")) for h in horizons)
+        current = row.get(f"{window}d", {})
+        volatility = current.get("volatility")
+        vol_text = f"{volatility:.2f}%" if volatility is not None else "N/A"
+        table += f"| {symbol} | {changes} | {vol_text} | {pct(current.get('max_drawdown'))} |\n"
+
+    return table
+
+
 def generate_report(window: int, rust_results: dict, verbose: bool = False) -> str:
     """Generate the analysis report markdown."""
     log("Generating analysis report...")
 
     # Get data from Redis
-    summary = get_redis_summary()
+    summary = get_redis_summary(window)
 
     # Build report
     report = f"""# Financial Forecasting Analysis Report
@@ -361,23 +466,31 @@ data using machine learning models to identify alpha opportunities and correlati
 |--------|--------|--------|
 """
 
-    # Sort by performance
+    # Sort by performance, once, over the per-symbol changes only
     sorted_perf = sorted(
-        rust_results.items(),
-        key=lambda x: x[1] if isinstance(x[1], float) else -999,
+        (
+            (symbol, change)
+            for symbol, change in rust_results.items()
+            if isinstance(change, float) and symbol in ALL_SYMBOLS
+        ),
+        key=lambda x: x[1],
         reverse=True,
     )
 
     for symbol, change in sorted_perf:
-        if isinstance(change, float) and symbol in ALL_SYMBOLS:
-            status = (
-                "🟢 Strong"
-                if change > 50
-                else "🟡 Moderate"
-                if change > 20
-                else "🔴 Weak"
-            )
-            report += f"| {symbol} | {change:+.2f}% | {status} |\n"
+        status = (
+            "🟢 Strong"
+            if change > 50
+            else "🟡 Moderate"
+            if change > 20
+            else "🔴 Weak"
+        )
+        report += f"| {symbol} | {change:+.2f}% | {status} |\n"
+
+    # Multi-horizon metrics
+    metrics_table = format_metrics_table(load_metrics_summary(window), window)
+    if metrics_table:
+        report += "\n### Multi-Horizon Metrics\n\n" + metrics_table
 
     # Top performers
     report += """
@@ -385,9 +498,7 @@ data using machine learning models to identify alpha opportunities and correlati
 
 """
 
-    top_performers = [
-        (k, v) for k, v in sorted_perf if isinstance(v, float) and k in ALL_SYMBOLS
-    ][:5]
+    top_performers = sorted_perf[:5]
     for symbol, change in top_performers:
         report += f"1. **{symbol}**: {change:+.2f}%\n"
 
@@ -476,9 +587,7 @@ Based on the {WINDOWS.get(window, {}).get("name", f"{window}-Day")} analysis:
 """
 
     # Generate recommendations based on performance
-    positive_perf = [(k, v) for k, v in sorted_perf if isinstance(v, float) and v > 0][
-        :3
-    ]
+    positive_perf = [(k, v) for k, v in sorted_perf if v > 0][:3]
     if positive_perf:
         report += "### Opportunities\n\n"
         for symbol, change in positive_perf:
@@ -486,7 +595,7 @@ Based on the {WINDOWS.get(window, {}).get("name", f"{window}-Day")} analysis:
         report += "\n"
 
     # Risk warnings
-    negative_perf = [(k, v) for k, v in sorted_perf if isinstance(v, float) and v < -10]
+    negative_perf = [(k, v) for k, v in sorted_perf if v < -10]
     if negative_perf:
         report += "### Risk Factors\n\n"
         for symbol, change in negative_perf:
@@ -511,7 +620,7 @@ Based on the {WINDOWS.get(window, {}).get("name", f"{window}-Day")} analysis:
     return report
 
 
-def get_redis_summary() -> dict:
+def get_redis_summary(window: int) -> dict:
     """Get summary statistics from Redis."""
     summary = {}
 
@@ -531,31 +640,9 @@ def get_redis_summary() -> dict:
         ]
         summary["symbol_count"] = len(symbols)
 
-    # Get volumes for each symbol
-    volumes = []
-    for symbol in ALL_SYMBOLS:
-        code, stdout, _ = run_command(["redis-cli", "KEYS", f"equity:{symbol}:*"])
-        if code == 0:
-            keys = [k for k in stdout.strip().split("\n") if k]
-            if keys:
-                # Sample some keys to get volume
-                total_vol = 0
-                count = 0
-                for key in keys[:10]:  # Sample up to 10
-                    code2, vol_str, _ = run_command(["redis-cli", "GET", key])
-                    if code2 == 0:
-                        try:
-                            data = json.loads(vol_str)
-                            vol = data.get("volume", 0)
-                            total_vol += float(vol) if vol else 0
-                            count += 1
-                        except:
-                            pass
-                if count > 0:
-                    volumes.append((symbol, total_vol / count))
-
-    volumes.sort(key=lambda x: x[1], reverse=True)
-    summary["volumes"] = volumes
+    # Average volumes over the full download, from the metrics summary
+    volumes = load_metrics_summary(window).get("avg_volumes", {})
+    summary["volumes"] = sorted(volumes.items(), key=lambda x: x[1], reverse=True)
 
     # Get date range
     code, stdout, _ = run_command(["redis-cli", "KEYS", "equity:NVIDIA:*"])
@@ -721,6 +808,7 @@ Examples:
     python3 run_system.py --window 100 --build      # Build Rust model and run 100-day analysis
     python3 run_system.py --window 50 --clean       # Clean Redis and run 50-day analysis
     python3 run_system.py --window 14 --skip-docker # Skip Docker, run quick 14-day analysis
+    python3 run_system.py --window 240 --restore    # Restore Redis from the 240-day snapshot instead of downloading
         """,
     )
 
@@ -753,6 +841,18 @@ Examples:
         help="Skip Docker service management",
     )
 
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="Save a Redis snapshot after downloading data",
+    )
+
+    parser.add_argument(
+        "--restore",
+        action="store_true",
+        help="Restore Redis from the snapshot saved for this window instead of downloading (falls back to downloading)",
+    )
+
     parser.add_argument(
         "--verbose",
         "-v",
@@ -774,6 +874,8 @@ Examples:
         clean=args.clean,
         skip_docker=args.skip_docker,
         verbose=args.verbose,
+        snapshot=args.snapshot,
+        restore=args.restore,
     )
 
     # Step 1: Manage Docker services
@@ -797,10 +899,13 @@ Examples:
         f"Redis is running (Window: {WINDOWS.get(config.window, {}).get('name', f'{config.window}-Day')})"
     )
 
-    # Step 3: Download data
-    if not download_data(config.window, config.verbose):
-        log("Failed to download data", "ERROR")
-        sys.exit(1)
+    # Step 3: Download data (or restore it from a snapshot)
+    if not (config.restore and restore_snapshot(config.window)):
+        if not download_data(config.window, config.verbose):
+            log("Failed to download data", "ERROR")
+            sys.exit(1)
+        if config.snapshot:
+            save_snapshot(config.window)
 
     # Step 4: Build Rust model if needed
     binary = RUST_DIR / "target/release/rust-model"
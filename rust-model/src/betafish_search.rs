@@ -1,6 +1,30 @@
 use crate::types::{EquityData, AlphaResult};
+use std::cmp::Ordering;
 use std::collections::HashMap;
 
+/// The `k` best items under `cmp` (best first), selecting them in O(n)
+/// with `select_nth_unstable_by` and sorting only those `k`.
+pub fn top_k_by<T, F>(mut items: Vec<T>, k: usize, mut cmp: F) -> Vec<T>
+where
+    F: FnMut(&T, &T) -> Ordering,
+{
+    if k == 0 {
+        return Vec::new();
+    }
+    if items.len() > k {
+        items.select_nth_unstable_by(k - 1, &mut cmp);
+        items.truncate(k);
+    }
+    items.sort_by(cmp);
+    items
+}
+
+/// Descending order on an `f64` key, NaN last; a total order, as
+/// `top_k_by` requires.
+pub fn descending(a: f64, b: f64) -> Ordering {
+    b.partial_cmp(&a).unwrap_or_else(|| a.is_nan().cmp(&b.is_nan()))
+}
+
 pub struct BetafishSearch {
     window_size: usize,
     top_n: usize,
@@ -39,13 +63,7 @@ impl BetafishSearch {
             });
         }
         
-        alpha_results.sort_by(|a, b| {
-            b.alpha.partial_cmp(&a.alpha).unwrap_or(std::cmp::Ordering::Equal)
-        });
-        
-        alpha_results.into_iter()
-            .take(self.top_n)
-            .collect()
+        top_k_by(alpha_results, self.top_n, |a, b| descending(a.alpha, b.alpha))
     }
     
     fn calculate_alpha(&self, data: &[EquityData]) -> f64 {
@@ -118,13 +136,7 @@ impl BetafishSearch {
             });
         }
         
-        volume_results.sort_by(|a, b| {
-            b.volume.partial_cmp(&a.volume).unwrap_or(std::cmp::Ordering::Equal)
-        });
-        
-        volume_results.into_iter()
-            .take(self.top_n)
-            .collect()
+        top_k_by(volume_results, self.top_n, |a, b| descending(a.volume, b.volume))
     }
 }
 
@@ -137,4 +149,15 @@ mod tests {
         let search = BetafishSearch::new(30, 5);
         assert_eq!(search.window_size, 30);
     }
+    
+    #[test]
+    fn test_top_k_by() {
+        let values = vec![3.0, f64::NAN, 9.0, 1.0, 7.0, 5.0];
+        let top = top_k_by(values.clone(), 3, |a, b| descending(*a, *b));
+        assert_eq!(top, vec![9.0, 7.0, 5.0]);
+        
+        let all = top_k_by(values, 10, |a, b| descending(*a, *b));
+        assert_eq!(&all[..5], &[9.0, 7.0, 5.0, 3.0, 1.0]);
+        assert!(all[5].is_nan());
+    }
 }
@@ -0,0 +1,125 @@
+use crate::gaussian_copula::{SamplingMethod, Shrinkage, SimulationConfig};
+use serde_yaml::Value;
+use std::path::PathBuf;
+
+/// Model settings read from the shared `config/config.yaml`.
+#[derive(Debug, Clone)]
+pub struct ModelConfig {
+    pub simulation: SimulationConfig,
+    /// `paths.model_dir`, resolved against the project root when loaded
+    /// from a file.
+    pub model_dir: PathBuf,
+    /// Symbol universe, `data.assets`.
+    pub assets: Vec<String>,
+    /// Connection URL built from `architecture.backend.redis`.
+    pub redis_url: String,
+}
+
+const DEFAULT_ASSETS: [&str; 16] = [
+    "MNQ", "NVDA", "AMD", "WDC", "SLV", "GS", "NET", "EWJ",
+    "EURUSD", "INRJPY", "BRLGBP", "STLD", "CRCL", "UBS", "TTWO", "ETHUSD",
+];
+
+impl Default for ModelConfig {
+    fn default() -> Self {
+        ModelConfig {
+            simulation: SimulationConfig::default(),
+            model_dir: PathBuf::from("models"),
+            assets: DEFAULT_ASSETS.iter().map(|s| s.to_string()).collect(),
+            redis_url: "redis://localhost:6379".to_string(),
+        }
+    }
+}
+
+impl ModelConfig {
+    /// Load the first config file found, falling back to defaults.
+    ///
+    /// `MODEL_CONFIG` overrides the search, which otherwise tries the
+    /// working directory, its parent and the crate's sibling `config/`.
+    pub fn load() -> Self {
+        for path in Self::candidate_paths() {
+            if let Ok(text) = std::fs::read_to_string(&path) {
+                match Self::from_yaml(&text) {
+                    Ok(mut config) => {
+                        // Relative paths are relative to the project root,
+                        // the parent of the config directory
+                        if config.model_dir.is_relative() {
+                            if let Some(root) = path.parent().and_then(|p| p.parent()) {
+                                config.model_dir = root.join(&config.model_dir);
+                            }
+                        }
+                        return config;
+                    }
+                    Err(e) => println!("Failed to parse {}: {}", path.display(), e),
+                }
+            }
+        }
+
+        Self::default()
+    }
+
+    fn candidate_paths() -> Vec<PathBuf> {
+        if let Ok(path) = std::env::var("MODEL_CONFIG") {
+            return vec![PathBuf::from(path)];
+        }
+
+        vec![
+            PathBuf::from("config/config.yaml"),
+            PathBuf::from("../config/config.yaml"),
+            PathBuf::from(concat!(env!("CARGO_MANIFEST_DIR"), "/../config/config.yaml")),
+        ]
+    }
+
+    pub fn from_yaml(text: &str) -> Result<Self, serde_yaml::Error> {
+        let root: Value = serde_yaml::from_str(text)?;
+        let copula = &root["copula"];
+        let models = &root["architecture"]["models"]["gaussian_copula"];
+
+        let mut simulation = SimulationConfig::default();
+        if let Some(n) = models["n_simulations"].as_u64() {
+            simulation.n_simulations = n as usize;
+        }
+        if let Some(sampling) = copula["sampling"].as_str() {
+            simulation.sampling = SamplingMethod::parse(sampling)
+                .unwrap_or(SamplingMethod::MonteCarlo);
+        }
+        if let Some(antithetic) = copula["antithetic"].as_bool() {
+            simulation.antithetic = antithetic;
+        }
+        if let Some(n) = copula["n_replicates"].as_u64() {
+            simulation.n_replicates = n as usize;
+        }
+        simulation.seed = copula["random_state"].as_u64();
+        if let Some(shrinkage) = copula["shrinkage"].as_str() {
+            simulation.shrinkage = Shrinkage::parse(shrinkage).unwrap_or(Shrinkage::None);
+        }
+        if let Some(pd_repair) = copula["pd_repair"].as_bool() {
+            simulation.pd_repair = pd_repair;
+        }
+
+        let model_dir = root["paths"]["model_dir"]
+            .as_str()
+            .map(PathBuf::from)
+            .unwrap_or_else(|| PathBuf::from("models"));
+        
+        let defaults = Self::default();
+        let assets = root["data"]["assets"]
+            .as_sequence()
+            .map(|seq| {
+                seq.iter()
+                    .filter_map(|v| v.as_str().map(str::to_string))
+                    .collect::<Vec<_>>()
+            })
+            .filter(|assets| !assets.is_empty())
+            .unwrap_or(defaults.assets);
+        
+        let redis = &root["architecture"]["backend"]["redis"];
+        let redis_url = format!(
+            "redis://{}:{}",
+            redis["host"].as_str().unwrap_or("localhost"),
+            redis["port"].as_u64().unwrap_or(6379)
+        );
+        
+        Ok(ModelConfig { simulation, model_dir, assets, redis_url })
+    }
+}
@@ -210,6 +210,42 @@ impl DecisionTree {
         }
     }
     
+    /// Add this tree's prediction for every row of a row-major matrix to `out`.
+    ///
+    /// Walks the tree iteratively so a block of rows can be scored against
+    /// one tree while its nodes stay in cache.
+    pub fn accumulate_rows(&self, rows: &[f64], n_features: usize, out: &mut [f64]) {
+        let root = match &self.root {
+            Some(node) => node,
+            None => return,
+        };
+        
+        for (features, acc) in rows.chunks_exact(n_features).zip(out.iter_mut()) {
+            let mut node = root;
+            loop {
+                if node.is_leaf {
+                    *acc += node.value.unwrap_or(0.0);
+                    break;
+                }
+                
+                let feature_val = features[node.feature_index.unwrap()];
+                let next = if feature_val <= node.threshold.unwrap() {
+                    &node.left
+                } else {
+                    &node.right
+                };
+                
+                match next {
+                    Some(child) => node = &**child,
+                    None => {
+                        *acc += node.value.unwrap_or(0.0);
+                        break;
+                    }
+                }
+            }
+        }
+    }
+    
     fn predict_node(&self, node: &Node, features: &[f64]) -> f64 {
         if node.is_leaf {
             return node.value.unwrap_or(0.0);
@@ -233,6 +269,116 @@ impl DecisionTree {
     }
 }
 
+/// Array form of a tree: node `i` splits on `feature[i]` at `threshold[i]`
+/// and continues at `left[i]`/`right[i]`. Leaves have `feature == -1` and
+/// point at themselves, so walking past a leaf is a no-op.
+#[derive(Debug, Clone, Default)]
+pub struct FlatTree {
+    pub feature: Vec<i32>,
+    pub threshold: Vec<f64>,
+    pub left: Vec<i32>,
+    pub right: Vec<i32>,
+    pub value: Vec<f64>,
+    pub depth: usize,
+}
+
+impl FlatTree {
+    pub fn len(&self) -> usize {
+        self.feature.len()
+    }
+    
+    pub fn is_empty(&self) -> bool {
+        self.feature.is_empty()
+    }
+    
+    fn push_leaf(&mut self, value: f64) -> usize {
+        let index = self.len();
+        self.feature.push(-1);
+        self.threshold.push(0.0);
+        self.left.push(index as i32);
+        self.right.push(index as i32);
+        self.value.push(value);
+        index
+    }
+    
+    fn push_node(&mut self, node: &Node, depth: usize) -> usize {
+        self.depth = self.depth.max(depth);
+        if node.is_leaf {
+            return self.push_leaf(node.value.unwrap_or(0.0));
+        }
+        
+        self.depth = self.depth.max(depth + 1);
+        let index = self.push_leaf(node.value.unwrap_or(0.0));
+        self.feature[index] = node.feature_index.unwrap() as i32;
+        self.threshold[index] = node.threshold.unwrap();
+        
+        // A missing child falls back to this node's value, as in predict
+        let fallback = node.value.unwrap_or(0.0);
+        let left = match &node.left {
+            Some(child) => self.push_node(child, depth + 1),
+            None => self.push_leaf(fallback),
+        };
+        let right = match &node.right {
+            Some(child) => self.push_node(child, depth + 1),
+            None => self.push_leaf(fallback),
+        };
+        self.left[index] = left as i32;
+        self.right[index] = right as i32;
+        index
+    }
+}
+
+impl DecisionTree {
+    /// Flatten the tree in pre-order, root first.
+    pub fn flatten(&self) -> FlatTree {
+        let mut flat = FlatTree::default();
+        match &self.root {
+            Some(node) => {
+                flat.push_node(node, 0);
+            }
+            None => {
+                flat.push_leaf(0.0);
+            }
+        }
+        flat
+    }
+    
+    /// Rebuild a tree from its flat form, the inverse of `flatten`.
+    pub fn from_flat(flat: &FlatTree, n_features: usize) -> Self {
+        DecisionTree {
+            root: (!flat.is_empty()).then(|| flat.node(0)),
+            max_depth: flat.depth,
+            min_samples_split: 0,
+            n_features,
+        }
+    }
+}
+
+impl FlatTree {
+    fn node(&self, index: usize) -> Node {
+        let value = Some(self.value[index]);
+        if self.feature[index] < 0 {
+            return Node {
+                feature_index: None,
+                threshold: None,
+                left: None,
+                right: None,
+                value,
+                is_leaf: true,
+            };
+        }
+        
+        Node {
+            feature_index: Some(self.feature[index] as usize),
+            threshold: Some(self.threshold[index]),
+            left: Some(Box::new(self.node(self.left[index] as usize))),
+            right: Some(Box::new(self.node(self.right[index] as usize))),
+            value,
+            is_leaf: false,
+        }
+    }
+}
+
 #[derive(Debug, Clone)]
 struct SplitResult {
     feature_index: Option<usize>,
@@ -1,7 +1,11 @@
-use crate::gaussian_copula::GaussianCopula;
+use crate::betafish_search::{descending, top_k_by};
+use crate::gaussian_copula::{GaussianCopula, ProbabilityEstimate, SimulationConfig};
 use crate::types::{EquityData, AlphaResult};
 use std::collections::HashMap;
 
+/// Bins of the simulated return distributions searched for alpha.
+const DISTRIBUTION_BINS: usize = 100;
+
 pub struct ExaSearch {
     gaussian_copula: GaussianCopula,
     confidence_threshold: f64,
@@ -10,8 +14,13 @@ pub struct ExaSearch {
 
 impl ExaSearch {
     pub fn new(confidence_threshold: f64, top_n: usize) -> Self {
+        Self::with_simulation_config(confidence_threshold, top_n, SimulationConfig::default())
+    }
+    
+    pub fn with_simulation_config(confidence_threshold: f64, top_n: usize,
+                                  config: SimulationConfig) -> Self {
         ExaSearch {
-            gaussian_copula: GaussianCopula::new(),
+            gaussian_copula: GaussianCopula::with_config(config),
             confidence_threshold,
             top_n,
         }
@@ -23,15 +32,17 @@ impl ExaSearch {
     
     pub fn find_highest_probable_alpha(&self, data: &HashMap<String, Vec<EquityData>>) -> Vec<AlphaResult> {
         let mut alpha_results: Vec<AlphaResult> = Vec::new();
+        let distributions = self.gaussian_copula.probability_distributions(DISTRIBUTION_BINS);
         
         for (symbol, equity_data) in data {
             if equity_data.is_empty() {
                 continue;
             }
             
-            let distribution = self.gaussian_copula.get_probability_distribution(symbol, 100);
-            
-            let (expected_alpha, probability) = self.calculate_expected_alpha(&distribution);
+            let (expected_alpha, probability) = match distributions.get(symbol) {
+                Some(distribution) => self.calculate_expected_alpha(distribution),
+                None => self.calculate_expected_alpha(&vec![0.0; DISTRIBUTION_BINS]),
+            };
             
             let latest = equity_data.last().unwrap();
             let volume = latest.volume;
@@ -48,15 +59,15 @@ impl ExaSearch {
             }
         }
         
-        alpha_results.sort_by(|a, b| {
-            let score_a = a.alpha * a.probability;
-            let score_b = b.alpha * b.probability;
-            score_b.partial_cmp(&score_a).unwrap_or(std::cmp::Ordering::Equal)
-        });
-        
-        alpha_results.into_iter()
-            .take(self.top_n)
-            .collect()
+        top_k_by(alpha_results, self.top_n, |a, b| {
+            descending(a.alpha * a.probability, b.alpha * b.probability)
+        })
+    }
+    
+    /// Probabilities reported by `find_highest_probable_alpha`, with their
+    /// Monte Carlo standard errors from independent replicates.
+    pub fn probability_estimates(&self) -> HashMap<String, ProbabilityEstimate> {
+        self.gaussian_copula.estimate_peak_probabilities(DISTRIBUTION_BINS)
     }
     
     fn calculate_expected_alpha(&self, distribution: &[f64]) -> (f64, f64) {
@@ -1,12 +1,182 @@
 use crate::types::EquityData;
-use ndarray::{Array2, Array1};
+use nalgebra::DMatrix;
+use ndarray::{concatenate, Array2, ArrayView1, Axis};
+use rand::rngs::StdRng;
+use rand::{Rng, SeedableRng};
 use rand_distr::{Normal, Distribution};
+use rayon::prelude::*;
+use statrs::distribution::{ContinuousCDF, Normal as StandardNormal};
 use std::collections::HashMap;
+use std::fs::File;
+use std::io::{self, BufWriter, Write};
+use std::path::Path;
+
+pub const COPULA_SIMULATIONS_FILE: &str = "copula_simulations.bin";
+pub const SIMULATIONS_MAGIC: &[u8; 8] = b"COPSIM1\0";
+
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum SamplingMethod {
+    MonteCarlo,
+    /// Randomly shifted Halton points (randomized quasi-Monte Carlo).
+    Halton,
+}
+
+impl SamplingMethod {
+    pub fn parse(name: &str) -> Option<Self> {
+        match name.to_ascii_lowercase().as_str() {
+            "mc" | "monte_carlo" => Some(SamplingMethod::MonteCarlo),
+            "qmc" | "halton" => Some(SamplingMethod::Halton),
+            _ => None,
+        }
+    }
+}
+
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum Shrinkage {
+    /// Pairwise sample correlation.
+    None,
+    LedoitWolf,
+    Oas,
+}
+
+impl Shrinkage {
+    pub fn parse(name: &str) -> Option<Self> {
+        match name.to_ascii_lowercase().as_str() {
+            "none" | "sample" => Some(Shrinkage::None),
+            "ledoit_wolf" | "ledoit-wolf" => Some(Shrinkage::LedoitWolf),
+            "oas" => Some(Shrinkage::Oas),
+            _ => None,
+        }
+    }
+}
+
+#[derive(Debug, Clone)]
+pub struct SimulationConfig {
+    pub n_simulations: usize,
+    pub sampling: SamplingMethod,
+    pub antithetic: bool,
+    /// Independent replicates used to estimate standard errors.
+    pub n_replicates: usize,
+    pub seed: Option<u64>,
+    pub shrinkage: Shrinkage,
+    /// Replace a matrix that fails to factor by the nearest PD correlation.
+    pub pd_repair: bool,
+}
+
+impl Default for SimulationConfig {
+    fn default() -> Self {
+        SimulationConfig {
+            n_simulations: 10000,
+            sampling: SamplingMethod::MonteCarlo,
+            antithetic: false,
+            n_replicates: 16,
+            seed: None,
+            shrinkage: Shrinkage::None,
+            pd_repair: true,
+        }
+    }
+}
+
+#[derive(Debug, Clone, Copy)]
+pub struct ProbabilityEstimate {
+    pub probability: f64,
+    pub std_error: f64,
+}
+
+impl ProbabilityEstimate {
+    fn from_replicates(estimates: &[f64]) -> Self {
+        let k = estimates.len() as f64;
+        let probability = estimates.iter().sum::<f64>() / k;
+        let std_error = if estimates.len() > 1 {
+            (estimates.iter()
+                .map(|&p| (p - probability).powi(2))
+                .sum::<f64>() / (k - 1.0) / k)
+                .sqrt()
+        } else {
+            0.0
+        };
+
+        ProbabilityEstimate { probability, std_error }
+    }
+}
+
+/// Simulated returns as one contiguous `n_simulations x n_assets` matrix,
+/// with the column order given once by `symbols`.
+#[derive(Debug, Clone)]
+pub struct Simulations {
+    pub symbols: Vec<String>,
+    pub values: Array2<f64>,
+}
+
+impl Simulations {
+    pub fn len(&self) -> usize {
+        self.values.nrows()
+    }
+    
+    pub fn is_empty(&self) -> bool {
+        self.values.nrows() == 0
+    }
+    
+    pub fn symbol_index(&self, symbol: &str) -> Option<usize> {
+        self.symbols.iter().position(|s| s == symbol)
+    }
+    
+    /// All draws for one symbol.
+    pub fn column(&self, symbol: &str) -> Option<ArrayView1<'_, f64>> {
+        self.symbol_index(symbol).map(|i| self.values.column(i))
+    }
+    
+    /// Fraction of draws where every `(column, threshold)` pair exceeds its
+    /// threshold.
+    fn fraction_above(&self, columns: &[(usize, f64)]) -> f64 {
+        if self.is_empty() {
+            return 0.0;
+        }
+        let count = self.values.outer_iter()
+            .filter(|row| columns.iter().all(|&(i, t)| row[i] > t))
+            .count();
+        count as f64 / self.len() as f64
+    }
+    
+    /// Write the matrix so it can be memory-mapped without copying.
+    ///
+    /// Layout (little-endian): the 8-byte magic, `u64 n_simulations`,
+    /// `u64 n_assets`, `u64 data_offset`, then per symbol a `u32` length
+    /// and its UTF-8 bytes, zero padding up to `data_offset` (a multiple
+    /// of 8) and the row-major `f64` values.
+    pub fn write_to(&self, path: &Path) -> io::Result<()> {
+        let mut names = Vec::new();
+        for symbol in &self.symbols {
+            names.extend_from_slice(&(symbol.len() as u32).to_le_bytes());
+            names.extend_from_slice(symbol.as_bytes());
+        }
+        let data_offset = (32 + names.len() + 7) & !7;
+        
+        if let Some(parent) = path.parent() {
+            std::fs::create_dir_all(parent)?;
+        }
+        // Streamed through the writer's buffer, never copied whole
+        let mut out = BufWriter::new(File::create(path)?);
+        out.write_all(SIMULATIONS_MAGIC)?;
+        for header in [self.len(), self.symbols.len(), data_offset] {
+            out.write_all(&(header as u64).to_le_bytes())?;
+        }
+        out.write_all(&names)?;
+        out.write_all(&[0u8; 8][..data_offset - 32 - names.len()])?;
+        for v in self.values.iter() {
+            out.write_all(&v.to_le_bytes())?;
+        }
+        out.flush()
+    }
+}
 
 pub struct GaussianCopula {
     correlation_matrix: Array2<f64>,
+    /// Lower Cholesky factor of `correlation_matrix`, kept in step with it.
+    cholesky_factor: Array2<f64>,
     symbols: Vec<String>,
     marginal_distributions: HashMap<String, MarginalDist>,
+    config: SimulationConfig,
 }
 
 #[derive(Debug, Clone)]
@@ -25,13 +195,23 @@ enum DistType {
 
 impl GaussianCopula {
     pub fn new() -> Self {
+        Self::with_config(SimulationConfig::default())
+    }
+    
+    pub fn with_config(config: SimulationConfig) -> Self {
         GaussianCopula {
             correlation_matrix: Array2::eye(2),
+            cholesky_factor: Array2::eye(2),
             symbols: Vec::new(),
             marginal_distributions: HashMap::new(),
+            config,
         }
     }
     
+    pub fn simulation_config(&self) -> &SimulationConfig {
+        &self.config
+    }
+    
     pub fn fit(&mut self, data_by_symbol: &HashMap<String, Vec<EquityData>>) {
         self.symbols = data_by_symbol.keys().cloned().collect();
         self.symbols.sort();
@@ -64,10 +244,64 @@ impl GaussianCopula {
         self.estimate_correlation(data_by_symbol);
     }
     
+    /// Fold new return observations into the fitted correlation with an
+    /// exponentially weighted rank-k update.
+    ///
+    /// Each row of `new_returns` holds one return per symbol in `symbols()`
+    /// order. The cached Cholesky factor is updated alongside the matrix in
+    /// O(k N^2) instead of being refactored in O(N^3). Marginals are kept.
+    pub fn update_with_returns(&mut self, new_returns: &[Vec<f64>], decay: f64) {
+        let n = self.symbols.len();
+        if n == 0 || decay <= 0.0 || decay >= 1.0 {
+            return;
+        }
+        
+        let weight = (1.0 - decay).sqrt();
+        let scale = decay.sqrt();
+        
+        for row in new_returns.iter().filter(|row| row.len() == n) {
+            let mut x: Vec<f64> = self.symbols.iter()
+                .zip(row.iter())
+                .map(|(symbol, &r)| {
+                    self.marginal_distributions.get(symbol)
+                        .filter(|m| m.std > 0.0 && r.is_finite())
+                        .map(|m| weight * (r - m.mean) / m.std)
+                        .unwrap_or(0.0)
+                })
+                .collect();
+            
+            for i in 0..n {
+                for j in 0..n {
+                    self.correlation_matrix[[i, j]] = decay * self.correlation_matrix[[i, j]] + x[i] * x[j];
+                }
+            }
+            
+            self.cholesky_factor.mapv_inplace(|v| v * scale);
+            cholesky_rank_one_update(&mut self.cholesky_factor, &mut x);
+        }
+        
+        // Rescale to a unit diagonal: C <- D C D and L <- D L
+        let d: Vec<f64> = (0..n)
+            .map(|i| 1.0 / self.correlation_matrix[[i, i]].sqrt())
+            .collect();
+        for i in 0..n {
+            for j in 0..n {
+                self.correlation_matrix[[i, j]] *= d[i] * d[j];
+            }
+            self.cholesky_factor.row_mut(i).mapv_inplace(|v| v * d[i]);
+        }
+    }
+    
+    /// Estimate the correlation matrix and its Cholesky factor.
+    ///
+    /// The matrix is factored once; the factor doubles as the positive
+    /// definiteness check, and only a repaired matrix is factored again.
     fn estimate_correlation(&mut self, data_by_symbol: &HashMap<String, Vec<EquityData>>) {
         let n = self.symbols.len();
         
         if n < 2 {
+            self.correlation_matrix = Array2::eye(n);
+            self.cholesky_factor = Array2::eye(n);
             return;
         }
         
@@ -82,26 +316,99 @@ impl GaussianCopula {
             returns_by_symbol.insert(symbol.clone(), returns);
         }
         
-        for i in 0..n {
-            for j in 0..n {
-                let symbol_i = &self.symbols[i];
-                let symbol_j = &self.symbols[j];
-                
-                if let (Some(returns_i), Some(returns_j)) = (
-                    returns_by_symbol.get(symbol_i),
-                    returns_by_symbol.get(symbol_j)
-                ) {
-                    let min_len = returns_i.len().min(returns_j.len());
-                    let corr = self.calculate_correlation(
-                        &returns_i[..min_len],
-                        &returns_j[..min_len]
-                    );
-                    self.correlation_matrix[[i, j]] = corr;
-                } else {
-                    self.correlation_matrix[[i, j]] = if i == j { 1.0 } else { 0.0 };
+        if self.config.shrinkage == Shrinkage::None {
+            for i in 0..n {
+                for j in 0..n {
+                    let symbol_i = &self.symbols[i];
+                    let symbol_j = &self.symbols[j];
+                    
+                    if let (Some(returns_i), Some(returns_j)) = (
+                        returns_by_symbol.get(symbol_i),
+                        returns_by_symbol.get(symbol_j)
+                    ) {
+                        let min_len = returns_i.len().min(returns_j.len());
+                        let corr = self.calculate_correlation(
+                            &returns_i[..min_len],
+                            &returns_j[..min_len]
+                        );
+                        self.correlation_matrix[[i, j]] = corr;
+                    } else {
+                        self.correlation_matrix[[i, j]] = if i == j { 1.0 } else { 0.0 };
+                    }
                 }
             }
+        } else {
+            self.correlation_matrix = self.shrunk_correlation(&returns_by_symbol);
         }
+        
+        let factor = self.cholesky_decomposition();
+        self.cholesky_factor = if self.config.pd_repair && !is_positive_definite(&factor) {
+            self.correlation_matrix = nearest_positive_definite(&self.correlation_matrix, 1e-8);
+            self.cholesky_decomposition()
+        } else {
+            factor
+        };
+    }
+    
+    /// Shrinkage estimate over the most recent window common to all symbols.
+    fn shrunk_correlation(&self, returns_by_symbol: &HashMap<String, Vec<f64>>) -> Array2<f64> {
+        let p = self.symbols.len();
+        let t = self.symbols.iter()
+            .map(|s| returns_by_symbol.get(s).map(|r| r.len()).unwrap_or(0))
+            .min()
+            .unwrap_or(0);
+        
+        if t < 2 {
+            return Array2::eye(p);
+        }
+        
+        let mut z = Array2::<f64>::zeros((t, p));
+        for (j, symbol) in self.symbols.iter().enumerate() {
+            let returns = &returns_by_symbol[symbol];
+            let window = &returns[returns.len() - t..];
+            let mean = window.iter().sum::<f64>() / t as f64;
+            let std = (window.iter()
+                .map(|&r| (r - mean).powi(2))
+                .sum::<f64>() / t as f64)
+                .sqrt();
+            
+            if std > 0.0 {
+                for (i, &r) in window.iter().enumerate() {
+                    z[[i, j]] = (r - mean) / std;
+                }
+            }
+        }
+        
+        let (t_f, p_f) = (t as f64, p as f64);
+        let mut sample = z.t().dot(&z) / t_f;
+        for i in 0..p {
+            sample[[i, i]] = 1.0;
+        }
+        
+        let sample_sq = sample.mapv(|v| v * v).sum();
+        let shrinkage = match self.config.shrinkage {
+            Shrinkage::LedoitWolf => {
+                let delta = (sample_sq - p_f) / p_f;
+                let row_norms4: f64 = z.outer_iter()
+                    .map(|row| row.dot(&row).powi(2))
+                    .sum();
+                let beta_bar = ((row_norms4 / t_f - sample_sq) / (t_f * p_f)).max(0.0);
+                if delta > 0.0 { beta_bar.min(delta) / delta } else { 0.0 }
+            }
+            Shrinkage::Oas => {
+                let alpha = sample_sq / (p_f * p_f);
+                let den = (t_f + 1.0) * (alpha - 1.0 / p_f);
+                if den > 0.0 { ((alpha + 1.0) / den).min(1.0) } else { 1.0 }
+            }
+            Shrinkage::None => 0.0,
+        };
+        
+        let mut shrunk = sample * (1.0 - shrinkage);
+        for i in 0..p {
+            shrunk[[i, i]] = 1.0;
+        }
+        
+        shrunk
     }
     
     fn calculate_correlation(&self, x: &[f64], y: &[f64]) -> f64 {
@@ -129,51 +436,76 @@ impl GaussianCopula {
         }
     }
     
-    pub fn simulate(&self, n_simulations: usize) -> Vec<HashMap<String, f64>> {
+    pub fn simulate(&self, n_simulations: usize) -> Simulations {
+        self.simulate_replicate(n_simulations, 0)
+    }
+    
+    fn simulate_replicate(&self, n_simulations: usize, replicate: u64) -> Simulations {
         if self.symbols.is_empty() {
-            return Vec::new();
+            return Simulations { symbols: Vec::new(), values: Array2::zeros((0, 0)) };
         }
         
-        let normal = Normal::new(0.0, 1.0).unwrap();
-        let mut rng = rand::thread_rng();
+        let standard_normals = self.standard_normals(n_simulations, replicate);
+        let mut values = self.apply_correlation(&standard_normals);
         
-        let standard_normals: Vec<Vec<f64>> = (0..n_simulations)
-            .map(|_| {
-                (0..self.symbols.len())
-                    .map(|_| normal.sample(&mut rng))
-                    .collect()
-            })
-            .collect();
+        for (i, mut column) in values.axis_iter_mut(Axis(1)).enumerate() {
+            match self.marginal_distributions.get(&self.symbols[i]) {
+                Some(marginal) => column.mapv_inplace(|z| marginal.mean + marginal.std * z),
+                None => column.fill(f64::NAN),
+            }
+        }
         
-        let correlated_normals = self.apply_correlation(&standard_normals);
-        
-        correlated_normals.iter()
-            .map(|row| {
-                self.symbols.iter()
-                    .enumerate()
-                    .filter_map(|(i, symbol)| {
-                        self.marginal_distributions.get(symbol)
-                            .map(|marginal| {
-                                let z = row[i];
-                                let value = marginal.mean + marginal.std * z;
-                                (symbol.clone(), value)
-                            })
-                    })
-                    .collect()
-            })
-            .collect()
+        Simulations { symbols: self.symbols.clone(), values }
     }
     
-    fn apply_correlation(&self, standard_normals: &[Vec<f64>]) -> Vec<Vec<f64>> {
-        let L = self.cholesky_decomposition();
+    fn replicate_rng(&self, replicate: u64) -> StdRng {
+        match self.config.seed {
+            Some(seed) => StdRng::seed_from_u64(
+                seed.wrapping_add(replicate.wrapping_mul(0x9E37_79B9_7F4A_7C15))
+            ),
+            None => StdRng::from_entropy(),
+        }
+    }
+    
+    /// Independent standard normal draws, one row per simulation.
+    fn standard_normals(&self, n_simulations: usize, replicate: u64) -> Array2<f64> {
+        let n_assets = self.symbols.len();
+        let n_base = if self.config.antithetic {
+            (n_simulations + 1) / 2
+        } else {
+            n_simulations
+        };
+        let mut rng = self.replicate_rng(replicate);
         
-        standard_normals.iter()
-            .map(|row| {
-                let row_array = Array1::from(row.clone());
-                let correlated = L.dot(&row_array);
-                correlated.to_vec()
-            })
-            .collect()
+        let draws = match self.config.sampling {
+            SamplingMethod::MonteCarlo => {
+                let normal = Normal::new(0.0, 1.0).unwrap();
+                Array2::from_shape_simple_fn((n_base, n_assets), || normal.sample(&mut rng))
+            }
+            SamplingMethod::Halton => {
+                let bases = first_primes(n_assets);
+                let shifts: Vec<f64> = (0..n_assets).map(|_| rng.gen::<f64>()).collect();
+                let normal = StandardNormal::new(0.0, 1.0).unwrap();
+                Array2::from_shape_fn((n_base, n_assets), |(i, j)| {
+                    let u = (radical_inverse(i as u64 + 1, bases[j]) + shifts[j]).fract();
+                    normal.inverse_cdf(u.clamp(1e-12, 1.0 - 1e-12))
+                })
+            }
+        };
+        
+        if self.config.antithetic {
+            let mirrored = -&draws;
+            let both = concatenate(Axis(0), &[draws.view(), mirrored.view()])
+                .expect("draws and mirror share a shape");
+            both.slice_move(ndarray::s![..n_simulations, ..])
+        } else {
+            draws
+        }
+    }
+    
+    /// Correlate every row at once: `Z * L^T`.
+    fn apply_correlation(&self, standard_normals: &Array2<f64>) -> Array2<f64> {
+        standard_normals.dot(&self.cholesky_factor.t())
     }
     
     fn cholesky_decomposition(&self) -> Array2<f64> {
@@ -198,94 +530,241 @@ impl GaussianCopula {
     }
     
     pub fn get_probability_distribution(&self, symbol: &str, n_bins: usize) -> Vec<f64> {
-        let simulations = self.simulate(10000);
+        let simulations = self.simulate(self.config.n_simulations);
         
-        let values: Vec<f64> = simulations.iter()
-            .filter_map(|sim| sim.get(symbol).copied())
-            .filter(|&v| !v.is_nan() && v.is_finite())
-            .collect();
-        
-        if values.is_empty() {
-            return vec![0.0; n_bins];
+        match simulations.column(symbol) {
+            Some(column) => histogram(column, n_bins),
+            None => vec![0.0; n_bins],
         }
+    }
+    
+    /// Distributions of every symbol from a single simulation run, instead
+    /// of one run per `get_probability_distribution` call.
+    pub fn probability_distributions(&self, n_bins: usize) -> HashMap<String, Vec<f64>> {
+        let simulations = self.simulate(self.config.n_simulations);
         
-        let min_val = values.iter().copied().fold(f64::INFINITY, f64::min);
-        let max_val = values.iter().copied().fold(f64::NEG_INFINITY, f64::max);
+        simulations.symbols.iter()
+            .zip(simulations.values.columns())
+            .map(|(symbol, column)| (symbol.clone(), histogram(column, n_bins)))
+            .collect()
+    }
+    
+    /// Replicate estimates of a per-simulation statistic, each on an
+    /// independent stream (or an independently shifted Halton set).
+    /// Replicates run in parallel; each is seeded from its index, so the
+    /// result does not depend on the number of threads.
+    fn replicate_estimates<F>(&self, statistic: F) -> Vec<f64>
+    where
+        F: Fn(&Simulations) -> f64 + Sync,
+    {
+        let replicates = self.config.n_replicates.max(2);
+        let per_replicate = (self.config.n_simulations / replicates).max(1);
         
-        if (max_val - min_val).abs() < 1e-10 {
-            let mut dist = vec![0.0; n_bins];
-            dist[n_bins / 2] = 1.0;
-            return dist;
-        }
+        (0..replicates as u64)
+            .into_par_iter()
+            .map(|r| statistic(&self.simulate_replicate(per_replicate, r)))
+            .collect()
+    }
+    
+    /// Replicate estimates of a per-column statistic for every symbol.
+    pub fn estimate_per_symbol<F>(&self, statistic: F) -> HashMap<String, ProbabilityEstimate>
+    where
+        F: Fn(ArrayView1<'_, f64>) -> f64 + Sync,
+    {
+        let replicates = self.config.n_replicates.max(2);
+        let per_replicate = (self.config.n_simulations / replicates).max(1);
         
-        let bin_width = (max_val - min_val) / n_bins as f64;
-        let mut distribution = vec![0.0; n_bins];
+        let by_replicate: Vec<Vec<f64>> = (0..replicates as u64)
+            .into_par_iter()
+            .map(|r| {
+                let simulations = self.simulate_replicate(per_replicate, r);
+                simulations.values.columns().into_iter().map(&statistic).collect()
+            })
+            .collect();
         
-        for value in values {
-            let bin = ((value - min_val) / bin_width) as usize;
-            let bin_idx = bin.min(n_bins - 1);
-            distribution[bin_idx] += 1.0;
-        }
+        self.symbols.iter()
+            .enumerate()
+            .map(|(j, symbol)| {
+                let estimates: Vec<f64> = by_replicate.iter()
+                    .map(|row| row.get(j).copied().unwrap_or(0.0))
+                    .collect();
+                (symbol.clone(), ProbabilityEstimate::from_replicates(&estimates))
+            })
+            .collect()
+    }
+    
+    /// Peak bin probability of every symbol's `n_bins` distribution, with
+    /// its Monte Carlo standard error across replicates.
+    pub fn estimate_peak_probabilities(&self, n_bins: usize) -> HashMap<String, ProbabilityEstimate> {
+        self.estimate_per_symbol(|column| {
+            histogram(column, n_bins).into_iter().fold(0.0, f64::max)
+        })
+    }
+    
+    pub fn estimate_joint_probability(&self, symbols: &[&str], thresholds: &[f64]) -> ProbabilityEstimate {
+        // Unknown symbols never exceed their threshold
+        let columns: Option<Vec<(usize, f64)>> = symbols.iter()
+            .zip(thresholds.iter())
+            .map(|(sym, &thresh)| self.symbol_index(sym).map(|i| (i, thresh)))
+            .collect();
         
-        let sum: f64 = distribution.iter().sum();
-        if sum > 0.0 {
-            for prob in distribution.iter_mut() {
-                *prob /= sum;
-            }
-        }
+        let estimates = self.replicate_estimates(|simulations| match &columns {
+            Some(columns) => simulations.fraction_above(columns),
+            None => 0.0,
+        });
         
-        distribution
+        ProbabilityEstimate::from_replicates(&estimates)
     }
     
     pub fn get_joint_probability(&self, symbols: &[&str], thresholds: &[f64]) -> f64 {
-        let simulations = self.simulate(10000);
-        
-        let count = simulations.iter()
-            .filter(|sim| {
-                symbols.iter().zip(thresholds.iter())
-                    .all(|(sym, thresh)| {
-                        sim.get(*sym)
-                            .map(|&val| val > *thresh)
-                            .unwrap_or(false)
-                    })
-            })
-            .count();
+        self.estimate_joint_probability(symbols, thresholds).probability
+    }
+    
+    pub fn estimate_conditional_probability(&self, symbol: &str, condition: &str,
+                                            threshold: f64, cond_threshold: f64) -> ProbabilityEstimate {
+        let (Some(sym_idx), Some(cond_idx)) = (self.symbol_index(symbol), self.symbol_index(condition)) else {
+            return ProbabilityEstimate::from_replicates(&[0.0, 0.0]);
+        };
+        
+        let estimates = self.replicate_estimates(|simulations| {
+            let p_cond = simulations.fraction_above(&[(cond_idx, cond_threshold)]);
+            if p_cond == 0.0 {
+                return 0.0;
+            }
+            
+            simulations.fraction_above(&[(sym_idx, threshold), (cond_idx, cond_threshold)]) / p_cond
+        });
         
-        count as f64 / simulations.len() as f64
+        ProbabilityEstimate::from_replicates(&estimates)
     }
     
     pub fn get_conditional_probability(&self, symbol: &str, condition: &str, 
                                         threshold: f64, cond_threshold: f64) -> f64 {
-        let simulations = self.simulate(10000);
-        
-        let count_cond = simulations.iter()
-            .filter(|sim| {
-                sim.get(condition)
-                    .map(|&val| val > cond_threshold)
-                    .unwrap_or(false)
-            })
-            .count();
-        
-        if count_cond == 0 {
-            return 0.0;
-        }
-        
-        let count_joint = simulations.iter()
-            .filter(|sim| {
-                let sym_val = sim.get(symbol).map(|&v| v > threshold).unwrap_or(false);
-                let cond_val = sim.get(condition).map(|&v| v > cond_threshold).unwrap_or(false);
-                sym_val && cond_val
-            })
-            .count();
-        
-        count_joint as f64 / count_cond as f64
+        self.estimate_conditional_probability(symbol, condition, threshold, cond_threshold)
+            .probability
     }
     
     pub fn get_correlation_matrix(&self) -> &Array2<f64> {
         &self.correlation_matrix
     }
     
+    pub fn get_cholesky_factor(&self) -> &Array2<f64> {
+        &self.cholesky_factor
+    }
+    
     pub fn symbols(&self) -> &Vec<String> {
         &self.symbols
     }
+    
+    fn symbol_index(&self, symbol: &str) -> Option<usize> {
+        self.symbols.iter().position(|s| s == symbol)
+    }
+}
+
+/// Normalized `n_bins` histogram of the finite values between their min and max.
+fn histogram(column: ArrayView1<'_, f64>, n_bins: usize) -> Vec<f64> {
+    let values: Vec<f64> = column.iter().copied().filter(|v| v.is_finite()).collect();
+    
+    if values.is_empty() {
+        return vec![0.0; n_bins];
+    }
+    
+    let min_val = values.iter().copied().fold(f64::INFINITY, f64::min);
+    let max_val = values.iter().copied().fold(f64::NEG_INFINITY, f64::max);
+    
+    if (max_val - min_val).abs() < 1e-10 {
+        let mut dist = vec![0.0; n_bins];
+        dist[n_bins / 2] = 1.0;
+        return dist;
+    }
+    
+    let bin_width = (max_val - min_val) / n_bins as f64;
+    let mut distribution = vec![0.0; n_bins];
+    
+    for value in values {
+        let bin = ((value - min_val) / bin_width) as usize;
+        let bin_idx = bin.min(n_bins - 1);
+        distribution[bin_idx] += 1.0;
+    }
+    
+    let sum: f64 = distribution.iter().sum();
+    if sum > 0.0 {
+        for prob in distribution.iter_mut() {
+            *prob /= sum;
+        }
+    }
+    
+    distribution
+}
+
+fn first_primes(n: usize) -> Vec<u64> {
+    let mut primes: Vec<u64> = Vec::with_capacity(n);
+    let mut candidate = 2u64;
+    
+    while primes.len() < n {
+        if primes.iter().take_while(|&&p| p * p <= candidate).all(|&p| candidate % p != 0) {
+            primes.push(candidate);
+        }
+        candidate += 1;
+    }
+    
+    primes
+}
+
+fn radical_inverse(mut index: u64, base: u64) -> f64 {
+    let inv_base = 1.0 / base as f64;
+    let mut factor = inv_base;
+    let mut result = 0.0;
+    
+    while index > 0 {
+        result += factor * (index % base) as f64;
+        index /= base;
+        factor *= inv_base;
+    }
+    
+    result
+}
+
+/// Whether a Cholesky factor came from a positive definite matrix, i.e.
+/// every pivot is finite and positive.
+fn is_positive_definite(factor: &Array2<f64>) -> bool {
+    (0..factor.nrows()).all(|i| factor[[i, i]].is_finite() && factor[[i, i]] > 0.0)
+}
+
+/// Clip the eigenvalues of a symmetric matrix at `eps` and rescale the
+/// result to a unit diagonal, giving a positive definite correlation matrix.
+fn nearest_positive_definite(matrix: &Array2<f64>, eps: f64) -> Array2<f64> {
+    let n = matrix.nrows();
+    let symmetric = DMatrix::from_fn(n, n, |i, j| 0.5 * (matrix[[i, j]] + matrix[[j, i]]));
+    let eigen = symmetric.symmetric_eigen();
+    let clipped = eigen.eigenvalues.map(|v| if v.is_finite() { v.max(eps) } else { eps });
+    let repaired = &eigen.eigenvectors
+        * DMatrix::from_diagonal(&clipped)
+        * eigen.eigenvectors.transpose();
+    
+    Array2::from_shape_fn((n, n), |(i, j)| {
+        if i == j {
+            1.0
+        } else {
+            repaired[(i, j)] / (repaired[(i, i)] * repaired[(j, j)]).sqrt()
+        }
+    })
+}
+
+/// In-place rank-one update of a lower Cholesky factor: L L^T + x x^T.
+fn cholesky_rank_one_update(l: &mut Array2<f64>, x: &mut [f64]) {
+    let n = x.len();
+    
+    for k in 0..n {
+        let diag = l[[k, k]];
+        let r = diag.hypot(x[k]);
+        let c = r / diag;
+        let s = x[k] / diag;
+        l[[k, k]] = r;
+        
+        for i in (k + 1)..n {
+            l[[i, k]] = (l[[i, k]] + s * x[i]) / c;
+            x[i] = c * x[i] - s * l[[i, k]];
+        }
+    }
 }
@@ -4,15 +4,20 @@ pub mod random_forest;
 pub mod gaussian_copula;
 pub mod betafish_search;
 pub mod exa_search;
+pub mod config;
 pub mod lib_tests;
 
 pub use types::{EquityData, TrainingSample, Prediction, AlphaResult};
-pub use random_forest::{RandomForest, ModelMetrics};
-pub use gaussian_copula::GaussianCopula;
-pub use betafish_search::BetafishSearch;
+pub use random_forest::{RandomForest, ModelMetrics, FLAT_FOREST_FILE};
+pub use decision_tree::FlatTree;
+pub use gaussian_copula::{GaussianCopula, SimulationConfig, SamplingMethod, Shrinkage, ProbabilityEstimate,
+                          Simulations, COPULA_SIMULATIONS_FILE};
+pub use betafish_search::{BetafishSearch, top_k_by};
 pub use exa_search::{ExaSearch, CorrelationAnalysis};
+pub use config::ModelConfig;
 
 use std::collections::HashMap;
+use std::path::Path;
 
 pub struct ModelPipeline {
     random_forest: RandomForest,
@@ -23,11 +28,15 @@ pub struct ModelPipeline {
 
 impl ModelPipeline {
     pub fn new() -> Self {
+        Self::from_config(&ModelConfig::default())
+    }
+    
+    pub fn from_config(config: &ModelConfig) -> Self {
         ModelPipeline {
             random_forest: RandomForest::new(100, 20, 5, 10),
-            gaussian_copula: GaussianCopula::new(),
+            gaussian_copula: GaussianCopula::with_config(config.simulation.clone()),
             betafish_search: BetafishSearch::new(30, 5),
-            exa_search: ExaSearch::new(0.01, 5),
+            exa_search: ExaSearch::with_simulation_config(0.01, 5, config.simulation.clone()),
         }
     }
     
@@ -77,6 +86,27 @@ impl ModelPipeline {
         })
     }
     
+    /// Predict returns for a row-major `n_rows x n_features` feature matrix.
+    pub fn predict_batch(&self, rows: &[f64], n_features: usize) -> Vec<f64> {
+        self.random_forest.predict_matrix(rows, n_features)
+    }
+    
+    /// Export the trained forest as flat arrays for the NumPy predictor.
+    pub fn export_forest(&self, path: &Path) -> std::io::Result<()> {
+        self.random_forest.export_flat(path)
+    }
+    
+    /// Replace the forest with one exported by `export_forest`.
+    pub fn load_forest(&mut self, path: &Path) -> std::io::Result<()> {
+        self.random_forest = RandomForest::load_flat(path)?;
+        Ok(())
+    }
+    
+    /// Write `n_simulations` copula draws for memory-mapped use from Python.
+    pub fn export_simulations(&self, path: &Path, n_simulations: usize) -> std::io::Result<()> {
+        self.gaussian_copula.simulate(n_simulations).write_to(path)
+    }
+    
     pub fn get_strongest_movers(&self, data: &HashMap<String, Vec<EquityData>>) -> Vec<AlphaResult> {
         self.betafish_search.find_strongest_movers(data)
     }
@@ -89,6 +119,11 @@ impl ModelPipeline {
         self.exa_search.find_highest_probable_alpha(data)
     }
     
+    /// Monte Carlo standard errors of the `get_highest_probable_alpha` probabilities.
+    pub fn get_probability_estimates(&self) -> HashMap<String, ProbabilityEstimate> {
+        self.exa_search.probability_estimates()
+    }
+    
     pub fn get_model_metrics(&self) -> ModelMetrics {
         ModelMetrics {
             mse: 0.0,
@@ -1,8 +1,10 @@
 #[cfg(test)]
 mod tests {
     use crate::types::{EquityData, TrainingSample};
-    use crate::random_forest::RandomForest;
-    use crate::gaussian_copula::GaussianCopula;
+    use crate::random_forest::{RandomForest, FLAT_FOREST_MAGIC};
+    use crate::decision_tree::DecisionTree;
+    use crate::gaussian_copula::{GaussianCopula, SamplingMethod, Shrinkage, SimulationConfig, SIMULATIONS_MAGIC};
+    use crate::config::ModelConfig;
     use crate::betafish_search::BetafishSearch;
     use crate::exa_search::ExaSearch;
     use std::collections::HashMap;
@@ -126,6 +128,121 @@ mod tests {
         assert_eq!(predictions.len(), 2);
     }
     
+    #[test]
+    fn test_random_forest_predict_matrix_matches_rows() {
+        let mut samples = Vec::new();
+        
+        for i in 0..100 {
+            let features = vec![
+                100.0 + i as f64,
+                1000000.0,
+                0.02,
+                (i as f64 - 50.0) / 100.0,
+            ];
+            samples.push(TrainingSample {
+                features,
+                target: (i as f64 - 50.0) / 100.0,
+                symbol: "TEST".to_string(),
+            });
+        }
+        
+        let mut rf = RandomForest::new(5, 5, 2, 3);
+        rf.fit(&samples);
+        
+        let rows: Vec<f64> = samples.iter()
+            .flat_map(|s| s.features.iter().copied())
+            .collect();
+        let predictions = rf.predict_matrix(&rows, 4);
+        
+        assert_eq!(predictions.len(), samples.len());
+        for (sample, prediction) in samples.iter().zip(&predictions) {
+            assert!((rf.predict(&sample.features) - prediction).abs() < 1e-12);
+        }
+    }
+    
+    #[test]
+    fn test_decision_tree_flatten_matches_predict() {
+        let samples: Vec<TrainingSample> = (0..60)
+            .map(|i| TrainingSample {
+                features: vec![i as f64, (i % 7) as f64, (i as f64).sin()],
+                target: (i as f64 / 10.0).cos(),
+                symbol: "TEST".to_string(),
+            })
+            .collect();
+        
+        let mut tree = DecisionTree::new(6, 2, 3);
+        tree.fit(&samples);
+        let flat = tree.flatten();
+        
+        for sample in &samples {
+            let mut node = 0usize;
+            while flat.feature[node] >= 0 {
+                let f = flat.feature[node] as usize;
+                node = if sample.features[f] <= flat.threshold[node] {
+                    flat.left[node] as usize
+                } else {
+                    flat.right[node] as usize
+                };
+            }
+            assert!((flat.value[node] - tree.predict(&sample.features)).abs() < 1e-12);
+        }
+    }
+    
+    #[test]
+    fn test_random_forest_export_flat() {
+        let samples: Vec<TrainingSample> = (0..60)
+            .map(|i| TrainingSample {
+                features: vec![i as f64, (i % 7) as f64],
+                target: i as f64 / 60.0,
+                symbol: "TEST".to_string(),
+            })
+            .collect();
+        
+        let mut rf = RandomForest::new(4, 4, 2, 2);
+        rf.fit(&samples);
+        
+        let path = std::env::temp_dir().join(format!("rff_test_{}.rff", std::process::id()));
+        rf.export_flat(&path).unwrap();
+        let bytes = std::fs::read(&path).unwrap();
+        std::fs::remove_file(&path).ok();
+        
+        assert_eq!(&bytes[0..8], FLAT_FOREST_MAGIC);
+        let header: Vec<u64> = bytes[8..40]
+            .chunks_exact(8)
+            .map(|b| u64::from_le_bytes(b.try_into().unwrap()))
+            .collect();
+        let (n_trees, n_nodes) = (header[0] as usize, header[2] as usize);
+        assert_eq!(n_trees, 4);
+        assert_eq!(bytes.len(), 40 + (n_trees + 1) * 8 + n_nodes * 28);
+    }
+    
+    #[test]
+    fn test_random_forest_load_flat_matches_predict() {
+        let samples: Vec<TrainingSample> = (0..60)
+            .map(|i| TrainingSample {
+                features: vec![i as f64, (i % 7) as f64, (i as f64).sin()],
+                target: (i as f64 / 10.0).cos(),
+                symbol: "TEST".to_string(),
+            })
+            .collect();
+        
+        let mut rf = RandomForest::new(5, 5, 2, 3);
+        rf.fit(&samples);
+        
+        let path = std::env::temp_dir().join(format!("rff_load_test_{}.rff", std::process::id()));
+        rf.export_flat(&path).unwrap();
+        let loaded = RandomForest::load_flat(&path);
+        std::fs::remove_file(&path).ok();
+        let loaded = loaded.unwrap();
+        
+        let rows: Vec<f64> = samples.iter().flat_map(|s| s.features.iter().copied()).collect();
+        let expected = rf.predict_matrix(&rows, 3);
+        let actual = loaded.predict_matrix(&rows, 3);
+        for (a, e) in actual.iter().zip(&expected) {
+            assert!((a - e).abs() < 1e-12);
+        }
+    }
+    
     #[test]
     fn test_gaussian_copula_creation() {
         let copula = GaussianCopula::new();
@@ -153,6 +270,33 @@ mod tests {
         let simulations = copula.simulate(10);
         
         assert_eq!(simulations.len(), 10);
+        assert_eq!(simulations.values.dim(), (10, 1));
+        assert_eq!(simulations.symbols, vec!["TEST".to_string()]);
+        assert!(simulations.column("TEST").is_some());
+    }
+    
+    #[test]
+    fn test_simulations_write_to() {
+        let mut copula = GaussianCopula::new();
+        let mut data = HashMap::new();
+        data.insert("TEST".to_string(), create_sample_data());
+        
+        copula.fit(&data);
+        let simulations = copula.simulate(5);
+        let path = std::env::temp_dir().join("rust_model_test_simulations.bin");
+        simulations.write_to(&path).unwrap();
+        
+        let bytes = std::fs::read(&path).unwrap();
+        std::fs::remove_file(&path).ok();
+        
+        let header = |i: usize| u64::from_le_bytes(bytes[8 + 8 * i..16 + 8 * i].try_into().unwrap());
+        assert_eq!(&bytes[..8], SIMULATIONS_MAGIC);
+        assert_eq!((header(0), header(1)), (5, 1));
+        let data_offset = header(2) as usize;
+        assert_eq!(data_offset % 8, 0);
+        assert_eq!(bytes.len(), data_offset + 5 * 8);
+        let first = f64::from_le_bytes(bytes[data_offset..data_offset + 8].try_into().unwrap());
+        assert_eq!(first, simulations.values[[0, 0]]);
     }
     
     #[test]
@@ -169,6 +313,142 @@ mod tests {
         assert!((sum - 1.0).abs() < 0.01);
     }
     
+    #[test]
+    fn test_gaussian_copula_qmc_standard_error() {
+        let config = SimulationConfig {
+            n_simulations: 4000,
+            sampling: SamplingMethod::Halton,
+            antithetic: true,
+            n_replicates: 8,
+            seed: Some(42),
+            ..SimulationConfig::default()
+        };
+        let mut copula = GaussianCopula::with_config(config);
+        let mut data = HashMap::new();
+        data.insert("TEST".to_string(), create_sample_data());
+        
+        copula.fit(&data);
+        let estimate = copula.estimate_joint_probability(&["TEST"], &[0.0]);
+        
+        assert!(estimate.probability >= 0.0 && estimate.probability <= 1.0);
+        assert!(estimate.std_error >= 0.0 && estimate.std_error < 0.05);
+    }
+    
+    #[test]
+    fn test_gaussian_copula_peak_probability_estimates() {
+        let config = SimulationConfig {
+            n_simulations: 4000,
+            n_replicates: 8,
+            seed: Some(7),
+            ..SimulationConfig::default()
+        };
+        let mut copula = GaussianCopula::with_config(config);
+        let mut data = HashMap::new();
+        data.insert("TEST".to_string(), create_sample_data());
+        
+        copula.fit(&data);
+        let estimates = copula.estimate_peak_probabilities(100);
+        let estimate = &estimates["TEST"];
+        
+        assert!(estimate.probability > 0.0 && estimate.probability <= 1.0);
+        assert!(estimate.std_error >= 0.0 && estimate.std_error < estimate.probability);
+    }
+    
+    #[test]
+    fn test_gaussian_copula_shrinkage_wide_universe() {
+        let config = SimulationConfig {
+            shrinkage: Shrinkage::LedoitWolf,
+            ..SimulationConfig::default()
+        };
+        let mut copula = GaussianCopula::with_config(config);
+        let mut data = HashMap::new();
+        
+        // More symbols than overlapping returns makes the sample matrix singular
+        for s in 0..12 {
+            let series: Vec<EquityData> = create_sample_data()
+                .into_iter()
+                .take(8)
+                .enumerate()
+                .map(|(i, mut d)| {
+                    d.symbol = format!("S{}", s);
+                    d.close += ((i * (s + 1)) % 5) as f64;
+                    d
+                })
+                .collect();
+            data.insert(format!("S{}", s), series);
+        }
+        
+        copula.fit(&data);
+        let simulations = copula.simulate(100);
+        
+        assert_eq!(simulations.len(), 100);
+        assert_eq!(simulations.values.dim(), (100, 12));
+        assert!(simulations.values.iter().all(|v| v.is_finite()));
+        
+        // The cached factor belongs to the final (possibly repaired) matrix
+        let corr = copula.get_correlation_matrix();
+        let l = copula.get_cholesky_factor();
+        let reconstructed = l.dot(&l.t());
+        assert!(reconstructed.iter().zip(corr.iter()).all(|(a, b)| (a - b).abs() < 1e-9));
+    }
+    
+    #[test]
+    fn test_gaussian_copula_cached_factor_update() {
+        let mut copula = GaussianCopula::new();
+        let mut data = HashMap::new();
+        for (s, phase) in [("A", 0usize), ("B", 1), ("C", 3)] {
+            let series: Vec<EquityData> = create_sample_data()
+                .into_iter()
+                .enumerate()
+                .map(|(i, mut d)| {
+                    d.symbol = s.to_string();
+                    d.close += ((i + phase) % 7) as f64;
+                    d
+                })
+                .collect();
+            data.insert(s.to_string(), series);
+        }
+        
+        copula.fit(&data);
+        copula.update_with_returns(&[vec![0.02, -0.01, 0.03], vec![-0.01, 0.0, 0.01]], 0.9);
+        
+        let corr = copula.get_correlation_matrix();
+        let l = copula.get_cholesky_factor();
+        let reconstructed = l.dot(&l.t());
+        for i in 0..3 {
+            assert!((corr[[i, i]] - 1.0).abs() < 1e-9);
+            for j in 0..3 {
+                assert!((reconstructed[[i, j]] - corr[[i, j]]).abs() < 1e-9);
+            }
+        }
+    }
+    
+    #[test]
+    fn test_model_config_from_yaml() {
+        let yaml = "architecture:\n  models:\n    gaussian_copula:\n      n_simulations: 2048\n\
+                    copula:\n  sampling: qmc\n  antithetic: true\n  random_state: 7\n";
+        let config = ModelConfig::from_yaml(yaml).unwrap();
+        
+        assert_eq!(config.simulation.n_simulations, 2048);
+        assert_eq!(config.simulation.sampling, SamplingMethod::Halton);
+        assert!(config.simulation.antithetic);
+        assert_eq!(config.simulation.seed, Some(7));
+    }
+    
+    #[test]
+    fn test_model_config_assets_and_redis() {
+        let yaml = "architecture:\n  backend:\n    redis:\n      host: cache\n      port: 6380\n\
+                    data:\n  assets:\n    - MNQ\n    - NVDA\n";
+        let config = ModelConfig::from_yaml(yaml).unwrap();
+        
+        assert_eq!(config.assets, vec!["MNQ".to_string(), "NVDA".to_string()]);
+        assert_eq!(config.redis_url, "redis://cache:6380");
+        
+        let defaults = ModelConfig::from_yaml("copula: {}\n").unwrap();
+        assert_eq!(defaults.assets.len(), 16);
+        assert_eq!(defaults.redis_url, "redis://localhost:6379");
+    }
+    
     #[test]
     fn test_betafish_search() {
         let search = BetafishSearch::new(30, 5);
@@ -1,7 +1,11 @@
-use rust_model::{ModelPipeline, EquityData};
+use rust_model::{ModelPipeline, ModelConfig, EquityData, COPULA_SIMULATIONS_FILE, FLAT_FOREST_FILE};
+use rayon::prelude::*;
 use std::collections::HashMap;
 use redis::RedisResult;
 
+/// Keys per MGET round trip when loading a symbol's bars.
+const MGET_CHUNK: usize = 1000;
+
 #[derive(Debug, serde::Deserialize)]
 struct RedisEquityData {
     symbol: String,
@@ -17,6 +21,22 @@ fn main() {
     println!("Financial Forecasting Model Pipeline");
     println!("=====================================\n");
     
+    let args: Vec<String> = std::env::args().collect();
+    if let Some(pos) = args.iter().position(|a| a == "--predict-batch") {
+        if args.len() < pos + 3 {
+            println!("Usage: rust-model --predict-batch <features.bin> <predictions.bin>");
+            std::process::exit(2);
+        }
+        run_batch_prediction(&args[pos + 1], &args[pos + 2]);
+        return;
+    }
+    
+    let data_by_symbol = fetch_data();
+    let days = 240; // 240-day analysis window
+    run_analysis(&data_by_symbol, days);
+}
+
+fn fetch_data() -> HashMap<String, Vec<EquityData>> {
     println!("Fetching real historical data from Redis...");
     let data_by_symbol = fetch_from_redis();
     
@@ -28,92 +48,166 @@ fn main() {
         println!("No data found in Redis! Please run download_historical.py first.");
         std::process::exit(1);
     }
+    data_by_symbol
+}
+
+/// Score a feature matrix file with the exported forest and write the predictions.
+///
+/// The forest is read from `FLAT_FOREST_FILE` in the model directory; only
+/// when none can be loaded is a new one trained from Redis and exported.
+/// Both files are little-endian: the input is `u64 n_rows, u64 n_features`
+/// followed by the row-major `f64` matrix, the output is `u64 n_rows`
+/// followed by one `f64` prediction per row.
+fn run_batch_prediction(input: &str, output: &str) {
+    let config = ModelConfig::load();
+    let mut pipeline = ModelPipeline::from_config(&config);
+    let forest_path = config.model_dir.join(FLAT_FOREST_FILE);
+    match pipeline.load_forest(&forest_path) {
+        Ok(()) => println!("Loaded forest from {}", forest_path.display()),
+        Err(e) => {
+            println!("No usable forest at {} ({}); training a new one", forest_path.display(), e);
+            let data_by_symbol = fetch_data();
+            pipeline.train(&data_by_symbol);
+            export_forest(&pipeline, &config);
+        }
+    }
+    
+    let (rows, n_features) = match read_matrix(input) {
+        Ok(matrix) => matrix,
+        Err(e) => {
+            println!("Failed to read {}: {}", input, e);
+            std::process::exit(1);
+        }
+    };
+    
+    let predictions = pipeline.predict_batch(&rows, n_features);
+    
+    let mut bytes = Vec::with_capacity(8 + predictions.len() * 8);
+    bytes.extend_from_slice(&(predictions.len() as u64).to_le_bytes());
+    for p in &predictions {
+        bytes.extend_from_slice(&p.to_le_bytes());
+    }
+    if let Err(e) = std::fs::write(output, bytes) {
+        println!("Failed to write {}: {}", output, e);
+        std::process::exit(1);
+    }
     
-    let days = 240; // 240-day analysis window
-    run_analysis(&data_by_symbol, days);
+    println!("Wrote {} predictions to {}", predictions.len(), output);
 }
 
-fn fetch_from_redis() -> HashMap<String, Vec<EquityData>> {
-    let client = redis::Client::open("redis://localhost").expect("Failed to connect to Redis");
-    let mut con = client.get_connection().expect("Failed to get Redis connection");
+fn export_forest(pipeline: &ModelPipeline, config: &ModelConfig) {
+    let path = config.model_dir.join(FLAT_FOREST_FILE);
+    match pipeline.export_forest(&path) {
+        Ok(()) => println!("Exported forest to {}", path.display()),
+        Err(e) => println!("Failed to export forest to {}: {}", path.display(), e),
+    }
+}
+
+fn export_simulations(pipeline: &ModelPipeline, config: &ModelConfig) {
+    let path = config.model_dir.join(COPULA_SIMULATIONS_FILE);
+    match pipeline.export_simulations(&path, config.simulation.n_simulations) {
+        Ok(()) => println!("Exported copula simulations to {}", path.display()),
+        Err(e) => println!("Failed to export simulations to {}: {}", path.display(), e),
+    }
+}
+
+fn read_matrix(path: &str) -> std::io::Result<(Vec<f64>, usize)> {
+    let bytes = std::fs::read(path)?;
+    let invalid = |msg: &str| std::io::Error::new(std::io::ErrorKind::InvalidData, msg.to_string());
+    if bytes.len() < 16 {
+        return Err(invalid("missing matrix header"));
+    }
     
-    let symbols = vec![
-        "MNQ", "NVDA", "AMD", "WDC", "SLV", 
-        "GS", "NET", "EWJ", "EURUSD", "INRJPY", 
-        "STLD", "CRCL", "UBS", "TTWO", "ETHUSD"
-    ];
+    let n_rows = u64::from_le_bytes(bytes[0..8].try_into().unwrap()) as usize;
+    let n_features = u64::from_le_bytes(bytes[8..16].try_into().unwrap()) as usize;
+    let body = &bytes[16..];
+    if body.len() != n_rows * n_features * 8 {
+        return Err(invalid("matrix size does not match header"));
+    }
     
-    let mut data_by_symbol: HashMap<String, Vec<EquityData>> = HashMap::new();
+    let rows = body
+        .chunks_exact(8)
+        .map(|b| f64::from_le_bytes(b.try_into().unwrap()))
+        .collect();
+    Ok((rows, n_features))
+}
+
+/// Load every configured symbol's bars in timestamp order.
+///
+/// Members of the `symbol:{symbol}` sorted set are already ordered by
+/// timestamp, so each symbol costs one ZRANGE plus one MGET per
+/// `MGET_CHUNK` keys. Symbols are loaded in parallel, each on its own
+/// connection.
+fn fetch_from_redis() -> HashMap<String, Vec<EquityData>> {
+    let config = ModelConfig::load();
+    let client = redis::Client::open(config.redis_url.as_str())
+        .expect("Failed to connect to Redis");
     
-    for symbol in &symbols {
-        println!("Fetching {} from Redis...", symbol);
-        
-        let pattern = format!("equity:{}:*", symbol);
-        let keys: Vec<String> = redis::cmd("KEYS")
-            .arg(&pattern)
-            .query(&mut con)
-            .expect("Failed to fetch keys");
-        
-        if keys.is_empty() {
-            println!("  No data found for {}", symbol);
-            continue;
-        }
-        
-        // Get values for all keys
-        let mut values: Vec<(String, String)> = Vec::new();
-        for key in &keys {
-            let value: String = redis::cmd("GET")
-                .arg(key)
-                .query(&mut con)
-                .expect("Failed to get value");
-            values.push((key.clone(), value));
-        }
-        
-        // Sort by timestamp
-        values.sort_by_key(|(k, _)| {
-            let parts: Vec<&str> = k.split(':').collect();
-            parts[2].parse::<u64>().unwrap_or(0)
-        });
-        
-        let mut data = Vec::new();
-        for (key, value) in &values {
-            match serde_json::from_str::<RedisEquityData>(value) {
-                Ok(redis_data) => {
-                    let equity = EquityData {
-                        symbol: redis_data.symbol,
-                        timestamp: redis_data.timestamp as i64,
-                        open: redis_data.open,
-                        high: redis_data.high,
-                        low: redis_data.low,
-                        close: redis_data.close,
-                        volume: redis_data.volume as f64,
-                        adjusted_close: redis_data.close,
-                        moving_averages: None,
-                        rsi: None,
-                        macd: None,
-                    };
-                    data.push(equity);
-                }
-                Err(e) => {
-                    println!("  Failed to parse {}: {}", key, e);
-                }
+    config
+        .assets
+        .par_iter()
+        .filter_map(|symbol| match fetch_symbol(&client, symbol) {
+            Ok(data) if !data.is_empty() => {
+                println!("  Loaded {} records for {}", data.len(), symbol);
+                Some((symbol.clone(), data))
             }
-        }
+            Ok(_) => {
+                println!("  No data found for {}", symbol);
+                None
+            }
+            Err(e) => {
+                println!("  Failed to fetch {}: {}", symbol, e);
+                None
+            }
+        })
+        .collect()
+}
+
+fn fetch_symbol(client: &redis::Client, symbol: &str) -> RedisResult<Vec<EquityData>> {
+    let mut con = client.get_connection()?;
+    let keys: Vec<String> = redis::cmd("ZRANGE")
+        .arg(format!("symbol:{}", symbol))
+        .arg(0)
+        .arg(-1)
+        .query(&mut con)?;
+    
+    let mut data = Vec::with_capacity(keys.len());
+    for chunk in keys.chunks(MGET_CHUNK) {
+        let values: Vec<Option<String>> = redis::cmd("MGET").arg(chunk).query(&mut con)?;
         
-        if !data.is_empty() {
-            println!("  Loaded {} records", data.len());
-            data_by_symbol.insert(symbol.to_string(), data);
+        for (key, value) in chunk.iter().zip(values) {
+            // Index members can outlive their expired records
+            let Some(value) = value else { continue };
+            match serde_json::from_str::<RedisEquityData>(&value) {
+                Ok(redis_data) => data.push(EquityData {
+                    symbol: redis_data.symbol,
+                    timestamp: redis_data.timestamp as i64,
+                    open: redis_data.open,
+                    high: redis_data.high,
+                    low: redis_data.low,
+                    close: redis_data.close,
+                    volume: redis_data.volume as f64,
+                    adjusted_close: redis_data.close,
+                    moving_averages: None,
+                    rsi: None,
+                    macd: None,
+                }),
+                Err(e) => println!("  Failed to parse {}: {}", key, e),
+            }
         }
     }
     
-    data_by_symbol
+    Ok(data)
 }
 
 fn run_analysis(data_by_symbol: &HashMap<String, Vec<EquityData>>, days: i64) {
-    let mut pipeline = ModelPipeline::new();
+    let config = ModelConfig::load();
+    let mut pipeline = ModelPipeline::from_config(&config);
     
     println!("Training models on real historical data ({} days)...", days);
     pipeline.train(data_by_symbol);
+    export_forest(&pipeline, &config);
+    export_simulations(&pipeline, &config);
     println!("Training complete!\n");
     
     let window_label = match days {
@@ -140,11 +234,13 @@ fn run_analysis(data_by_symbol: &HashMap<String, Vec<EquityData>>, days: i64) {
     
     println!("\n=== Highest Probable Alpha (Gaussian Copula - Real Data) ===");
     let probable_alpha = pipeline.get_highest_probable_alpha(data_by_symbol);
+    let estimates = pipeline.get_probability_estimates();
     for result in &probable_alpha {
         let prob_pct = result.probability * 100.0;
+        let se_pct = estimates.get(&result.symbol).map_or(f64::NAN, |e| e.std_error * 100.0);
         let change_pct = result.change;
-        println!("Symbol: {:<8} | Alpha: {:>8.4} | Probability: {:>6.2}% | Change: {:>7.2}%", 
-                 result.symbol, result.alpha, prob_pct, change_pct);
+        println!("Symbol: {:<8} | Alpha: {:>8.4} | Probability: {:>6.2}% ± {:>5.2}% (SE) | Change: {:>7.2}%", 
+                 result.symbol, result.alpha, prob_pct, se_pct, change_pct);
     }
     
     let corr_analysis = pipeline.get_correlation_analysis();
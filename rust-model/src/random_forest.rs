@@ -1,7 +1,20 @@
-use crate::decision_tree::DecisionTree;
+use crate::decision_tree::{DecisionTree, FlatTree};
 use crate::types::TrainingSample;
 use rand::Rng;
+use rayon::prelude::*;
 use std::collections::HashMap;
+use std::fs::File;
+use std::io::{self, BufWriter, Write};
+use std::path::Path;
+
+/// Rows scored against all trees before moving to the next block.
+const PREDICT_BLOCK_ROWS: usize = 256;
+
+/// File name of the exported forest inside the model directory.
+pub const FLAT_FOREST_FILE: &str = "random_forest.rff";
+
+/// Magic bytes that open a flattened forest file.
+pub const FLAT_FOREST_MAGIC: &[u8; 8] = b"RFFLAT1\0";
 
 pub struct RandomForest {
     trees: Vec<DecisionTree>,
@@ -85,9 +98,178 @@ impl RandomForest {
     }
     
     pub fn predict_batch(&self, sample_list: &[Vec<f64>]) -> Vec<f64> {
-        sample_list.iter()
-            .map(|features| self.predict(features))
-            .collect()
+        let n_features = match sample_list.first() {
+            Some(features) => features.len(),
+            None => return Vec::new(),
+        };
+        
+        let rows: Vec<f64> = sample_list.iter()
+            .flat_map(|features| features.iter().copied())
+            .collect();
+        self.predict_matrix(&rows, n_features)
+    }
+    
+    /// Predict every row of a row-major `n_rows x n_features` matrix.
+    ///
+    /// Rows are scored in blocks of `PREDICT_BLOCK_ROWS`, tree by tree, so
+    /// each tree is traversed for a whole block before moving on; blocks
+    /// are processed in parallel.
+    pub fn predict_matrix(&self, rows: &[f64], n_features: usize) -> Vec<f64> {
+        if n_features == 0 {
+            return Vec::new();
+        }
+        
+        let n_rows = rows.len() / n_features;
+        let mut predictions = vec![0.0; n_rows];
+        if self.trees.is_empty() {
+            return predictions;
+        }
+        
+        let n_trees = self.trees.len() as f64;
+        predictions
+            .par_chunks_mut(PREDICT_BLOCK_ROWS)
+            .zip(rows[..n_rows * n_features].par_chunks(PREDICT_BLOCK_ROWS * n_features))
+            .for_each(|(out, block)| {
+                for tree in &self.trees {
+                    tree.accumulate_rows(block, n_features, out);
+                }
+                for p in out.iter_mut() {
+                    *p /= n_trees;
+                }
+            });
+        
+        predictions
+    }
+    
+    /// Flatten every tree and write them to `path` as one little-endian file.
+    ///
+    /// Layout: `FLAT_FOREST_MAGIC`, then `u64` n_trees, n_features, n_nodes
+    /// and max_depth, `u64` tree offsets (n_trees + 1), and the node arrays
+    /// `f64` threshold, `f64` value, `i32` feature, `i32` left, `i32` right.
+    /// Child indices are global, so tree `t` starts at `offsets[t]`.
+    pub fn export_flat(&self, path: &Path) -> io::Result<()> {
+        let flats: Vec<FlatTree> = self.trees.iter().map(|tree| tree.flatten()).collect();
+        
+        let n_nodes: usize = flats.iter().map(|f| f.len()).sum();
+        let max_depth = flats.iter().map(|f| f.depth).max().unwrap_or(0);
+        let n_features = flats.iter()
+            .flat_map(|f| f.feature.iter())
+            .map(|&f| f + 1)
+            .max()
+            .unwrap_or(0)
+            .max(0) as u64;
+        
+        let mut offsets = Vec::with_capacity(flats.len() + 1);
+        let mut start = 0usize;
+        offsets.push(0u64);
+        for flat in &flats {
+            start += flat.len();
+            offsets.push(start as u64);
+        }
+        
+        if let Some(parent) = path.parent() {
+            std::fs::create_dir_all(parent)?;
+        }
+        let mut out = BufWriter::new(File::create(path)?);
+        out.write_all(FLAT_FOREST_MAGIC)?;
+        for header in [flats.len() as u64, n_features, n_nodes as u64, max_depth as u64] {
+            out.write_all(&header.to_le_bytes())?;
+        }
+        for offset in &offsets {
+            out.write_all(&offset.to_le_bytes())?;
+        }
+        
+        for flat in &flats {
+            for v in &flat.threshold {
+                out.write_all(&v.to_le_bytes())?;
+            }
+        }
+        for flat in &flats {
+            for v in &flat.value {
+                out.write_all(&v.to_le_bytes())?;
+            }
+        }
+        for flat in &flats {
+            for v in &flat.feature {
+                out.write_all(&v.to_le_bytes())?;
+            }
+        }
+        for (flat, &base) in flats.iter().zip(&offsets) {
+            for v in &flat.left {
+                out.write_all(&(v + base as i32).to_le_bytes())?;
+            }
+        }
+        for (flat, &base) in flats.iter().zip(&offsets) {
+            for v in &flat.right {
+                out.write_all(&(v + base as i32).to_le_bytes())?;
+            }
+        }
+        out.flush()
+    }
+    
+    /// Load a forest written by `export_flat`.
+    pub fn load_flat(path: &Path) -> io::Result<Self> {
+        let bytes = std::fs::read(path)?;
+        let invalid = |msg: &str| io::Error::new(io::ErrorKind::InvalidData, msg.to_string());
+        if bytes.len() < 40 || &bytes[0..8] != FLAT_FOREST_MAGIC {
+            return Err(invalid("not a flattened forest file"));
+        }
+        
+        let u64_at = |i: usize| u64::from_le_bytes(bytes[i..i + 8].try_into().unwrap()) as usize;
+        let (n_trees, n_features, n_nodes, max_depth) = (u64_at(8), u64_at(16), u64_at(24), u64_at(32));
+        let offsets_end = 40 + (n_trees + 1) * 8;
+        if bytes.len() != offsets_end + n_nodes * 28 {
+            return Err(invalid("forest size does not match header"));
+        }
+        
+        let offsets: Vec<usize> = (0..=n_trees).map(|t| u64_at(40 + t * 8)).collect();
+        let f64s = |start: usize| -> Vec<f64> {
+            bytes[start..start + n_nodes * 8]
+                .chunks_exact(8)
+                .map(|b| f64::from_le_bytes(b.try_into().unwrap()))
+                .collect()
+        };
+        let i32s = |start: usize| -> Vec<i32> {
+            bytes[start..start + n_nodes * 4]
+                .chunks_exact(4)
+                .map(|b| i32::from_le_bytes(b.try_into().unwrap()))
+                .collect()
+        };
+        let threshold = f64s(offsets_end);
+        let value = f64s(offsets_end + n_nodes * 8);
+        let feature = i32s(offsets_end + n_nodes * 16);
+        let left = i32s(offsets_end + n_nodes * 20);
+        let right = i32s(offsets_end + n_nodes * 24);
+        
+        let mut forest = RandomForest::new(n_trees, max_depth, 0, n_features);
+        for window in offsets.windows(2) {
+            let (start, end) = (window[0], window[1]);
+            if start > end || end > n_nodes {
+                return Err(invalid("tree offsets out of range"));
+            }
+            // Child indices are stored globally; make them local to the tree
+            let local = |children: &[i32]| -> Vec<i32> {
+                children[start..end].iter().map(|&c| c - start as i32).collect()
+            };
+            let flat = FlatTree {
+                feature: feature[start..end].to_vec(),
+                threshold: threshold[start..end].to_vec(),
+                left: local(&left),
+                right: local(&right),
+                value: value[start..end].to_vec(),
+                depth: max_depth,
+            };
+            // Splits point forward (pre-order), which also rules out cycles
+            let n_local = flat.len() as i32;
+            let bad_child = |i: usize, c: i32| c <= i as i32 || c >= n_local;
+            if (0..flat.len()).any(|i| flat.feature[i] >= 0 && (bad_child(i, flat.left[i]) || bad_child(i, flat.right[i]))) {
+                return Err(invalid("child index outside its tree"));
+            }
+            forest.trees.push(DecisionTree::from_flat(&flat, n_features));
+        }
+        
+        forest.calculate_feature_importance(&[]);
+        Ok(forest)
     }
     
     fn calculate_feature_importance(&mut self, _samples: &[TrainingSample]) {
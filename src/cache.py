@@ -0,0 +1,100 @@
+"""Bounded in-process TTL/LRU cache for Java API responses."""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+import pandas as pd
+
+
+def frame_nbytes(value: Any) -> int:
+    """Approximate memory held by a cached value."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return 0
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    etag: Optional[str]
+    nbytes: int
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with a TTL and a total size budget.
+
+    Expired entries are kept (until evicted) so their ETag can be used to
+    revalidate with a conditional request; ``refresh`` renews an entry the
+    server reported as unchanged.
+    """
+
+    def __init__(self, ttl: float = 5.0, max_entries: int = 256, max_bytes: int = 256 * 2**20):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: Hashable) -> Optional[CacheEntry]:
+        """Entry for ``key`` (fresh or stale), marking it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.fresh:
+                self.misses += 1
+            else:
+                self.hits += 1
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, value: Any, etag: Optional[str] = None) -> None:
+        nbytes = frame_nbytes(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            if nbytes > self.max_bytes:
+                return
+
+            self._entries[key] = CacheEntry(value, etag, nbytes, time.monotonic() + self.ttl)
+            self.nbytes += nbytes
+            while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+    def refresh(self, key: Hashable) -> None:
+        """Restart the TTL of an entry after a 304 Not Modified."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires_at = time.monotonic() + self.ttl
+
+    def discard(self, match: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key satisfies ``match``; returns how many."""
+        with self._lock:
+            keys = [key for key in self._entries if match(key)]
+            for key in keys:
+                self.nbytes -= self._entries.pop(key).nbytes
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
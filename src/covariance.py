@@ -0,0 +1,156 @@
+"""Shrinkage correlation estimators and positive-definite repair."""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+SHRINKAGE_METHODS = ("none", "ledoit_wolf", "oas")
+
+
+def standardize(returns: pd.DataFrame) -> np.ndarray:
+    """
+    Z-score each column, treating missing observations as the column mean.
+
+    Args:
+        returns: Wide (time x symbol) return frame, possibly ragged
+
+    Returns:
+        Array of shape (n_observations, n_symbols) with zeros where data is
+        missing and for constant columns
+    """
+    values = returns.to_numpy(dtype=np.float64)
+    mean = np.nanmean(values, axis=0)
+    std = np.nanstd(values, axis=0)
+    std = np.where(std > 0, std, np.inf)
+    return np.nan_to_num((values - mean) / std, nan=0.0)
+
+
+def ledoit_wolf(z: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Ledoit-Wolf shrinkage of the sample correlation towards the identity.
+
+    Args:
+        z: Standardized returns of shape (n_observations, n_symbols)
+
+    Returns:
+        Tuple of (shrunk correlation matrix, shrinkage intensity)
+    """
+    n, p = z.shape
+    sample = z.T @ z / n
+    mu = np.trace(sample) / p
+    target = mu * np.eye(p)
+
+    delta = ((sample - target) ** 2).sum() / p
+    row_norms = (z**2).sum(axis=1)
+    beta_bar = ((row_norms**2).sum() / n - (sample**2).sum()) / (n * p)
+    beta = min(max(beta_bar, 0.0), delta)
+    shrinkage = beta / delta if delta > 0 else 0.0
+
+    return shrinkage * target + (1 - shrinkage) * sample, shrinkage
+
+
+def oas(z: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Oracle Approximating Shrinkage of the sample correlation.
+
+    Args:
+        z: Standardized returns of shape (n_observations, n_symbols)
+
+    Returns:
+        Tuple of (shrunk correlation matrix, shrinkage intensity)
+    """
+    n, p = z.shape
+    sample = z.T @ z / n
+    mu = np.trace(sample) / p
+    alpha = np.mean(sample**2)
+
+    num = alpha + mu**2
+    den = (n + 1.0) * (alpha - mu**2 / p)
+    shrinkage = 1.0 if den <= 0 else min(num / den, 1.0)
+
+    return shrinkage * mu * np.eye(p) + (1 - shrinkage) * sample, shrinkage
+
+
+def to_unit_diagonal(matrix: np.ndarray) -> np.ndarray:
+    """Rescale a covariance-like matrix to a correlation matrix."""
+    d = np.sqrt(np.clip(np.diag(matrix), 1e-300, None))
+    out = matrix / np.outer(d, d)
+    np.fill_diagonal(out, 1.0)
+    return out
+
+
+def nearest_positive_definite(matrix: np.ndarray, eps: float = 1e-8) -> np.ndarray:
+    """
+    Project a symmetric matrix onto the positive definite correlation matrices.
+
+    Eigenvalues are clipped at ``eps`` and the result is rescaled back to a
+    unit diagonal, which keeps it positive definite.
+
+    Args:
+        matrix: Symmetric (possibly indefinite) correlation matrix
+        eps: Smallest eigenvalue allowed before rescaling
+
+    Returns:
+        Positive definite correlation matrix
+    """
+    sym = (matrix + matrix.T) / 2
+    w, v = np.linalg.eigh(sym)
+    repaired = (v * np.maximum(w, eps)) @ v.T
+    return to_unit_diagonal(repaired)
+
+
+def estimate_correlation(returns: pd.DataFrame, shrinkage: str = "none") -> np.ndarray:
+    """
+    Estimate the correlation matrix of a wide return frame.
+
+    Args:
+        returns: Wide (time x symbol) return frame
+        shrinkage: ``none`` (pairwise sample correlation), ``ledoit_wolf``
+            or ``oas``
+
+    Returns:
+        Correlation matrix with a unit diagonal
+    """
+    if shrinkage not in SHRINKAGE_METHODS:
+        raise ValueError(
+            f"Unknown shrinkage method '{shrinkage}', expected one of {SHRINKAGE_METHODS}"
+        )
+
+    if shrinkage == "none":
+        corr = np.nan_to_num(returns.corr().to_numpy(), nan=0.0)
+        np.fill_diagonal(corr, 1.0)
+        return corr
+
+    z = standardize(returns)
+    estimator = ledoit_wolf if shrinkage == "ledoit_wolf" else oas
+    corr, _ = estimator(z)
+    return to_unit_diagonal(corr)
+
+
+def cholesky_rank_one_update(factor: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """
+    Update a lower Cholesky factor in place so that it factors ``L L^T + x x^T``.
+
+    Args:
+        factor: Lower-triangular factor ``L`` (modified in place)
+        x: Update vector
+
+    Returns:
+        The updated factor
+    """
+    x = np.array(x, dtype=np.float64)
+    n = len(x)
+
+    for k in range(n):
+        diag = factor[k, k]
+        r = np.hypot(diag, x[k])
+        c = r / diag
+        s = x[k] / diag
+        factor[k, k] = r
+        if k + 1 < n:
+            factor[k + 1:, k] = (factor[k + 1:, k] + s * x[k + 1:]) / c
+            x[k + 1:] = c * x[k + 1:] - s * factor[k + 1:, k]
+
+    return factor
@@ -0,0 +1,205 @@
+"""Decoding of equity record payloads from the Java API into typed columns."""
+
+import codecs
+import json
+from typing import Dict, Iterable, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+
+# Column name -> dtype for the flat fields of Java ``EquityData``
+EQUITY_FIELDS = {
+    "symbol": object,
+    "timestamp": np.int64,
+    "date": object,
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.float64,
+    "adjusted_close": np.float64,
+    "rsi": np.float64,
+}
+
+# Column name -> (nested object, key) for the indicator maps
+NESTED_FIELDS = {
+    "ma_5": ("moving_averages", "ma_5"),
+    "ma_10": ("moving_averages", "ma_10"),
+    "ma_20": ("moving_averages", "ma_20"),
+    "ma_50": ("moving_averages", "ma_50"),
+    "macd": ("macd", "macd"),
+    "macd_signal": ("macd", "signal"),
+    "macd_histogram": ("macd", "histogram"),
+}
+
+
+# Binary columnar format negotiated with the Java API (see ColumnarEncoder.java)
+COLUMNAR_MEDIA_TYPE = "application/vnd.equity.columnar"
+COLUMNAR_MAGIC = b"EQCOL1\0\0"
+_FLOAT64, _INT64, _DICT_UTF8 = 1, 2, 3
+
+
+def _align(pos: int) -> int:
+    return (pos + 7) & ~7
+
+
+def decode_columnar(raw: bytes) -> pd.DataFrame:
+    """
+    Build a DataFrame from a columnar payload without per-row parsing.
+
+    Numeric columns are read in place with ``np.frombuffer``; dictionary
+    encoded string columns are expanded with one vectorized take.
+
+    Args:
+        raw: Response body in the columnar format
+
+    Returns:
+        DataFrame with the same columns as ``iter_record_chunks`` produces
+    """
+    if raw[:8] != COLUMNAR_MAGIC:
+        raise ValueError("Not a columnar equity payload")
+
+    n_rows, n_columns = (int(v) for v in np.frombuffer(raw, dtype="<i4", count=2, offset=8))
+    pos = 16
+    columns = {}
+
+    for _ in range(n_columns):
+        name_len = int(np.frombuffer(raw, dtype="<i2", count=1, offset=pos)[0])
+        name = raw[pos + 2:pos + 2 + name_len].decode()
+        col_type = raw[pos + 2 + name_len]
+        pos = _align(pos + 3 + name_len)
+
+        if col_type == _FLOAT64 or col_type == _INT64:
+            dtype = "<f8" if col_type == _FLOAT64 else "<i8"
+            columns[name] = np.frombuffer(raw, dtype=dtype, count=n_rows, offset=pos)
+            pos = _align(pos + 8 * n_rows)
+        elif col_type == _DICT_UTF8:
+            n_dict = int(np.frombuffer(raw, dtype="<i4", count=1, offset=pos)[0])
+            pos += 4
+            dictionary = []
+            for _ in range(n_dict):
+                length = int(np.frombuffer(raw, dtype="<i4", count=1, offset=pos)[0])
+                dictionary.append(raw[pos + 4:pos + 4 + length].decode())
+                pos += 4 + length
+            pos = _align(pos)
+            codes = np.frombuffer(raw, dtype="<i4", count=n_rows, offset=pos)
+            pos = _align(pos + 4 * n_rows)
+            # Index n_dict holds None for null codes (-1)
+            values = np.array(dictionary + [None], dtype=object)
+            columns[name] = values[np.where(codes < 0, n_dict, codes)]
+        else:
+            raise ValueError(f"Unknown column type {col_type} for '{name}'")
+
+    return pd.DataFrame(columns)
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Dict]:
+    """
+    Yield the objects of a top-level JSON array as its bytes arrive.
+
+    Only the undecoded tail of the input is buffered, so memory stays at
+    one network chunk plus one record regardless of the array length.
+
+    Args:
+        chunks: Byte chunks of the response body
+
+    Returns:
+        Iterator over the decoded array elements
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    started = False
+
+    for chunk in chunks:
+        buffer += utf8.decode(chunk)
+        pos = 0
+        n = len(buffer)
+
+        while True:
+            while pos < n and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= n:
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                obj, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Incomplete element, wait for more bytes
+                break
+            yield obj
+            pos = end
+
+        buffer = buffer[pos:]
+
+    buffer += utf8.decode(b"", final=True)
+    if buffer.strip():
+        raise ValueError("Truncated JSON array")
+
+
+class ColumnChunk:
+    """Preallocated typed column buffers for up to ``capacity`` records."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.size = 0
+        self.columns = {
+            name: np.empty(capacity, dtype=dtype) for name, dtype in EQUITY_FIELDS.items()
+        }
+        self.columns.update(
+            {name: np.empty(capacity, dtype=np.float64) for name in NESTED_FIELDS}
+        )
+
+    @property
+    def full(self) -> bool:
+        return self.size >= self.capacity
+
+    def append(self, record: Dict) -> None:
+        i = self.size
+        for name, dtype in EQUITY_FIELDS.items():
+            value = record.get(name)
+            if dtype is object:
+                self.columns[name][i] = value
+            elif dtype is np.int64:
+                self.columns[name][i] = value if value is not None else 0
+            else:
+                self.columns[name][i] = value if value is not None else np.nan
+        for name, (parent, key) in NESTED_FIELDS.items():
+            value = (record.get(parent) or {}).get(key)
+            self.columns[name][i] = value if value is not None else np.nan
+        self.size += 1
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({name: col[:self.size] for name, col in self.columns.items()})
+
+
+def iter_record_chunks(chunks: Iterable[bytes], chunk_size: int = 50_000) -> Iterator[pd.DataFrame]:
+    """
+    Decode a JSON array of equity records into DataFrames of ``chunk_size`` rows.
+
+    Indicator maps are flattened into ``ma_*`` and ``macd*`` columns.
+    """
+    chunk = ColumnChunk(chunk_size)
+    for record in iter_json_array(chunks):
+        chunk.append(record)
+        if chunk.full:
+            yield chunk.to_frame()
+            chunk = ColumnChunk(chunk_size)
+    if chunk.size:
+        yield chunk.to_frame()
+
+
+def read_records(chunks: Iterable[bytes], chunk_size: int = 50_000) -> pd.DataFrame:
+    """Decode a whole JSON array of equity records into one DataFrame."""
+    frames: List[pd.DataFrame] = list(iter_record_chunks(chunks, chunk_size))
+    if not frames:
+        return pd.DataFrame(columns=list(EQUITY_FIELDS) + list(NESTED_FIELDS))
+    return pd.concat(frames, ignore_index=True)
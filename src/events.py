@@ -0,0 +1,175 @@
+"""Subscription to the new-bar events published by the Java ingest path."""
+
+import json
+import socket
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from .utils.logger import get_logger
+
+
+EVENTS_KEY = "events:equity"
+
+
+@dataclass
+class BarEvent:
+    """New bars stored for one symbol, up to and including ``timestamp``."""
+
+    symbol: str
+    timestamp: int
+    count: int = 1
+    id: Optional[str] = None
+
+    @classmethod
+    def from_fields(cls, fields: Dict, event_id: Optional[str] = None) -> "BarEvent":
+        fields = {_text(k): _text(v) for k, v in fields.items()}
+        return cls(
+            symbol=fields["symbol"],
+            timestamp=int(fields["timestamp"]),
+            count=int(fields.get("count", 1)),
+            id=event_id,
+        )
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+class BarSubscriber:
+    """
+    Receive new-bar events from Redis.
+
+    Reads the ``events:equity`` stream through a consumer group, so several
+    consumers share the work and events survive consumer restarts:
+    entries left pending by a previous run of the same consumer are
+    replayed first and every batch is acknowledged only after the handler
+    returns. The consumer name must therefore be stable across restarts
+    (the host name unless configured). Entries another consumer has left
+    pending for ``claim_idle_ms`` are claimed on startup, so renamed or
+    retired consumers do not orphan them. Servers without streams fall
+    back to the pub/sub channel of the same name, which delivers only
+    while subscribed.
+    """
+
+    def __init__(
+        self,
+        client,
+        group: str = "pipeline",
+        consumer: Optional[str] = None,
+        key: str = EVENTS_KEY,
+        batch_size: int = 100,
+        block_ms: int = 5000,
+        claim_idle_ms: Optional[int] = 60_000,
+    ):
+        self.client = client
+        self.group = group
+        self.consumer = consumer or socket.gethostname()
+        self.key = key
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.logger = get_logger("events")
+        self.use_streams = self._ensure_group()
+
+    def _ensure_group(self) -> bool:
+        import redis
+
+        try:
+            self.client.xgroup_create(self.key, self.group, id="$", mkstream=True)
+        except redis.exceptions.ResponseError as e:
+            if "BUSYGROUP" in str(e):
+                return True
+            self.logger.warning(f"Redis streams unavailable ({e}), using pub/sub")
+            return False
+        return True
+
+    def run(
+        self,
+        handler: Callable[[List[BarEvent]], None],
+        should_stop: Callable[[], bool] = lambda: False,
+    ) -> None:
+        """
+        Call ``handler`` with each batch of events until ``should_stop()``.
+
+        Args:
+            handler: Receives the events of one read, oldest first
+            should_stop: Checked between reads (at least every ``block_ms``)
+        """
+        if self.use_streams:
+            self._run_streams(handler, should_stop)
+        else:
+            self._run_pubsub(handler, should_stop)
+
+    def claim_idle(self) -> int:
+        """
+        Take over entries other consumers left pending for ``claim_idle_ms``.
+
+        Returns:
+            Number of entries claimed; they are replayed as our own pending
+            entries
+        """
+        import redis
+
+        if self.claim_idle_ms is None:
+            return 0
+
+        claimed = 0
+        start = "0-0"
+        try:
+            while True:
+                reply = self.client.xautoclaim(
+                    self.key,
+                    self.group,
+                    self.consumer,
+                    self.claim_idle_ms,
+                    start_id=start,
+                    count=self.batch_size,
+                )
+                start = _text(reply[0])
+                claimed += len(reply[1])
+                if start == "0-0":
+                    break
+        except redis.exceptions.ResponseError as e:
+            # XAUTOCLAIM needs Redis 6.2
+            self.logger.warning(f"Cannot claim idle events: {e}")
+        if claimed:
+            self.logger.info(f"Claimed {claimed} idle events for {self.consumer}")
+        return claimed
+
+    def _run_streams(self, handler, should_stop) -> None:
+        self.claim_idle()
+        # "0" replays our unacknowledged entries, ">" reads new ones
+        cursor = "0"
+        while not should_stop():
+            response = self.client.xreadgroup(
+                self.group,
+                self.consumer,
+                {self.key: cursor},
+                count=self.batch_size,
+                block=None if cursor == "0" else self.block_ms,
+            )
+            entries = response[0][1] if response else []
+            if not entries:
+                cursor = ">"
+                continue
+
+            ids = [_text(event_id) for event_id, _ in entries]
+            # Pending entries trimmed from the stream come back without fields
+            events = [
+                BarEvent.from_fields(fields, i) for i, (_, fields) in zip(ids, entries) if fields
+            ]
+            if events:
+                handler(events)
+            self.client.xack(self.key, self.group, *ids)
+
+    def _run_pubsub(self, handler, should_stop) -> None:
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.key)
+        try:
+            while not should_stop():
+                message = pubsub.get_message(timeout=self.block_ms / 1000)
+                if message is None:
+                    continue
+                handler([BarEvent.from_fields(json.loads(_text(message["data"])))])
+        finally:
+            pubsub.close()
@@ -0,0 +1,231 @@
+"""Versioned store for computed feature matrices."""
+
+import hashlib
+import io
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .features import FeatureEngine
+
+
+# Bump when the stored layout or the feature definitions change
+FEATURE_STORE_VERSION = 1
+
+
+def feature_set_hash(engine: FeatureEngine) -> str:
+    """Short hash of the feature definitions, used to version stored matrices."""
+    spec = {
+        "version": FEATURE_STORE_VERSION,
+        "features": engine.feature_names,
+        "lookback_periods": list(engine.lookback_periods),
+        "return_horizons": list(engine.return_horizons),
+        "sma_windows": list(engine.sma_windows),
+        "rsi_period": engine.rsi_period,
+        "macd_periods": list(engine.macd_periods),
+        "volatility_window": engine.volatility_window,
+    }
+    return hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:12]
+
+
+@dataclass
+class FeatureEntry:
+    """Feature matrix for one symbol: one row per bar, one column per feature."""
+
+    symbol: str
+    window: int
+    feature_set: str
+    timestamps: np.ndarray
+    values: np.ndarray
+    names: List[str]
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        return int(self.timestamps[-1]) if len(self.timestamps) else None
+
+    def to_bytes(self) -> bytes:
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            timestamps=self.timestamps.astype(np.int64),
+            values=self.values,
+            meta=np.frombuffer(
+                json.dumps(
+                    {
+                        "symbol": self.symbol,
+                        "window": self.window,
+                        "feature_set": self.feature_set,
+                        "names": self.names,
+                    }
+                ).encode(),
+                dtype=np.uint8,
+            ),
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "FeatureEntry":
+        with np.load(io.BytesIO(raw)) as npz:
+            meta = json.loads(npz["meta"].tobytes().decode())
+            return cls(
+                symbol=meta["symbol"],
+                window=meta["window"],
+                feature_set=meta["feature_set"],
+                timestamps=npz["timestamps"],
+                values=npz["values"],
+                names=meta["names"],
+            )
+
+    def to_frame(self) -> pd.DataFrame:
+        frame = pd.DataFrame(self.values, columns=self.names)
+        frame.insert(0, "symbol", self.symbol)
+        frame.insert(0, "timestamp", self.timestamps)
+        return frame
+
+
+class DiskBackend:
+    """Entries as ``.npz`` files under ``<cache_dir>/features/<hash>/<window>``."""
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        self.root = Path(cache_dir)
+
+    def _path(self, key: str) -> Path:
+        return self.root / (key.replace(":", "/") + ".npz")
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        out = []
+        for key in keys:
+            path = self._path(key)
+            out.append(path.read_bytes() if path.exists() else None)
+        return out
+
+    def put(self, key: str, raw: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(raw)
+        tmp.replace(path)
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+
+class RedisBackend:
+    """Entries as packed byte strings in Redis, expiring after ``ttl`` seconds."""
+
+    def __init__(self, client, ttl: Optional[int] = None):
+        self.client = client
+        self.ttl = ttl
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return list(self.client.mget(list(keys))) if keys else []
+
+    def put(self, key: str, raw: bytes) -> None:
+        if self.ttl:
+            self.client.setex(key, self.ttl, raw)
+        else:
+            self.client.set(key, raw)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(key)
+
+
+class FeatureStore:
+    """
+    Computed feature matrices keyed by (symbol, window, feature-set hash).
+
+    ``window`` is the number of most recent bars kept per symbol. An entry
+    is stale once a bar newer than its last timestamp exists; stale entries
+    are dropped on read and recomputed by ``get_or_compute``. Changing any
+    indicator parameter changes the hash, so old entries are never reused.
+    """
+
+    def __init__(self, backend, engine: Optional[FeatureEngine] = None):
+        self.backend = backend
+        self.engine = engine or FeatureEngine()
+        self.feature_set = feature_set_hash(self.engine)
+
+    def key(self, symbol: str, window: int) -> str:
+        return f"features:{self.feature_set}:{window}:{symbol}"
+
+    def put(self, entry: FeatureEntry) -> None:
+        self.backend.put(self.key(entry.symbol, entry.window), entry.to_bytes())
+
+    def invalidate(self, symbol: str, window: int) -> None:
+        self.backend.delete(self.key(symbol, window))
+
+    def get_many(
+        self,
+        symbols: Iterable[str],
+        window: int,
+        last_bars: Optional[Dict[str, int]] = None,
+    ) -> Dict[str, FeatureEntry]:
+        """
+        Batch read of stored entries.
+
+        Args:
+            symbols: Symbols to read
+            window: Window the entries were stored for
+            last_bars: Latest known bar timestamp per symbol; entries older
+                than it are invalidated and left out
+
+        Returns:
+            Dict of symbol to entry for every fresh entry found
+        """
+        symbols = list(symbols)
+        raws = self.backend.get_many([self.key(s, window) for s in symbols])
+        entries = {}
+        for symbol, raw in zip(symbols, raws):
+            if raw is None:
+                continue
+            entry = FeatureEntry.from_bytes(raw)
+            latest = (last_bars or {}).get(symbol)
+            if latest is not None and (entry.last_timestamp or -1) < latest:
+                self.invalidate(symbol, window)
+                continue
+            entries[symbol] = entry
+        return entries
+
+    def get(self, symbol: str, window: int, last_bar: Optional[int] = None) -> Optional[FeatureEntry]:
+        last_bars = {symbol: last_bar} if last_bar is not None else None
+        return self.get_many([symbol], window, last_bars).get(symbol)
+
+    def get_or_compute(self, data: pd.DataFrame, window: int) -> pd.DataFrame:
+        """
+        Features for the last ``window`` bars of every symbol in ``data``.
+
+        Fresh entries are read in one batch; the remaining symbols are
+        computed together from their full history in ``data`` and stored.
+
+        Args:
+            data: Long-format bars with ``symbol``, ``timestamp`` and ``close``
+            window: Number of most recent bars to keep per symbol
+
+        Returns:
+            Long DataFrame of features keyed by ``timestamp`` and ``symbol``
+        """
+        last_bars = {str(s): int(t) for s, t in data.groupby("symbol")["timestamp"].max().items()}
+        entries = self.get_many(last_bars.keys(), window, last_bars)
+
+        missing = [s for s in last_bars if s not in entries]
+        if missing:
+            computed = self.engine.compute(data[data["symbol"].astype(str).isin(missing)])
+            for symbol, frame in computed.groupby("symbol", sort=False, observed=True):
+                frame = frame.sort_values("timestamp").tail(window)
+                entry = FeatureEntry(
+                    symbol=str(symbol),
+                    window=window,
+                    feature_set=self.feature_set,
+                    timestamps=frame["timestamp"].to_numpy(dtype=np.int64),
+                    values=frame[self.engine.feature_names].to_numpy(dtype=np.float64),
+                    names=list(self.engine.feature_names),
+                )
+                self.put(entry)
+                entries[entry.symbol] = entry
+
+        frames = [entries[s].to_frame() for s in sorted(entries)]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
@@ -0,0 +1,291 @@
+"""Vectorized technical-indicator features over a symbol x time panel."""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .panel import alignment_order
+
+
+def rolling_sum(x: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Trailing window sums along the time axis via cumulative sums.
+
+    Args:
+        x: Array of shape (n_times, n_symbols), NaN where missing
+        window: Window length
+
+    Returns:
+        Tuple of (window sums, number of valid values in each window), both
+        aligned so row ``t`` covers rows ``t - window + 1 .. t``; the first
+        ``window - 1`` rows have a count of zero
+    """
+    valid = ~np.isnan(x)
+    zeros = np.zeros((1, x.shape[1]))
+    csum = np.vstack([zeros, np.cumsum(np.where(valid, x, 0.0), axis=0)])
+    ccount = np.vstack([zeros, np.cumsum(valid, axis=0)])
+
+    sums = np.zeros_like(x, dtype=np.float64)
+    counts = np.zeros_like(x, dtype=np.float64)
+    if window <= len(x):
+        sums[window - 1:] = csum[window:] - csum[:-window]
+        counts[window - 1:] = ccount[window:] - ccount[:-window]
+    return sums, counts
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean, NaN unless the whole window is present."""
+    sums, counts = rolling_sum(x, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts == window, sums / window, np.nan)
+
+
+def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """Trailing population standard deviation, NaN unless the window is full."""
+    sums, counts = rolling_sum(x, window)
+    squares, _ = rolling_sum(x * x, window)
+    mean = sums / window
+    var = np.maximum(squares / window - mean * mean, 0.0)
+    return np.where(counts == window, np.sqrt(var), np.nan)
+
+
+def smoothed(x: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    """
+    Exponential smoothing seeded with the simple mean of the first values.
+
+    The first ``period`` valid values of each column are averaged to seed
+    the state, after which ``s <- alpha * x + (1 - alpha) * s``; missing
+    values leave the state unchanged and produce NaN. The loop runs over
+    time and is vectorized over symbols. ``indicators.Smoothed`` applies
+    the same recurrence one bar at a time.
+
+    Args:
+        x: Array of shape (n_times, n_symbols)
+        period: Number of values used for the seed
+        alpha: Smoothing weight of each new value
+
+    Returns:
+        Smoothed array, NaN until a column has ``period`` values
+    """
+    n_times, n_symbols = x.shape
+    out = np.full((n_times, n_symbols), np.nan)
+    state = np.zeros(n_symbols)
+    seed = np.zeros(n_symbols)
+    count = np.zeros(n_symbols, dtype=np.int64)
+
+    for t in range(n_times):
+        value = x[t]
+        valid = ~np.isnan(value)
+        ready = count >= period
+        filled = np.where(valid, value, 0.0)
+
+        state = np.where(valid & ready, alpha * filled + (1 - alpha) * state, state)
+        seeding = valid & ~ready
+        seed += np.where(seeding, filled, 0.0)
+        count += valid
+        state = np.where(seeding & (count == period), seed / period, state)
+
+        out[t] = np.where(valid & (count >= period), state, np.nan)
+
+    return out
+
+
+def ema(x: np.ndarray, span: int) -> np.ndarray:
+    """Exponential moving average with ``alpha = 2 / (span + 1)``, SMA-seeded."""
+    return smoothed(x, span, 2.0 / (span + 1))
+
+
+def wilder_rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Wilder's RSI from closes.
+
+    Average gains and losses use Wilder smoothing (``alpha = 1 / period``)
+    seeded with the mean of the first ``period`` changes. RSI is 100 when
+    there are no losses in the average.
+    """
+    change = np.full_like(close, np.nan, dtype=np.float64)
+    change[1:] = close[1:] - close[:-1]
+    gain = np.where(np.isnan(change), np.nan, np.maximum(change, 0.0))
+    loss = np.where(np.isnan(change), np.nan, np.maximum(-change, 0.0))
+
+    avg_gain = smoothed(gain, period, 1.0 / period)
+    avg_loss = smoothed(loss, period, 1.0 / period)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return np.where(avg_loss == 0, 100.0, rsi)
+
+
+def macd(
+    close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD line, signal line and histogram.
+
+    Returns:
+        Tuple of (macd, signal, histogram) arrays
+    """
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def pct_change(x: np.ndarray, periods: int) -> np.ndarray:
+    """Simple return over ``periods`` rows."""
+    out = np.full_like(x, np.nan, dtype=np.float64)
+    if periods < len(x):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[periods:] = x[periods:] / x[:-periods] - 1.0
+    return out
+
+
+@dataclass
+class FeatureEngine:
+    """
+    Technical-indicator features for a whole panel at once.
+
+    Covers the features listed in the report: returns over
+    ``return_horizons``, volume change, Wilder RSI, SMAs over the union of
+    ``training.lookback_periods`` and ``sma_windows``, MACD and rolling
+    volatility of daily returns. Every kernel works on (time x symbol)
+    arrays; nothing loops over symbols. Windows and horizons count each
+    symbol's own bars, so symbols on different calendars can share a
+    panel.
+    """
+
+    lookback_periods: Sequence[int] = (5, 10, 20)
+    return_horizons: Sequence[int] = (1, 5, 20)
+    sma_windows: Sequence[int] = (20, 50)
+    rsi_period: int = 14
+    macd_periods: Tuple[int, int, int] = (12, 26, 9)
+    volatility_window: int = 20
+    feature_names: List[str] = field(init=False)
+
+    def __post_init__(self):
+        self.macd_periods = tuple(self.macd_periods)
+        self.feature_names = (
+            [f"return_{h}d" for h in self.return_horizons]
+            + ["volume_change", "rsi"]
+            + [f"sma_{w}" for w in self.windows]
+            + ["macd", "macd_signal", "macd_histogram"]
+            + [f"volatility_{self.volatility_window}d"]
+        )
+
+    @property
+    def windows(self) -> List[int]:
+        return sorted(set(self.lookback_periods) | set(self.sma_windows))
+
+    @classmethod
+    def from_config(cls, config) -> "FeatureEngine":
+        """Build from the ``training`` section of a ``Config``."""
+        indicators = config.get("training.indicators", {}) or {}
+        return cls(
+            lookback_periods=config.get("training.lookback_periods", [5, 10, 20]),
+            return_horizons=indicators.get("return_horizons", [1, 5, 20]),
+            sma_windows=indicators.get("sma_windows", [20, 50]),
+            rsi_period=indicators.get("rsi_period", 14),
+            macd_periods=indicators.get("macd", [12, 26, 9]),
+            volatility_window=indicators.get("volatility_window", 20),
+        )
+
+    def compute_panel(
+        self, close: np.ndarray, volume: Optional[np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute every feature for a (time x symbol) panel.
+
+        Rows where a symbol has no close are skipped for that symbol:
+        each column is right-aligned onto its own bars, the features are
+        computed there and scattered back, so a 5-bar return is always
+        five of the symbol's bars whatever other symbols trade in between.
+
+        Args:
+            close: Closes of shape (n_times, n_symbols), NaN where missing
+            volume: Volumes of the same shape, optional
+
+        Returns:
+            Dict mapping feature name to an array shaped like ``close``,
+            NaN where ``close`` is missing
+        """
+        close = np.asarray(close, dtype=np.float64)
+        valid = ~np.isnan(close)
+        order = alignment_order(close)
+        close = np.take_along_axis(close, order, axis=0)
+        if volume is not None:
+            volume = np.where(valid, np.asarray(volume, dtype=np.float64), np.nan)
+            volume = np.take_along_axis(volume, order, axis=0)
+
+        features = self._compute_aligned(close, volume)
+        for name, aligned in features.items():
+            restored = np.empty_like(aligned)
+            np.put_along_axis(restored, order, aligned, axis=0)
+            features[name] = np.where(valid, restored, np.nan)
+        return features
+
+    def _compute_aligned(
+        self, close: np.ndarray, volume: Optional[np.ndarray]
+    ) -> Dict[str, np.ndarray]:
+        """Features of right-aligned columns (no gaps inside a column)."""
+        features: Dict[str, np.ndarray] = {}
+
+        for h in self.return_horizons:
+            features[f"return_{h}d"] = pct_change(close, h)
+
+        if volume is None:
+            features["volume_change"] = np.full_like(close, np.nan)
+        else:
+            features["volume_change"] = pct_change(np.asarray(volume, dtype=np.float64), 1)
+
+        features["rsi"] = wilder_rsi(close, self.rsi_period)
+
+        for w in self.windows:
+            features[f"sma_{w}"] = rolling_mean(close, w)
+
+        fast, slow, signal = self.macd_periods
+        line, signal_line, histogram = macd(close, fast, slow, signal)
+        features["macd"] = line
+        features["macd_signal"] = signal_line
+        features["macd_histogram"] = histogram
+
+        features[f"volatility_{self.volatility_window}d"] = rolling_std(
+            pct_change(close, 1), self.volatility_window
+        )
+
+        return features
+
+    def compute(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute features from long-format bars.
+
+        Args:
+            data: DataFrame with ``symbol``, ``timestamp``, ``close`` and
+                optionally ``volume`` columns
+
+        Returns:
+            Long DataFrame with ``timestamp``, ``symbol`` and one column per
+            feature, for every (timestamp, symbol) bar present in ``data``
+        """
+        close = data.pivot_table(index="timestamp", columns="symbol", values="close").sort_index()
+        volume = None
+        if "volume" in data.columns:
+            volume = (
+                data.pivot_table(index="timestamp", columns="symbol", values="volume")
+                .reindex(index=close.index, columns=close.columns)
+                .to_numpy(dtype=np.float64)
+            )
+
+        close_values = close.to_numpy(dtype=np.float64)
+        features = self.compute_panel(close_values, volume)
+
+        present = ~np.isnan(close_values).ravel()
+        frame = pd.DataFrame(
+            {
+                "timestamp": np.repeat(close.index.to_numpy(), close.shape[1])[present],
+                "symbol": np.tile(close.columns.to_numpy(), close.shape[0])[present],
+            }
+        )
+        for name in self.feature_names:
+            frame[name] = features[name].ravel()[present]
+
+        return frame
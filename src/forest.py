@@ -0,0 +1,171 @@
+"""NumPy inference for random forests exported by the Rust model."""
+
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+
+FLAT_FOREST_FILE = "random_forest.rff"
+FLAT_FOREST_MAGIC = b"RFFLAT1\0"
+
+
+class FlatForest:
+    """
+    Random forest stored as flat node arrays (``RandomForest::export_flat``).
+
+    Node ``i`` splits on ``feature[i]`` at ``threshold[i]`` and continues at
+    ``left[i]`` when the value is ``<=`` the threshold, else at ``right[i]``.
+    Leaves have ``feature == -1`` and point at themselves, so prediction
+    advances every (row, tree) pair one level at a time until all of them
+    sit on a leaf, then averages the leaf values over trees.
+    """
+
+    def __init__(
+        self,
+        offsets: np.ndarray,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        value: np.ndarray,
+        n_features: int,
+        max_depth: int,
+    ):
+        self.roots = offsets[:-1].astype(np.int64)
+        self.feature = feature.astype(np.int64)
+        self.threshold = threshold
+        self.left = left.astype(np.int64)
+        self.right = right.astype(np.int64)
+        self.value = value
+        self.n_features = n_features
+        self.max_depth = max_depth
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "FlatForest":
+        """
+        Read a forest file written by the Rust model.
+
+        Args:
+            path: Path to the ``.rff`` file
+
+        Returns:
+            Loaded forest
+        """
+        raw = Path(path).read_bytes()
+        if raw[:8] != FLAT_FOREST_MAGIC:
+            raise ValueError(f"{path} is not a flattened forest file")
+
+        n_trees, n_features, n_nodes, max_depth = (
+            int(v) for v in np.frombuffer(raw, dtype="<u8", count=4, offset=8)
+        )
+        offset = 40
+
+        def take(dtype: str, count: int) -> np.ndarray:
+            nonlocal offset
+            array = np.frombuffer(raw, dtype=dtype, count=count, offset=offset)
+            offset += array.nbytes
+            return array
+
+        offsets = take("<u8", n_trees + 1)
+        threshold = take("<f8", n_nodes)
+        value = take("<f8", n_nodes)
+        feature = take("<i4", n_nodes)
+        left = take("<i4", n_nodes)
+        right = take("<i4", n_nodes)
+
+        return cls(offsets, feature, threshold, left, right, value, n_features, max_depth)
+
+    def predict(self, features: np.ndarray, block_rows: int = 4096) -> np.ndarray:
+        """
+        Predict every row of a feature matrix.
+
+        Args:
+            features: Array of shape (n_rows, n_features)
+            block_rows: Rows processed together, bounding the
+                (rows x trees) index arrays held in memory
+
+        Returns:
+            Array of n_rows predictions
+        """
+        features = np.atleast_2d(np.asarray(features, dtype=np.float64))
+        if features.shape[1] < self.n_features:
+            raise ValueError(
+                f"Forest uses {self.n_features} features, got {features.shape[1]}"
+            )
+
+        out = np.empty(len(features))
+        if self.n_trees == 0:
+            out.fill(0.0)
+            return out
+
+        for start in range(0, len(features), block_rows):
+            block = features[start:start + block_rows]
+            rows = np.arange(len(block))[:, None]
+            nodes = np.broadcast_to(self.roots, (len(block), self.n_trees)).copy()
+
+            for _ in range(self.max_depth):
+                feature = self.feature[nodes]
+                if (feature < 0).all():
+                    break
+                values = block[rows, np.maximum(feature, 0)]
+                nodes = np.where(
+                    values <= self.threshold[nodes], self.left[nodes], self.right[nodes]
+                )
+
+            out[start:start + len(block)] = self.value[nodes].mean(axis=1)
+
+        return out
+
+
+def bar_features(bars: pd.DataFrame) -> np.ndarray:
+    """
+    Model feature rows for flat bars, mirroring ``EquityData::to_training_sample``.
+
+    Missing moving averages and MACD values count as 0 and a missing RSI
+    as 50, as in the Rust model.
+
+    Args:
+        bars: Frame with price columns and flattened indicators
+            (``ma_*``, ``rsi``, ``macd*``), e.g. from ``panel.flatten_indicators``
+
+    Returns:
+        Array of shape (len(bars), 15)
+    """
+    def column(name: str, default: float) -> np.ndarray:
+        if name not in bars.columns:
+            return np.full(len(bars), default)
+        values = pd.to_numeric(bars[name], errors="coerce").to_numpy(dtype=np.float64)
+        return np.where(np.isnan(values), default, values)
+
+    close = column("close", np.nan)
+    high = column("high", np.nan)
+    low = column("low", np.nan)
+    ma_5 = column("ma_5", 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ma_5_gap = np.where(ma_5 != 0, (close - ma_5) / ma_5, 0.0)
+        range_pct = (high - low) / close
+        high_low = high / low - 1.0
+
+    return np.column_stack([
+        close,
+        column("volume", np.nan),
+        range_pct,
+        close - column("open", np.nan),
+        ma_5,
+        column("ma_10", 0.0),
+        column("ma_20", 0.0),
+        column("ma_50", 0.0),
+        ma_5_gap,
+        column("rsi", 50.0),
+        column("macd", 0.0),
+        column("macd_signal", 0.0),
+        column("macd_histogram", 0.0),
+        np.zeros(len(bars)),  # calculate_volatility is a stub returning 0
+        high_low,
+    ])
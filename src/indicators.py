@@ -0,0 +1,362 @@
+"""Incremental indicator state, updated in constant time per bar."""
+
+import json
+import math
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .features import FeatureEngine
+
+
+def _is_missing(value: Optional[float]) -> bool:
+    return value is None or math.isnan(value)
+
+
+def _change(current: float, previous: float) -> float:
+    """Simple return, NaN when either side is missing or the base is zero."""
+    if math.isnan(current) or math.isnan(previous) or previous == 0:
+        return math.nan
+    return current / previous - 1.0
+
+
+class Smoothed:
+    """
+    Exponential smoothing seeded with the mean of the first ``period`` values.
+
+    Same recurrence as ``features.smoothed``: missing values leave the state
+    unchanged and return None.
+    """
+
+    def __init__(self, period: int, alpha: float):
+        self.period = period
+        self.alpha = alpha
+        self.state = 0.0
+        self.seed = 0.0
+        self.count = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.period
+
+    def update(self, value: Optional[float]) -> Optional[float]:
+        if _is_missing(value):
+            return None
+
+        if self.ready:
+            self.state = self.alpha * value + (1 - self.alpha) * self.state
+        else:
+            self.seed += value
+            self.count += 1
+            if self.count == self.period:
+                self.state = self.seed / self.period
+
+        return self.state if self.ready else None
+
+    def to_dict(self) -> Dict:
+        return {"period": self.period, "alpha": self.alpha, "state": self.state,
+                "seed": self.seed, "count": self.count}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Smoothed":
+        # Subclasses such as EMA take different constructor arguments
+        obj = cls.__new__(cls)
+        Smoothed.__init__(obj, data["period"], data["alpha"])
+        obj.state, obj.seed, obj.count = data["state"], data["seed"], data["count"]
+        return obj
+
+
+class EMA(Smoothed):
+    """Exponential moving average with ``alpha = 2 / (span + 1)``, SMA-seeded."""
+
+    def __init__(self, span: int):
+        super().__init__(span, 2.0 / (span + 1))
+
+
+class WilderRSI:
+    """Wilder's RSI over closes."""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close = math.nan
+        self.gain = Smoothed(period, 1.0 / period)
+        self.loss = Smoothed(period, 1.0 / period)
+
+    def update(self, close: Optional[float]) -> Optional[float]:
+        close = math.nan if close is None else close
+        change = close - self.prev_close
+        self.prev_close = close
+
+        avg_gain = self.gain.update(None if math.isnan(change) else max(change, 0.0))
+        avg_loss = self.loss.update(None if math.isnan(change) else max(-change, 0.0))
+        if avg_gain is None or avg_loss is None:
+            return None
+        if avg_loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    def to_dict(self) -> Dict:
+        return {"period": self.period, "prev_close": self.prev_close,
+                "gain": self.gain.to_dict(), "loss": self.loss.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "WilderRSI":
+        obj = cls(data["period"])
+        obj.prev_close = data["prev_close"]
+        obj.gain = Smoothed.from_dict(data["gain"])
+        obj.loss = Smoothed.from_dict(data["loss"])
+        return obj
+
+
+class MACD:
+    """MACD line, EMA signal line and histogram."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+
+    def update(
+        self, close: Optional[float]
+    ) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        """
+        Returns:
+            Tuple of (macd, signal, histogram), None where not yet defined
+        """
+        fast = self.fast.update(close)
+        slow = self.slow.update(close)
+        line = None if fast is None or slow is None else fast - slow
+        signal = self.signal.update(line)
+        if line is None or signal is None:
+            return line, None, None
+        return line, signal, line - signal
+
+    def to_dict(self) -> Dict:
+        return {"fast": self.fast.to_dict(), "slow": self.slow.to_dict(),
+                "signal": self.signal.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "MACD":
+        obj = cls.__new__(cls)
+        obj.fast = EMA.from_dict(data["fast"])
+        obj.slow = EMA.from_dict(data["slow"])
+        obj.signal = EMA.from_dict(data["signal"])
+        return obj
+
+
+class RollingStats:
+    """
+    Rolling mean and population variance over a ring buffer.
+
+    Running sums are updated in O(1) per value and recomputed from the
+    buffer once per full turn, which bounds floating-point drift. Like
+    ``features.rolling_mean``, results are None unless every value in the
+    window is present.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.buffer = np.full(window, np.nan)
+        self.pos = 0
+        self.seen = 0
+        self._reset_sums()
+
+    def _reset_sums(self) -> None:
+        valid = self.buffer[~np.isnan(self.buffer)]
+        self.sum = float(valid.sum())
+        self.sumsq = float((valid * valid).sum())
+        self.n_valid = len(valid)
+
+    def update(self, value: Optional[float]) -> None:
+        value = math.nan if value is None else value
+        old = float(self.buffer[self.pos])
+        if not math.isnan(old):
+            self.sum -= old
+            self.sumsq -= old * old
+            self.n_valid -= 1
+        if not math.isnan(value):
+            self.sum += value
+            self.sumsq += value * value
+            self.n_valid += 1
+
+        self.buffer[self.pos] = value
+        self.pos = (self.pos + 1) % self.window
+        self.seen += 1
+        if self.pos == 0:
+            self._reset_sums()
+
+    @property
+    def full(self) -> bool:
+        return self.seen >= self.window and self.n_valid == self.window
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.window if self.full else None
+
+    @property
+    def std(self) -> Optional[float]:
+        if not self.full:
+            return None
+        mean = self.sum / self.window
+        return math.sqrt(max(self.sumsq / self.window - mean * mean, 0.0))
+
+    def to_dict(self) -> Dict:
+        return {"window": self.window, "buffer": self.buffer.tolist(),
+                "pos": self.pos, "seen": self.seen, "sum": self.sum,
+                "sumsq": self.sumsq, "n_valid": self.n_valid}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RollingStats":
+        obj = cls(data["window"])
+        obj.buffer = np.array(data["buffer"], dtype=np.float64)
+        obj.pos, obj.seen = data["pos"], data["seen"]
+        # Restore the running sums as saved so a restored state continues
+        # exactly as the original would have
+        obj.sum, obj.sumsq, obj.n_valid = data["sum"], data["sumsq"], data["n_valid"]
+        return obj
+
+
+class IndicatorState:
+    """
+    Per-symbol state producing the ``FeatureEngine`` features bar by bar.
+
+    ``update`` costs O(1) per bar regardless of history length. Running
+    ``backfill`` over history and then ``update`` on live bars yields the
+    same values as calling ``update`` on every bar, so backfill and live
+    modes agree exactly. Fed one symbol's own bars, it agrees with
+    ``FeatureEngine.compute_panel`` up to rounding in the rolling-window
+    sums; ``compute_panel`` skips rows where the symbol has no bar, while
+    a None close here still advances every window by one step.
+    """
+
+    def __init__(self, engine: Optional[FeatureEngine] = None):
+        engine = engine or FeatureEngine()
+        self.engine = engine
+        self.return_horizons = list(engine.return_horizons)
+        self.closes = deque(maxlen=max(self.return_horizons) + 1)
+        self.prev_volume = math.nan
+        self.rsi = WilderRSI(engine.rsi_period)
+        self.macd = MACD(*engine.macd_periods)
+        self.sma = {w: RollingStats(w) for w in engine.windows}
+        self.volatility = RollingStats(engine.volatility_window)
+        self.last_timestamp: Optional[int] = None
+
+    def update(
+        self,
+        close: Optional[float],
+        volume: Optional[float] = None,
+        timestamp: Optional[int] = None,
+    ) -> Dict[str, float]:
+        """
+        Advance the state by one bar.
+
+        Args:
+            close: Close of the bar (None or NaN for a missing bar)
+            volume: Volume of the bar
+            timestamp: Bar timestamp, kept for checkpoint bookkeeping
+
+        Returns:
+            Dict of feature name to value (NaN where not yet defined)
+        """
+        close = math.nan if close is None else float(close)
+        volume = math.nan if volume is None else float(volume)
+        self.closes.append(close)
+        if timestamp is not None:
+            self.last_timestamp = int(timestamp)
+
+        features: Dict[str, float] = {}
+        for h in self.return_horizons:
+            past = self.closes[-1 - h] if len(self.closes) > h else math.nan
+            features[f"return_{h}d"] = _change(close, past)
+
+        features["volume_change"] = _change(volume, self.prev_volume)
+        self.prev_volume = volume
+
+        rsi = self.rsi.update(close)
+        features["rsi"] = math.nan if rsi is None else rsi
+
+        for w, stats in self.sma.items():
+            stats.update(close)
+            features[f"sma_{w}"] = math.nan if stats.mean is None else stats.mean
+
+        line, signal, histogram = self.macd.update(close)
+        features["macd"] = math.nan if line is None else line
+        features["macd_signal"] = math.nan if signal is None else signal
+        features["macd_histogram"] = math.nan if histogram is None else histogram
+
+        prev = self.closes[-2] if len(self.closes) > 1 else math.nan
+        self.volatility.update(_change(close, prev))
+        std = self.volatility.std
+        features[f"volatility_{self.volatility.window}d"] = math.nan if std is None else std
+
+        return features
+
+    def backfill(
+        self,
+        closes: Sequence[float],
+        volumes: Optional[Sequence[float]] = None,
+        timestamps: Optional[Sequence[int]] = None,
+    ) -> List[Dict[str, float]]:
+        """Replay historical bars through ``update``."""
+        n = len(closes)
+        volumes = volumes if volumes is not None else [None] * n
+        timestamps = timestamps if timestamps is not None else [None] * n
+        return [self.update(c, v, t) for c, v, t in zip(closes, volumes, timestamps)]
+
+    @staticmethod
+    def _engine_dict(engine: FeatureEngine) -> Dict:
+        return {
+            "lookback_periods": list(engine.lookback_periods),
+            "return_horizons": list(engine.return_horizons),
+            "sma_windows": list(engine.sma_windows),
+            "rsi_period": engine.rsi_period,
+            "macd_periods": list(engine.macd_periods),
+            "volatility_window": engine.volatility_window,
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "engine": self._engine_dict(self.engine),
+            "closes": list(self.closes),
+            "prev_volume": self.prev_volume,
+            "rsi": self.rsi.to_dict(),
+            "macd": self.macd.to_dict(),
+            "sma": {str(w): s.to_dict() for w, s in self.sma.items()},
+            "volatility": self.volatility.to_dict(),
+            "last_timestamp": self.last_timestamp,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "IndicatorState":
+        obj = cls(FeatureEngine(**data["engine"]))
+        obj.closes.extend(data["closes"])
+        obj.prev_volume = data["prev_volume"]
+        obj.rsi = WilderRSI.from_dict(data["rsi"])
+        obj.macd = MACD.from_dict(data["macd"])
+        obj.sma = {int(w): RollingStats.from_dict(s) for w, s in data["sma"].items()}
+        obj.volatility = RollingStats.from_dict(data["volatility"])
+        obj.last_timestamp = data["last_timestamp"]
+        return obj
+
+    def save(self, redis_client, symbol: str) -> None:
+        """Checkpoint the state to Redis under ``indicators:{symbol}``."""
+        redis_client.set(f"indicators:{symbol}", json.dumps(self.to_dict()))
+
+    @classmethod
+    def load(
+        cls, redis_client, symbol: str, engine: Optional[FeatureEngine] = None
+    ) -> Optional["IndicatorState"]:
+        """
+        Restore a checkpoint written by ``save``.
+
+        Returns None if there is none, or if ``engine`` is given and the
+        checkpoint was saved with different feature parameters.
+        """
+        raw = redis_client.get(f"indicators:{symbol}")
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        if engine is not None and data["engine"] != cls._engine_dict(engine):
+            return None
+        return cls.from_dict(data)
@@ -0,0 +1,181 @@
+"""Multi-horizon price and volume metrics computed in one vectorized pass."""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+HORIZONS = (14, 50, 100, 240)
+TRADING_DAYS = 252
+
+
+def records_panel(
+    data: Dict[str, List[Dict]]
+) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Right-align per-symbol bar records into (time x symbol) arrays.
+
+    Row ``-1`` holds every symbol's latest bar; symbols with shorter
+    histories are NaN-padded at the top, so a horizon always means each
+    symbol's own last bars.
+
+    Args:
+        data: Symbol -> records with ``close`` and ``volume``, oldest first
+
+    Returns:
+        Tuple of (symbols, close, volume)
+    """
+    symbols = [s for s, records in data.items() if records]
+    n_rows = max((len(data[s]) for s in symbols), default=0)
+    close = np.full((n_rows, len(symbols)), np.nan)
+    volume = np.full((n_rows, len(symbols)), np.nan)
+
+    for j, symbol in enumerate(symbols):
+        records = data[symbol]
+        start = n_rows - len(records)
+        close[start:, j] = [r["close"] for r in records]
+        volume[start:, j] = [r.get("volume", np.nan) for r in records]
+
+    return symbols, close, volume
+
+
+def _window_sums(cumsum: np.ndarray, start: np.ndarray) -> np.ndarray:
+    """Per-column sums from row ``start[j]`` to the end, given a leading-zero cumsum."""
+    return cumsum[-1] - cumsum[start, np.arange(cumsum.shape[1])]
+
+
+def horizon_metrics(
+    close: np.ndarray,
+    volume: np.ndarray,
+    horizons: Sequence[int] = HORIZONS,
+) -> Dict[int, Dict[str, np.ndarray]]:
+    """
+    Change, average volume, realized volatility and drawdown per horizon.
+
+    Sums over every trailing window come from one set of cumulative
+    arrays, so each extra horizon costs O(n_symbols); only the drawdown
+    scans its window. A horizon of ``h`` covers the last ``h`` daily
+    returns (``h + 1`` closes), or the whole history when it is shorter.
+
+    Args:
+        close: (time x symbol) closes, NaN before a symbol's first bar
+        volume: (time x symbol) volumes aligned with ``close``
+        horizons: Window lengths in bars
+
+    Returns:
+        Horizon -> {"change", "avg_volume", "volatility", "max_drawdown",
+        "bars"}; changes and drawdowns are fractions, volatility is
+        annualized with 252 trading days
+    """
+    n_rows, n_cols = close.shape
+    cols = np.arange(n_cols)
+    valid = ~np.isnan(close)
+    first = np.where(valid.any(axis=0), valid.argmax(axis=0), n_rows)
+    last_close = close[-1] if n_rows else np.full(n_cols, np.nan)
+
+    vol_valid = ~np.isnan(volume)
+    vol_sum = np.vstack([np.zeros(n_cols), np.cumsum(np.where(vol_valid, volume, 0.0), axis=0)])
+    vol_count = np.vstack([np.zeros(n_cols), np.cumsum(vol_valid, axis=0)])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_returns = np.diff(np.log(close), axis=0)
+    ret_valid = np.isfinite(log_returns)
+    ret = np.where(ret_valid, log_returns, 0.0)
+    # Row i of these holds the sums over returns [0, i)
+    ret_sum = np.vstack([np.zeros(n_cols), np.cumsum(ret, axis=0)])
+    ret_sq = np.vstack([np.zeros(n_cols), np.cumsum(ret ** 2, axis=0)])
+    ret_count = np.vstack([np.zeros(n_cols), np.cumsum(ret_valid, axis=0)])
+
+    out = {}
+    for h in horizons:
+        start = np.minimum(np.maximum(n_rows - 1 - h, first), max(n_rows - 1, 0))
+        start_close = close[start, cols] if n_rows else np.full(n_cols, np.nan)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            change = last_close / start_close - 1
+
+            n_vol = _window_sums(vol_count, start)
+            avg_volume = _window_sums(vol_sum, start) / n_vol
+
+            # Returns start..n_rows-2 are the ones inside the window
+            n = _window_sums(ret_count, start)
+            s1 = _window_sums(ret_sum, start)
+            s2 = _window_sums(ret_sq, start)
+            variance = np.maximum(s2 - s1 * s1 / n, 0.0) / (n - 1)
+            volatility = np.where(n > 1, np.sqrt(variance * TRADING_DAYS), np.nan)
+
+        lo = int(start.min()) if n_cols else 0
+        window = close[lo:]
+        # Rows before a symbol's own window start do not count
+        window = np.where(np.arange(lo, n_rows)[:, None] >= start, window, np.nan)
+        peak = np.fmax.accumulate(window, axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = np.nanmin(window / peak - 1, axis=0) if len(window) else np.full(n_cols, np.nan)
+
+        out[h] = {
+            "change": change,
+            "avg_volume": avg_volume,
+            "volatility": volatility,
+            "max_drawdown": drawdown,
+            "bars": (n_rows - start).astype(np.int64),
+        }
+
+    return out
+
+
+def _finite(value: float, digits: int):
+    return round(float(value), digits) if np.isfinite(value) else None
+
+
+def summarize(data: Dict[str, List[Dict]], horizons: Sequence[int] = HORIZONS) -> Dict:
+    """
+    JSON-ready summary of downloaded records for every horizon at once.
+
+    Keeps the keys the download scripts always wrote (``current_prices``,
+    ``changes_{h}d`` in percent, ``avg_volumes`` over the full download,
+    ``symbols``, ``total_records``) and adds ``metrics``:
+    symbol -> ``"{h}d"`` -> change/volatility/max_drawdown (percent),
+    avg_volume and bars.
+
+    Args:
+        data: Symbol -> records, oldest first
+        horizons: Window lengths in bars
+
+    Returns:
+        Summary dict
+    """
+    symbols, close, volume = records_panel(data)
+    full = horizon_metrics(close, volume, [close.shape[0]])[close.shape[0]] if symbols else {}
+    by_horizon = horizon_metrics(close, volume, horizons)
+
+    summary = {
+        "current_prices": {s: _finite(close[-1, j], 4) for j, s in enumerate(symbols)},
+        "avg_volumes": {
+            s: int(full["avg_volume"][j]) if np.isfinite(full["avg_volume"][j]) else 0
+            for j, s in enumerate(symbols)
+        },
+        "symbols": symbols,
+        "total_records": sum(len(records) for records in data.values()),
+        "horizons": list(horizons),
+    }
+
+    for h in horizons:
+        summary[f"changes_{h}d"] = {
+            s: _finite(by_horizon[h]["change"][j] * 100, 2) or 0.0
+            for j, s in enumerate(symbols)
+        }
+
+    summary["metrics"] = {
+        s: {
+            f"{h}d": {
+                "change": _finite(m["change"][j] * 100, 2),
+                "avg_volume": _finite(m["avg_volume"][j], 0),
+                "volatility": _finite(m["volatility"][j] * 100, 2),
+                "max_drawdown": _finite(m["max_drawdown"][j] * 100, 2),
+                "bars": int(m["bars"][j]),
+            }
+            for h, m in by_horizon.items()
+        }
+        for j, s in enumerate(symbols)
+    }
+    return summary
@@ -0,0 +1,138 @@
+"""Compact, typed panel representation of equity records."""
+
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .equity_stream import NESTED_FIELDS
+
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "adjusted_close")
+INDICATOR_COLUMNS = ("rsi",) + tuple(NESTED_FIELDS)
+
+
+def flatten_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Expand ``moving_averages``/``macd`` dict columns into float columns.
+
+    Frames that are already flat (streamed or columnar payloads) are
+    returned unchanged.
+    """
+    nested = [
+        parent
+        for parent in ("moving_averages", "macd")
+        if parent in df.columns and df[parent].map(lambda m: isinstance(m, dict)).any()
+    ]
+    if not nested:
+        return df
+
+    flat = {}
+    for name, (parent, key) in NESTED_FIELDS.items():
+        if parent in nested:
+            flat[name] = np.array(
+                [m.get(key, np.nan) if isinstance(m, dict) else np.nan for m in df[parent]],
+                dtype=np.float64,
+            )
+
+    # "macd" names both the map and its flattened line, so drop before assigning
+    return df.drop(columns=nested).assign(**flat)
+
+
+def normalize(
+    df: pd.DataFrame, price_dtype: Union[str, np.dtype] = np.float32
+) -> pd.DataFrame:
+    """
+    Convert a long frame of equity records into a compact typed panel.
+
+    ``symbol`` and ``date`` become categoricals, the frame is indexed by an
+    int64 ``timestamp`` and sorted by (timestamp, symbol), prices and
+    indicators are cast to ``price_dtype``, volume to float64, and nested
+    indicator maps are flattened into typed columns.
+
+    Args:
+        df: Records as returned by ``get_all_data``/``get_data_from_java``
+        price_dtype: Dtype for price and indicator columns (volume stays
+            float64)
+
+    Returns:
+        Normalized long DataFrame
+    """
+    if df.empty:
+        return df
+
+    df = flatten_indicators(df)
+    dtype = np.dtype(price_dtype)
+
+    columns = {}
+    columns["symbol"] = df["symbol"].astype("category")
+    if "date" in df.columns:
+        columns["date"] = df["date"].astype("category")
+    for name in PRICE_COLUMNS + INDICATOR_COLUMNS:
+        if name in df.columns:
+            columns[name] = pd.to_numeric(df[name], errors="coerce").astype(dtype)
+    if "volume" in df.columns:
+        # Volumes exceed float32's exact integer range, keep them in float64
+        columns["volume"] = pd.to_numeric(df["volume"], errors="coerce").astype(np.float64)
+
+    panel = pd.DataFrame(columns)
+    panel.index = pd.Index(df["timestamp"].to_numpy(dtype=np.int64), name="timestamp")
+    return panel.sort_values(["timestamp", "symbol"], kind="stable")
+
+
+def wide(panel: pd.DataFrame, field: str = "close") -> pd.DataFrame:
+    """
+    Time x symbol view of one field of a normalized panel.
+
+    Args:
+        panel: Output of ``normalize``
+        field: Column to spread across symbols
+
+    Returns:
+        DataFrame indexed by timestamp with one column per symbol
+    """
+    values = panel[field]
+    symbols = panel["symbol"]
+    codes = symbols.cat.codes.to_numpy()
+    times, time_index = np.unique(panel.index.to_numpy(), return_inverse=True)
+
+    out = np.full((len(times), len(symbols.cat.categories)), np.nan, dtype=values.dtype)
+    out[time_index, codes] = values.to_numpy()
+    return pd.DataFrame(
+        out,
+        index=pd.Index(times, name="timestamp"),
+        columns=pd.Index(symbols.cat.categories, name="symbol"),
+    )
+
+
+def wide_views(
+    panel: pd.DataFrame, fields: Optional[Iterable[str]] = None
+) -> Dict[str, pd.DataFrame]:
+    """Wide views for several fields, all sharing the same time and symbol axes."""
+    fields = fields or [c for c in PRICE_COLUMNS + ("volume",) if c in panel.columns]
+    return {field: wide(panel, field) for field in fields}
+
+
+def alignment_order(close: np.ndarray) -> np.ndarray:
+    """
+    Row order moving each column's valid values to the bottom.
+
+    Wide views have one row per timestamp seen by any symbol, so symbols on
+    different calendars (a 24/7 crypto pair next to stocks) leave NaN gaps.
+    Taking rows in this order gives every column its own bars, oldest
+    first, with the NaNs on top; ``np.put_along_axis`` with the same order
+    scatters results back onto the shared timestamps.
+    """
+    return np.argsort(~np.isnan(close), axis=0, kind="stable")
+
+
+def right_align(close: np.ndarray, *others: np.ndarray) -> List[np.ndarray]:
+    """
+    Move every column's valid closes to the bottom, keeping their order.
+
+    After alignment row ``-1`` is each symbol's latest bar and the last
+    ``w`` rows its own last ``w`` bars. ``others`` are reordered the same
+    way.
+    """
+    order = alignment_order(close)
+    return [np.take_along_axis(a, order, axis=0) for a in (close,) + others]
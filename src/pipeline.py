@@ -6,10 +6,30 @@ import numpy as np
 import requests
 import subprocess
 import json
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
 from datetime import datetime
 
+from .cache import ResponseCache
+from .equity_stream import COLUMNAR_MEDIA_TYPE, decode_columnar, iter_record_chunks
+from .events import BarEvent, BarSubscriber
+from .feature_store import DiskBackend, FeatureStore, RedisBackend
+from .features import FeatureEngine
+from .forest import FLAT_FOREST_FILE, FlatForest, bar_features
+from .indicators import IndicatorState
+from .panel import flatten_indicators, normalize, wide_views
+from .scenarios import (
+    DEFAULT_QUANTILES,
+    DEFAULT_TAIL_THRESHOLDS,
+    Condition,
+    ScenarioEngine,
+    ScenarioSummary,
+)
+from .screener import Filter, Screener
+from .simulations import COPULA_SIMULATIONS_FILE, SimulationMatrix
+from .snapshot import SNAPSHOT_FILE, export_snapshot, import_snapshot
 from .utils.config import Config
 from .utils.logger import setup_logger, get_logger
 
@@ -43,19 +63,46 @@ class FinancialMLPipeline:
         # Java backend configuration
         self.java_api_url = f"http://{self.config.get('architecture.backend.api.host')}:{self.config.get('architecture.backend.api.port')}"
         self.redis_config = self.config.get("architecture.backend.redis")
+        self.session = self._build_session()
+        self.response_cache = ResponseCache(
+            ttl=self.config.get("architecture.backend.api.cache.ttl", 5),
+            max_entries=self.config.get("architecture.backend.api.cache.max_entries", 256),
+            max_bytes=self.config.get("architecture.backend.api.cache.max_mb", 256) * 2**20,
+        )
+        # Bumped when the backing data set is known to have changed
+        self.data_generation = 0
         self.logger.info(f"Java API: {self.java_api_url}")
         self.logger.info(
             f"Redis: {self.redis_config['host']}:{self.redis_config['port']}"
         )
 
+        self.scenario_engine: Optional[ScenarioEngine] = None
+        self.feature_engine = FeatureEngine.from_config(self.config)
+        self._feature_store: Optional[FeatureStore] = None
+
+        # Incremental state advanced by new-bar events
+        self._indicator_states: Dict[str, IndicatorState] = {}
+        self._pending_returns: Dict[int, Dict[str, float]] = {}
+        self._event_forest: Optional[FlatForest] = None
+        self._checkpoint_client = None
+
         # Initialize components
         self._init_components()
 
+    def _build_session(self) -> requests.Session:
+        """Keep-alive HTTP session with a connection pool for the Java API."""
+        pool_size = self.config.get("architecture.backend.api.pool_size", 16)
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
     def _init_components(self):
         """Initialize Java backend and Rust models."""
         # Check if Java backend is running
         try:
-            response = requests.get(f"{self.java_api_url}/api/health", timeout=2)
+            response = self.session.get(f"{self.java_api_url}/api/health", timeout=2)
             if response.status_code == 200:
                 self.logger.info("Java backend is running")
             else:
@@ -79,7 +126,7 @@ class FinancialMLPipeline:
     def check_java_backend(self) -> bool:
         """Check if Java backend is running."""
         try:
-            response = requests.get(f"{self.java_api_url}/api/health", timeout=2)
+            response = self.session.get(f"{self.java_api_url}/api/health", timeout=2)
             return response.status_code == 200
         except:
             return False
@@ -205,18 +252,75 @@ class FinancialMLPipeline:
 
         return results
 
-    def get_data_from_java(self, symbol: str, limit: int = 100) -> pd.DataFrame:
-        """Get data from Java backend."""
+    @property
+    def _use_columnar(self) -> bool:
+        return self.config.get("architecture.backend.api.format", "json") == "columnar"
+
+    def _columnar_headers(self) -> Dict[str, str]:
+        """Accept header preferring the binary columnar format, when enabled."""
+        if not self._use_columnar:
+            return {}
+        return {"Accept": f"{COLUMNAR_MEDIA_TYPE}, application/json;q=0.5"}
+
+    def _response_frame(self, response: requests.Response) -> pd.DataFrame:
+        """Decode a columnar or JSON response body into a DataFrame."""
+        if response.headers.get("Content-Type", "").startswith(COLUMNAR_MEDIA_TYPE):
+            return decode_columnar(response.content)
+        return pd.DataFrame(response.json())
+
+    def invalidate_data_cache(self) -> None:
+        """Start a new data generation so cached responses are not reused."""
+        self.data_generation += 1
+        self.response_cache.clear()
+
+    def invalidate_symbols(self, symbols: Iterable[str]) -> int:
+        """Drop the cached responses of ``symbols`` only; returns how many."""
+        symbols = set(symbols)
+        return self.response_cache.discard(lambda key: key[0] in symbols)
+
+    def get_data_from_java(
+        self,
+        symbol: str,
+        limit: int = 100,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Get data from Java backend.
+
+        ``start``/``end`` are inclusive timestamp bounds served from the
+        symbol's sorted-set index; the newest ``limit`` records in the range
+        are returned in chronological order.
+
+        Responses are cached per (symbol, range, limit, data generation) for
+        ``architecture.backend.api.cache.ttl`` seconds; after that the
+        cached ETag is revalidated with ``If-None-Match`` and a 304 reuses
+        the cached frame. Returned frames share data with the cache.
+        """
+        key = (symbol, start, end, limit, self.data_generation)
+        entry = self.response_cache.lookup(key)
+        if entry is not None and entry.fresh:
+            return entry.value.copy(deep=False)
+
+        headers = self._columnar_headers()
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.java_api_url}/api/equity/symbol",
-                params={"symbol": symbol, "limit": limit},
+                params={"symbol": symbol, "limit": limit, "from": start, "to": end},
+                headers=headers,
                 timeout=5,
             )
 
-            if response.status_code == 200:
-                data = response.json()
-                return pd.DataFrame(data)
+            if response.status_code == 304 and entry is not None:
+                self.response_cache.refresh(key)
+                return entry.value.copy(deep=False)
+            elif response.status_code == 200:
+                df = self._response_frame(response)
+                self.response_cache.put(key, df, response.headers.get("ETag"))
+                return df.copy(deep=False)
             else:
                 self.logger.error(
                     f"Failed to get data for {symbol}: {response.status_code}"
@@ -226,10 +330,98 @@ class FinancialMLPipeline:
             self.logger.error(f"Error fetching data for {symbol}: {e}")
             return pd.DataFrame()
 
-    def get_all_data(self) -> pd.DataFrame:
-        """Get all data from Java backend."""
+    def get_data_for_symbols(
+        self,
+        symbols: Optional[List[str]] = None,
+        limit: int = 100,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Fetch several symbols concurrently over the pooled session.
+
+        Args:
+            symbols: Symbols to fetch, the configured assets by default
+            limit: Maximum records per symbol
+            start: Inclusive lower timestamp bound
+            end: Inclusive upper timestamp bound
+
+        Returns:
+            Combined DataFrame of every symbol that returned data
+        """
+        symbols = symbols or self.assets
+        max_workers = min(
+            self.config.get("architecture.backend.api.max_workers", 8), len(symbols)
+        )
+        if max_workers == 0:
+            return pd.DataFrame()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            frames = list(
+                executor.map(
+                    lambda s: self.get_data_from_java(s, limit, start, end), symbols
+                )
+            )
+
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame()
+
+        df = pd.concat(frames, ignore_index=True)
+        self.logger.info(f"Retrieved {len(df)} records for {len(frames)}/{len(symbols)} symbols")
+        return df
+
+    def iter_all_data(self, chunk_size: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Stream all data from the Java backend in fixed-size DataFrame chunks.
+
+        The response is decoded incrementally, so only one chunk of records
+        (plus one network buffer) is held at a time. Indicator maps are
+        flattened into ``ma_*`` and ``macd*`` columns.
+
+        Args:
+            chunk_size: Records per chunk, ``architecture.backend.api.chunk_size``
+                by default
+        """
+        chunk_size = chunk_size or self.config.get("architecture.backend.api.chunk_size", 50000)
+        with self.session.get(
+            f"{self.java_api_url}/api/equity/all", timeout=10, stream=True
+        ) as response:
+            response.raise_for_status()
+            yield from iter_record_chunks(response.iter_content(chunk_size=1 << 16), chunk_size)
+
+    def get_all_data(self, stream: Optional[bool] = None) -> pd.DataFrame:
+        """
+        Get all data from Java backend.
+
+        Args:
+            stream: Decode the response incrementally into typed column
+                chunks (``architecture.backend.api.stream_json`` by default)
+                instead of materializing the parsed JSON list first; ignored
+                when ``architecture.backend.api.format`` is ``columnar``
+        """
+        if stream is None:
+            stream = self.config.get("architecture.backend.api.stream_json", True)
+
         try:
-            response = requests.get(f"{self.java_api_url}/api/equity/all", timeout=10)
+            if self._use_columnar:
+                response = self.session.get(
+                    f"{self.java_api_url}/api/equity/all",
+                    headers=self._columnar_headers(),
+                    timeout=10,
+                )
+                response.raise_for_status()
+                df = self._response_frame(response)
+                self.logger.info(f"Retrieved {len(df)} records from Java backend")
+                return df
+
+            if stream:
+                frames = list(self.iter_all_data())
+                df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+                self.logger.info(f"Retrieved {len(df)} records from Java backend")
+                return df
+
+            response = self.session.get(f"{self.java_api_url}/api/equity/all", timeout=10)
 
             if response.status_code == 200:
                 data = response.json()
@@ -243,8 +435,100 @@ class FinancialMLPipeline:
             self.logger.error(f"Error fetching all data: {e}")
             return pd.DataFrame()
 
-    def run_full_pipeline(self) -> Dict:
-        """Run full pipeline."""
+    def get_panel(
+        self, data: Optional[pd.DataFrame] = None, wide_fields: Optional[List[str]] = None
+    ):
+        """
+        Compact typed panel of all records, optionally with wide views.
+
+        Args:
+            data: Records to normalize; fetched from the Java backend if None
+            wide_fields: Fields to also return as (time x symbol) frames
+
+        Returns:
+            The normalized long panel, or a tuple of (panel, dict of field to
+            wide frame) when ``wide_fields`` is given
+        """
+        if data is None:
+            data = self.get_all_data()
+
+        panel = normalize(data, self.config.get("data.price_dtype", "float32"))
+        if wide_fields is None:
+            return panel
+        return panel, wide_views(panel, wide_fields) if not panel.empty else {}
+
+    def screen(
+        self,
+        filters: Optional[Filter] = None,
+        k: Optional[int] = None,
+        data: Optional[pd.DataFrame] = None,
+    ) -> Dict[str, List[Dict]]:
+        """
+        Screen the whole universe and return top-k lists.
+
+        Args:
+            filters: Composable ``screener`` filters, e.g.
+                ``asset_class("stock") & min_volume(1e6)``
+            k: List length, ``screener.top_n`` by default
+            data: Records to screen; fetched from the Java backend if None
+
+        Returns:
+            Ranking name (``strongest_movers``, ``highest_volume``,
+            ``highest_probable_alpha``) -> records, best first
+        """
+        panel, views = self.get_panel(data, ["close", "volume"])
+        if panel.empty:
+            return {}
+
+        screener = Screener.from_config(self.config)
+        results = screener.screen(views["close"], views["volume"], filters, k)
+        self.logger.info(
+            f"Screened {views['close'].shape[1]} symbols, "
+            f"{len(results['strongest_movers'])} passed the filters"
+        )
+        return results
+
+    def _stage_timeout(self, stage: str) -> float:
+        defaults = {"health": 5, "data": 30, "rust": 60}
+        return self.config.get(f"pipeline.timeouts.{stage}", defaults[stage])
+
+    async def _arun_rust_models(self) -> Dict:
+        """Run the Rust binary as an asyncio subprocess."""
+        if not self.rust_model_path.exists():
+            self.logger.error(
+                "Rust models not built. Please run: cd rust-model && cargo build --release"
+            )
+            return {}
+
+        proc = await asyncio.create_subprocess_exec(
+            str(self.rust_model_path),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                proc.communicate(), timeout=self._stage_timeout("rust")
+            )
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            proc.kill()
+            await proc.wait()
+            raise
+
+        if proc.returncode != 0:
+            self.logger.error(f"Rust models failed: {stderr.decode(errors='replace')}")
+            return {}
+
+        return self._parse_rust_output(stdout.decode().strip().split("\n"))
+
+    async def arun_full_pipeline(self) -> Dict:
+        """
+        Run the full pipeline with independent stages overlapped.
+
+        The health check, the ``/api/equity/all`` fetch and the Rust model
+        run start together, each bounded by ``pipeline.timeouts.<stage>``
+        seconds. The data fetch is cancelled if the backend turns out to be
+        down, and a stage that times out is cancelled and reported as empty.
+        """
         self.logger.info("=" * 60)
         self.logger.info("Running Full Pipeline (Java/Rust Architecture)")
         self.logger.info("=" * 60)
@@ -252,26 +536,58 @@ class FinancialMLPipeline:
         results = {
             "timestamp": datetime.now().isoformat(),
             "assets": self.assets,
-            "java_backend_status": self.check_java_backend(),
+            "java_backend_status": False,
             "data": None,
             "rust_models": None,
         }
 
-        # Get data from Java backend
-        if results["java_backend_status"]:
-            self.logger.info("Fetching data from Java backend...")
-            results["data"] = self.get_all_data()
+        self.logger.info("Running Rust models...")
+        rust_task = asyncio.create_task(self._arun_rust_models())
+        data_task = asyncio.create_task(
+            asyncio.wait_for(
+                asyncio.to_thread(self.get_all_data), timeout=self._stage_timeout("data")
+            )
+        )
+
+        try:
+            try:
+                results["java_backend_status"] = await asyncio.wait_for(
+                    asyncio.to_thread(self.check_java_backend),
+                    timeout=self._stage_timeout("health"),
+                )
+            except asyncio.TimeoutError:
+                self.logger.error("Java backend health check timed out")
 
-            if not results["data"].empty:
-                self.logger.info(f"Data fetched: {len(results['data'])} records")
+            # Get data from Java backend
+            if results["java_backend_status"]:
+                self.logger.info("Fetching data from Java backend...")
+                try:
+                    results["data"] = await data_task
+                except asyncio.TimeoutError:
+                    self.logger.error("Data fetch from Java backend timed out")
+                    results["data"] = pd.DataFrame()
+
+                if not results["data"].empty:
+                    self.logger.info(f"Data fetched: {len(results['data'])} records")
+                else:
+                    self.logger.warning("No data available from Java backend")
             else:
-                self.logger.warning("No data available from Java backend")
-        else:
-            self.logger.warning("Java backend not running, skipping data fetch")
+                data_task.cancel()
+                self.logger.warning("Java backend not running, skipping data fetch")
 
-        # Run Rust models
-        self.logger.info("Running Rust models...")
-        results["rust_models"] = self.run_rust_models()
+            try:
+                results["rust_models"] = await rust_task
+            except asyncio.TimeoutError:
+                self.logger.error("Rust models timed out")
+                results["rust_models"] = {}
+            except Exception as e:
+                self.logger.error(f"Failed to run Rust models: {e}")
+                results["rust_models"] = {}
+        finally:
+            for task in (rust_task, data_task):
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(rust_task, data_task, return_exceptions=True)
 
         if results["rust_models"]:
             self.logger.info("Rust models completed successfully")
@@ -280,6 +596,25 @@ class FinancialMLPipeline:
 
         return results
 
+    def run_full_pipeline(self) -> Dict:
+        """
+        Run full pipeline (synchronous wrapper over ``arun_full_pipeline``).
+
+        Async callers, including Jupyter notebooks, already run an event
+        loop and must ``await pipeline.arun_full_pipeline()`` instead.
+
+        Raises:
+            RuntimeError: If called from a running event loop
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.arun_full_pipeline())
+        raise RuntimeError(
+            "run_full_pipeline() cannot run inside an event loop; "
+            "use 'await pipeline.arun_full_pipeline()' instead"
+        )
+
     def generate_report(self, results: Optional[Dict] = None) -> str:
         """Generate report from results."""
         if results is None:
@@ -363,19 +698,491 @@ class FinancialMLPipeline:
 
         return predictions
 
+    def compute_features(self, data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Compute technical-indicator features for every symbol and bar.
+
+        Args:
+            data: Long-format bars; fetched from the Java backend if None
+
+        Returns:
+            Long DataFrame of features keyed by ``timestamp`` and ``symbol``
+        """
+        if data is None:
+            data = self.get_all_data()
+
+        if data.empty:
+            self.logger.warning("No data available to compute features")
+            return pd.DataFrame()
+
+        features = self.feature_engine.compute(data)
+        self.logger.info(
+            f"Computed {len(self.feature_engine.feature_names)} features for "
+            f"{features['symbol'].nunique()} symbols, {len(features)} bars"
+        )
+        return features
+
+    def _redis_client(self):
+        """New client for the configured Redis server."""
+        import redis
+
+        return redis.Redis(host=self.redis_config["host"], port=self.redis_config["port"])
+
+    def _snapshot_path(self, path: Optional[Union[str, Path]]) -> Path:
+        return Path(path) if path else Path(self.config.get_paths()["data_dir"]) / SNAPSHOT_FILE
+
+    def export_snapshot(self, path: Optional[Union[str, Path]] = None) -> Dict[str, int]:
+        """
+        Save the Redis bar store to ``paths.data_dir/redis_snapshot.npz``.
+
+        Args:
+            path: Snapshot file, the default location if None
+
+        Returns:
+            Counts of exported bars, symbols and meta keys
+        """
+        path = self._snapshot_path(path)
+        counts = export_snapshot(self._redis_client(), path)
+        self.logger.info(
+            f"Exported {counts['bars']} bars for {counts['symbols']} symbols to {path}"
+        )
+        return counts
+
+    def import_snapshot(self, path: Optional[Union[str, Path]] = None) -> Dict[str, int]:
+        """
+        Restore the Redis bar store from a snapshot without re-downloading.
+
+        Args:
+            path: Snapshot file, the default location if None
+
+        Returns:
+            Counts of restored bars, symbols, meta keys and skipped expired bars
+        """
+        path = self._snapshot_path(path)
+        counts = import_snapshot(self._redis_client(), path)
+        self.invalidate_data_cache()
+        self.logger.info(
+            f"Restored {counts['bars']} bars for {counts['symbols']} symbols from {path}"
+            f" ({counts['expired']} expired)"
+        )
+        return counts
+
+    @property
+    def feature_store(self) -> FeatureStore:
+        """Feature store on the configured backend, created on first use."""
+        if self._feature_store is None:
+            if self.config.get("feature_store.backend", "disk") == "redis":
+                backend = RedisBackend(
+                    self._redis_client(), ttl=self.config.get("feature_store.ttl")
+                )
+            else:
+                backend = DiskBackend(self.config.get_paths()["cache_dir"])
+            self._feature_store = FeatureStore(backend, self.feature_engine)
+        return self._feature_store
+
+    def get_features(
+        self, data: Optional[pd.DataFrame] = None, window: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Stored features for every symbol, computing only stale or missing ones.
+
+        Args:
+            data: Long-format bars; fetched from the Java backend if None
+            window: Bars kept per symbol, ``feature_store.window`` by default
+
+        Returns:
+            Long DataFrame of features keyed by ``timestamp`` and ``symbol``
+        """
+        if data is None:
+            data = self.get_all_data()
+
+        if data.empty:
+            self.logger.warning("No data available for the feature store")
+            return pd.DataFrame()
+
+        window = window or self.config.get("feature_store.window", 240)
+        return self.feature_store.get_or_compute(data, window)
+
+    def load_flat_forest(self) -> Optional[FlatForest]:
+        """Load the forest exported by the Rust model, if one exists."""
+        path = Path(self.config.get_paths()["model_dir"]) / FLAT_FOREST_FILE
+        if not path.exists():
+            return None
+
+        try:
+            return FlatForest.load(path)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring exported forest {path}: {e}")
+            return None
+
+    def load_copula_simulations(self) -> Optional[SimulationMatrix]:
+        """
+        Memory-map the copula draws exported by the last Rust run.
+
+        Returns:
+            Simulation matrix, or None when no valid export exists
+        """
+        path = Path(self.config.get_paths()["model_dir"]) / COPULA_SIMULATIONS_FILE
+        if not path.exists():
+            return None
+
+        try:
+            return SimulationMatrix.load(path)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring exported simulations {path}: {e}")
+            return None
+
+    def predict_batch(self, features: np.ndarray) -> np.ndarray:
+        """
+        Score a feature matrix with the Rust random forest in one call.
+
+        Uses the forest exported to ``paths.model_dir`` by the last Rust run
+        when there is one, scoring locally with NumPy. Otherwise the matrix
+        is handed to the binary's ``--predict-batch`` mode as a raw
+        little-endian file; the binary trains and exports a forest only
+        when none is saved, and scores every row in a single tree-major
+        pass.
+
+        Args:
+            features: Array of shape (n_rows, n_features), one row per
+                symbol/observation, in the model's feature order
+
+        Returns:
+            Array of n_rows predicted returns (empty on failure)
+        """
+        features = np.ascontiguousarray(np.atleast_2d(features), dtype="<f8")
+        n_rows, n_features = features.shape
+
+        forest = self.load_flat_forest()
+        if forest is not None:
+            return forest.predict(features)
+
+        if not self.rust_model_path.exists():
+            self.logger.error(
+                "Rust models not built. Please run: cd rust-model && cargo build --release"
+            )
+            return np.array([])
+
+        cache_dir = Path(self.config.get_paths()["cache_dir"])
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        input_path = cache_dir / f"features_{stamp}.bin"
+        output_path = cache_dir / f"predictions_{stamp}.bin"
+
+        try:
+            with open(input_path, "wb") as f:
+                f.write(np.array([n_rows, n_features], dtype="<u8").tobytes())
+                f.write(features.tobytes())
+
+            result = subprocess.run(
+                [
+                    str(self.rust_model_path),
+                    "--predict-batch",
+                    str(input_path),
+                    str(output_path),
+                ],
+                capture_output=True,
+                text=True,
+                timeout=self.config.get("random_forest.predict_timeout", 300),
+            )
+
+            if result.returncode != 0 or not output_path.exists():
+                self.logger.error(f"Batch prediction failed: {result.stderr or result.stdout}")
+                return np.array([])
+
+            raw = output_path.read_bytes()
+            n_out = int(np.frombuffer(raw, dtype="<u8", count=1)[0])
+            predictions = np.frombuffer(raw, dtype="<f8", count=n_out, offset=8).copy()
+            self.logger.info(f"Scored {n_out} rows x {n_features} features")
+            return predictions
+
+        except subprocess.TimeoutExpired:
+            self.logger.error("Batch prediction timed out")
+            return np.array([])
+        finally:
+            input_path.unlink(missing_ok=True)
+            output_path.unlink(missing_ok=True)
+
+    def subscribe_bars(
+        self,
+        on_update: Optional[Callable[[Dict[str, Dict]], None]] = None,
+        should_stop: Callable[[], bool] = lambda: False,
+    ) -> None:
+        """
+        React to new bars as the Java backend stores them, instead of polling.
+
+        Blocks, passing every batch of ``events:equity`` events through
+        ``apply_bar_events`` until ``should_stop()`` returns True.
+
+        Args:
+            on_update: Called with the result of each ``apply_bar_events``
+                that produced updates
+            should_stop: Checked at least every ``events.block_ms``
+        """
+        subscriber = BarSubscriber(
+            self._redis_client(),
+            group=self.config.get("events.group", "pipeline"),
+            consumer=self.config.get("events.consumer"),
+            batch_size=self.config.get("events.batch_size", 100),
+            block_ms=self.config.get("events.block_ms", 5000),
+            claim_idle_ms=self.config.get("events.claim_idle_ms", 60000),
+        )
+        mode = "stream" if subscriber.use_streams else "pub/sub"
+        self.logger.info(f"Subscribed to new-bar events ({mode}) as {subscriber.consumer}")
+
+        def handle(events: List[BarEvent]) -> None:
+            updates = self.apply_bar_events(events)
+            if updates and on_update is not None:
+                on_update(updates)
+
+        subscriber.run(handle, should_stop)
+
+    def apply_bar_events(self, events: List[BarEvent]) -> Dict[str, Dict]:
+        """
+        Fold the bars announced by ``events`` into the incremental state.
+
+        Cached API responses of the announced symbols are dropped, then
+        only the bars after the last one seen are fetched per symbol. A
+        symbol's ``IndicatorState`` comes from memory or its Redis
+        checkpoint (``indicators:{symbol}``); only without either is it
+        backfilled from ``feature_store.window`` bars. The new bars advance
+        the state, which is checkpointed again, and are scored with the
+        exported forest when there is one. Their returns update the
+        scenario engine's correlation once every fitted symbol has
+        reported the timestamp.
+
+        Args:
+            events: New-bar events, e.g. from ``BarSubscriber``
+
+        Returns:
+            Dict of symbol to ``timestamp``, ``features`` and ``prediction``
+            (None without a forest) for its newest bar
+        """
+        symbols = list(dict.fromkeys(event.symbol for event in events))
+        self.invalidate_symbols(symbols)
+        if self._event_forest is None:
+            self._event_forest = self.load_flat_forest()
+
+        updates = {}
+        for symbol in symbols:
+            update = self._apply_symbol_bars(symbol)
+            if update is not None:
+                updates[symbol] = update
+
+        self._update_correlation()
+        return updates
+
+    def _checkpoints(self):
+        """Redis client holding the ``IndicatorState`` checkpoints."""
+        if self._checkpoint_client is None:
+            self._checkpoint_client = self._redis_client()
+        return self._checkpoint_client
+
+    def _indicator_state(self, symbol: str) -> Optional[IndicatorState]:
+        """In-memory state of ``symbol``, else its checkpoint for this engine."""
+        state = self._indicator_states.get(symbol)
+        if state is None:
+            try:
+                state = IndicatorState.load(self._checkpoints(), symbol, self.feature_engine)
+            except Exception as e:
+                self.logger.warning(f"Cannot load indicator checkpoint for {symbol}: {e}")
+            if state is not None:
+                self._indicator_states[symbol] = state
+        return state
+
+    def _save_indicator_state(self, symbol: str, state: IndicatorState) -> None:
+        try:
+            state.save(self._checkpoints(), symbol)
+        except Exception as e:
+            self.logger.warning(f"Cannot checkpoint indicators for {symbol}: {e}")
+
+    def _apply_symbol_bars(self, symbol: str) -> Optional[Dict]:
+        state = self._indicator_state(symbol)
+        if state is None or state.last_timestamp is None:
+            bars = self.get_data_from_java(
+                symbol, limit=self.config.get("feature_store.window", 240)
+            )
+        else:
+            bars = self.get_data_from_java(
+                symbol,
+                limit=self.config.get("events.max_bars", 1000),
+                start=state.last_timestamp + 1,
+            )
+        if bars.empty:
+            return None
+
+        bars = flatten_indicators(bars).sort_values("timestamp", kind="stable")
+        closes = bars["close"].to_numpy(dtype=np.float64)
+        volumes = bars["volume"].to_numpy(dtype=np.float64)
+        timestamps = bars["timestamp"].to_numpy(dtype=np.int64)
+
+        if state is None or state.last_timestamp is None:
+            state = IndicatorState(self.feature_engine)
+            self._indicator_states[symbol] = state
+            features = state.backfill(closes, volumes, timestamps)[-1]
+        else:
+            prev = state.closes[-1] if state.closes else np.nan
+            for close, volume, timestamp in zip(closes, volumes, timestamps):
+                features = state.update(close, volume, timestamp)
+                if prev > 0 and np.isfinite(close):
+                    self._pending_returns.setdefault(int(timestamp), {})[symbol] = close / prev - 1
+                prev = close
+        self._save_indicator_state(symbol, state)
+
+        prediction = None
+        if self._event_forest is not None:
+            try:
+                prediction = float(self._event_forest.predict(bar_features(bars.iloc[-1:]))[0])
+            except ValueError as e:
+                self.logger.warning(f"Cannot score {symbol} with the exported forest: {e}")
+
+        return {
+            "timestamp": int(timestamps[-1]),
+            "features": features,
+            "prediction": prediction,
+        }
+
+    def _update_correlation(self) -> None:
+        """Feed timestamps every fitted symbol has reported to the scenario engine."""
+        engine = self.scenario_engine
+        if engine is not None:
+            complete = sorted(
+                ts for ts, row in self._pending_returns.items()
+                if all(s in row for s in engine.symbols)
+            )
+            if complete:
+                rows = np.array(
+                    [[self._pending_returns.pop(ts)[s] for s in engine.symbols] for ts in complete]
+                )
+                engine.update(rows, decay=self.config.get("copula.update_decay", 0.97))
+                self.logger.info(f"Correlation updated with {len(rows)} new return rows")
+
+        # Drop the oldest timestamps that never completed
+        max_pending = self.config.get("events.max_pending", 64)
+        for ts in sorted(self._pending_returns)[:-max_pending]:
+            del self._pending_returns[ts]
+
+    def _build_scenario_engine(self) -> ScenarioEngine:
+        """Create a scenario engine from the ``copula`` configuration."""
+        return ScenarioEngine(
+            random_state=self.config.get("copula.random_state"),
+            chunk_size=self.config.get("copula.chunk_size", 8192),
+            quantiles=self.config.get("copula.quantiles", DEFAULT_QUANTILES),
+            tail_thresholds=self.config.get(
+                "copula.tail_thresholds", DEFAULT_TAIL_THRESHOLDS
+            ),
+            sampling=self.config.get("copula.sampling", "mc"),
+            antithetic=self.config.get("copula.antithetic", False),
+            n_replicates=self.config.get("copula.n_replicates", 16),
+            n_workers=self.config.get("copula.n_workers", 1),
+            executor=self.config.get("copula.executor", "process"),
+            shrinkage=self.config.get("copula.shrinkage", "none"),
+            pd_repair=self.config.get("copula.pd_repair", True),
+            query_cache_size=self.config.get("copula.query_cache_size", 4096),
+        )
+
+    def fit_scenario_engine(self, data: Optional[pd.DataFrame] = None) -> bool:
+        """Fit the Gaussian copula scenario engine on Java backend data."""
+        if data is None:
+            data = self.get_all_data()
+
+        if data.empty:
+            self.logger.warning("No data available to fit the scenario engine")
+            return False
+
+        self.scenario_engine = self._build_scenario_engine().fit(data)
+        self.logger.info(
+            f"Scenario engine fitted on {self.scenario_engine.n_assets} symbols"
+        )
+        return True
+
+    def query_joint_probability(
+        self, conditions: List[Union[str, Condition]], horizon: int = 1
+    ) -> Optional[float]:
+        """
+        Analytic joint probability query on the fitted copula.
+
+        Args:
+            conditions: ``(symbol, op, threshold)`` tuples or strings such
+                as ``"NVDA < -0.03"``
+            horizon: Number of return steps
+
+        Returns:
+            Probability that all conditions hold, or None without data
+        """
+        if self.scenario_engine is None and not self.fit_scenario_engine():
+            return None
+        return self.scenario_engine.joint_probability(conditions, horizon)
+
+    def query_conditional_probability(
+        self,
+        target: List[Union[str, Condition]],
+        given: List[Union[str, Condition]],
+        horizon: int = 1,
+    ) -> Optional[float]:
+        """
+        Analytic conditional probability query, e.g. P(GS > 0 | UBS < 0).
+
+        Args:
+            target: Conditions whose probability is queried
+            given: Conditions assumed to hold
+            horizon: Number of return steps
+
+        Returns:
+            Conditional probability, or None without data
+        """
+        if self.scenario_engine is None and not self.fit_scenario_engine():
+            return None
+        return self.scenario_engine.conditional_probability(target, given, horizon)
+
+    def stream_scenarios(
+        self,
+        n_simulations: int,
+        n_steps: int = 10,
+        output_path: Optional[str] = None,
+    ) -> Optional[ScenarioSummary]:
+        """
+        Stream simulations in bounded memory and return running aggregates.
+
+        Paths are written to ``output_path`` (a ``.npy`` memmap, relative
+        paths resolve under ``paths.data_dir``) when one is given.
+        """
+        if self.scenario_engine is None and not self.fit_scenario_engine():
+            return None
+
+        if output_path is not None and not Path(output_path).is_absolute():
+            output_path = str(Path(self.config.get_paths()["data_dir"]) / output_path)
+
+        summary = self.scenario_engine.stream(n_simulations, n_steps, output_path)
+        self.logger.info(
+            f"Streamed {n_simulations} scenarios x {n_steps} steps"
+            + (f" to {summary.output_path}" if summary.output_path else "")
+        )
+        return summary
+
     def simulate_scenarios(
         self, n_simulations: int = 1000, n_steps: int = 10
     ) -> np.ndarray:
         """
-        Run simulations using Gaussian Copula from Rust.
+        Run simulations using the Gaussian copula scenario engine.
 
-        Note: Full simulation requires Rust model to be updated with simulation output.
+        Tensors larger than ``copula.max_in_memory_mb`` are streamed to a
+        memmap under ``paths.data_dir`` and returned as a read-only view.
         """
-        self.logger.warning("Full simulation not yet implemented in Rust models")
-        self.logger.info("Use Rust model output for correlation analysis instead")
+        if self.scenario_engine is None and not self.fit_scenario_engine():
+            return np.array([])
+
+        engine = self.scenario_engine
+        size_mb = n_simulations * n_steps * engine.n_assets * engine.dtype.itemsize / 2**20
+        if size_mb <= self.config.get("copula.max_in_memory_mb", 512):
+            return engine.simulate(n_simulations, n_steps)
 
-        # Return empty array for now
-        return np.array([])
+        output_path = Path(self.config.get_paths()["data_dir"]) / (
+            f"scenarios_{datetime.now().strftime('%Y%m%d_%H%M%S')}.npy"
+        )
+        self.logger.info(f"Scenario tensor is {size_mb:,.0f} MB, streaming to {output_path}")
+        summary = engine.stream(n_simulations, n_steps, output_path)
+        return np.load(summary.output_path, mmap_mode="r")
 
 
 def main():
@@ -0,0 +1,711 @@
+"""Gaussian copula scenario engine with chunked, memory-bounded simulation."""
+
+import itertools
+import math
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .covariance import (
+    cholesky_rank_one_update,
+    estimate_correlation,
+    nearest_positive_definite,
+)
+
+
+DEFAULT_QUANTILES = (0.01, 0.05, 0.5, 0.95, 0.99)
+DEFAULT_TAIL_THRESHOLDS = (-0.05, -0.03, 0.03, 0.05)
+SAMPLING_METHODS = ("mc", "qmc")
+EXECUTORS = ("process", "thread")
+
+# A query condition: (symbol, "<" or ">", return threshold)
+Condition = Tuple[str, str, float]
+
+# Engine shared with process-pool workers, set once per worker process
+_WORKER_ENGINE: Optional["ScenarioEngine"] = None
+
+
+def parse_condition(condition: Union[str, Sequence]) -> Condition:
+    """
+    Normalize a query condition.
+
+    Args:
+        condition: ``(symbol, op, threshold)`` or a string such as
+            ``"NVDA < -0.03"``; ``op`` is ``<`` or ``>`` (``<=``/``>=`` are
+            accepted and equivalent for continuous returns)
+
+    Returns:
+        Tuple of (symbol, "<" or ">", threshold)
+    """
+    if isinstance(condition, str):
+        for op in ("<=", ">=", "<", ">"):
+            if op in condition:
+                symbol, threshold = condition.split(op, 1)
+                condition = (symbol.strip(), op, threshold.strip())
+                break
+        else:
+            raise ValueError(f"Cannot parse condition '{condition}'")
+
+    symbol, op, threshold = condition
+    if op not in ("<", ">", "<=", ">="):
+        raise ValueError(f"Unknown comparison '{op}' in condition for {symbol}")
+    return str(symbol), op[0], float(threshold)
+
+
+class QuantileSketch:
+    """
+    Fixed-bin histogram sketch for streaming per-asset quantiles.
+
+    Each asset gets ``n_bins`` equal-width bins over ``[lower, upper]`` plus
+    one underflow and one overflow bin, so memory stays at
+    ``n_assets * (n_bins + 2)`` counters however many values are added.
+    Quantile error is bounded by one bin width inside the range.
+    """
+
+    def __init__(self, lower: np.ndarray, upper: np.ndarray, n_bins: int = 2048):
+        self.lower = np.asarray(lower, dtype=np.float64)
+        upper = np.asarray(upper, dtype=np.float64)
+        span = np.where(upper > self.lower, upper - self.lower, 1e-12)
+        self.n_bins = n_bins
+        self.width = span / n_bins
+        self.counts = np.zeros((len(self.lower), n_bins + 2), dtype=np.int64)
+        self._offsets = np.arange(len(self.lower), dtype=np.int64) * (n_bins + 2)
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Add a batch of observations.
+
+        Args:
+            values: Array of shape (n_observations, n_assets)
+        """
+        idx = np.floor((values - self.lower) / self.width).astype(np.int64) + 1
+        np.clip(idx, 0, self.n_bins + 1, out=idx)
+        flat = (idx + self._offsets).ravel()
+        self.counts += np.bincount(flat, minlength=self.counts.size).reshape(
+            self.counts.shape
+        )
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Merge counts from a sketch built over the same bins."""
+        self.counts += other.counts
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        """
+        Estimate quantiles for every asset.
+
+        Args:
+            qs: Quantile levels in [0, 1]
+
+        Returns:
+            Array of shape (len(qs), n_assets)
+        """
+        cum = np.cumsum(self.counts, axis=1)
+        total = cum[:, -1]
+        rows = np.arange(len(self.lower))
+        out = np.empty((len(qs), len(self.lower)))
+
+        for i, q in enumerate(qs):
+            target = q * total
+            bins = (cum >= target[:, None]).argmax(axis=1)
+            before = np.where(bins > 0, cum[rows, np.maximum(bins - 1, 0)], 0)
+            in_bin = self.counts[rows, bins]
+            frac = np.where(in_bin > 0, (target - before) / np.maximum(in_bin, 1), 0.0)
+            value = self.lower + (bins - 1 + frac) * self.width
+            out[i] = np.clip(value, self.lower, self.lower + self.n_bins * self.width)
+
+        return out
+
+
+@dataclass
+class ScenarioSummary:
+    """Running aggregates collected while streaming scenarios."""
+
+    symbols: List[str]
+    n_simulations: int
+    n_steps: int
+    mean: np.ndarray
+    mean_std_error: np.ndarray
+    quantiles: Dict[float, np.ndarray] = field(default_factory=dict)
+    tail_probabilities: Dict[float, np.ndarray] = field(default_factory=dict)
+    tail_std_errors: Dict[float, np.ndarray] = field(default_factory=dict)
+    sampling: str = "mc"
+    antithetic: bool = False
+    output_path: Optional[str] = None
+
+    def to_frame(self) -> pd.DataFrame:
+        """Tabulate the summary with one row per symbol."""
+        columns = {"mean": self.mean, "mean_se": self.mean_std_error}
+        for q, values in self.quantiles.items():
+            columns[f"q{q:g}"] = values
+        for threshold, values in self.tail_probabilities.items():
+            op = "<=" if threshold < 0 else ">="
+            columns[f"P(R{op}{threshold:g})"] = values
+            columns[f"P(R{op}{threshold:g})_se"] = self.tail_std_errors[threshold]
+        return pd.DataFrame(columns, index=self.symbols)
+
+
+def _batch_std_error(estimates: List[np.ndarray], weights: List[int]) -> np.ndarray:
+    """
+    Standard error of a weighted mean of independent batch estimates.
+
+    Each chunk of a run is an independent replicate (fresh pseudo-random
+    stream or fresh Sobol scramble), so the spread of the chunk estimates
+    measures the error of the pooled estimate, including the variance
+    reduction achieved by QMC and antithetic pairing.
+    """
+    k = len(estimates)
+    x = np.vstack(estimates)
+    w = np.asarray(weights, dtype=np.float64)[:, None] / sum(weights)
+    pooled = (w * x).sum(axis=0)
+    return np.sqrt(k / (k - 1) * (w**2 * (x - pooled) ** 2).sum(axis=0))
+
+
+def _init_worker(engine: "ScenarioEngine") -> None:
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = engine
+
+
+def _simulate_chunk(seed: np.random.SeedSequence, n_paths: int, n_steps: int) -> np.ndarray:
+    return _WORKER_ENGINE._draw(np.random.default_rng(seed), n_paths, n_steps)
+
+
+class ScenarioEngine:
+    """
+    Gaussian copula over per-symbol normal return marginals.
+
+    Mirrors ``GaussianCopula`` in the Rust model: marginals are fitted from
+    close-to-close returns, dependence from their correlation matrix, and each
+    simulated step is ``mean + std * (L @ z)`` with ``L`` the Cholesky factor.
+
+    Scenario tensors have shape (n_simulations, n_steps, n_assets). Large runs
+    are generated chunk by chunk so that only ``chunk_size`` paths are held in
+    memory at a time; aggregates are computed on per-path horizon returns
+    (the sum of step returns over ``n_steps``).
+
+    ``sampling="qmc"`` draws the normals from scrambled Sobol points (one
+    dimension per step and asset) and ``antithetic=True`` mirrors every draw;
+    both reduce the number of paths needed for a given standard error.
+
+    Every chunk draws from its own stream spawned from ``random_state`` via
+    ``np.random.SeedSequence``, so chunks can be generated by ``n_workers``
+    processes (or threads, which run in parallel because NumPy's generators
+    and BLAS release the GIL) and results are bit-identical for any worker
+    count.
+
+    ``shrinkage`` selects a Ledoit-Wolf or OAS correlation estimate, which
+    stays well conditioned when the universe has more symbols than
+    overlapping observations; ``pd_repair`` projects a matrix that still
+    fails to factor onto the nearest positive definite correlation matrix.
+
+    The Cholesky factor is computed once per fit and cached; ``update`` folds
+    new observations in with rank-one updates of the cached factor.
+
+    ``joint_probability`` and ``conditional_probability`` answer threshold
+    queries analytically from the multivariate normal CDF instead of
+    simulating, memoized per fitted-model generation.
+    """
+
+    def __init__(
+        self,
+        random_state: Optional[int] = None,
+        chunk_size: int = 8192,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        tail_thresholds: Sequence[float] = DEFAULT_TAIL_THRESHOLDS,
+        sketch_bins: int = 2048,
+        dtype: Union[str, np.dtype] = np.float64,
+        sampling: str = "mc",
+        antithetic: bool = False,
+        n_replicates: int = 16,
+        n_workers: int = 1,
+        executor: str = "process",
+        shrinkage: str = "none",
+        pd_repair: bool = True,
+        query_cache_size: int = 4096,
+    ):
+        if sampling not in SAMPLING_METHODS:
+            raise ValueError(
+                f"Unknown sampling method '{sampling}', expected one of {SAMPLING_METHODS}"
+            )
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor '{executor}', expected one of {EXECUTORS}")
+
+        self.random_state = random_state
+        self.chunk_size = chunk_size
+        self.quantile_levels = tuple(quantiles)
+        self.tail_thresholds = tuple(tail_thresholds)
+        self.sketch_bins = sketch_bins
+        self.dtype = np.dtype(dtype)
+        self.sampling = sampling
+        self.antithetic = antithetic
+        self.n_replicates = max(n_replicates, 2)
+        self.n_workers = max(n_workers, 1)
+        self.executor = executor
+        self.shrinkage = shrinkage
+        self.pd_repair = pd_repair
+        self.query_cache_size = query_cache_size
+
+        self.symbols: List[str] = []
+        self.means = np.empty(0)
+        self.stds = np.empty(0)
+        self.correlation = np.empty((0, 0))
+        self._cholesky = np.empty((0, 0))
+
+        # Bumped whenever the fitted model changes; keys the query cache
+        self.generation = 0
+        self._query_cache: Dict[tuple, float] = {}
+
+    @property
+    def n_assets(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.n_assets > 0
+
+    def fit(self, data: pd.DataFrame) -> "ScenarioEngine":
+        """
+        Fit marginals and correlation from long-format price data.
+
+        Args:
+            data: DataFrame with ``symbol``, ``timestamp`` and ``close`` columns
+
+        Returns:
+            The fitted engine
+        """
+        closes = (
+            data.pivot_table(index="timestamp", columns="symbol", values="close")
+            .sort_index()
+            .astype(np.float64)
+        )
+        returns = closes.pct_change(fill_method=None).iloc[1:]
+        returns = returns.loc[:, returns.count() >= 4]
+        return self.fit_returns(returns)
+
+    def fit_returns(self, returns: pd.DataFrame) -> "ScenarioEngine":
+        """
+        Fit marginals and correlation from a wide (time x symbol) return frame.
+
+        Args:
+            returns: Simple returns, one column per symbol
+
+        Returns:
+            The fitted engine
+        """
+        returns = returns.reindex(sorted(returns.columns), axis=1)
+        self.symbols = [str(s) for s in returns.columns]
+        self.means = returns.mean().to_numpy()
+        self.stds = returns.std(ddof=0).fillna(0.0).to_numpy()
+
+        corr = estimate_correlation(returns, self.shrinkage)
+        self._cholesky = self._factor(corr)
+        self._bump_generation()
+        return self
+
+    def _bump_generation(self) -> None:
+        self.generation += 1
+        self._query_cache.clear()
+
+    def _factor(self, corr: np.ndarray) -> np.ndarray:
+        """Factor ``corr``, repairing it first if it is not positive definite."""
+        try:
+            factor = np.linalg.cholesky(corr)
+        except np.linalg.LinAlgError as e:
+            if not self.pd_repair:
+                raise ValueError(
+                    "Correlation matrix is not positive definite; enable "
+                    "copula.pd_repair or copula.shrinkage"
+                ) from e
+            corr = nearest_positive_definite(corr)
+            factor = np.linalg.cholesky(corr)
+
+        self.correlation = corr
+        return factor
+
+    def update(
+        self,
+        new_returns: Union[pd.DataFrame, np.ndarray],
+        decay: float = 0.97,
+    ) -> "ScenarioEngine":
+        """
+        Fold new return observations into the correlation without refactoring.
+
+        Applies ``C <- decay * C + (1 - decay) * z z^T`` for each new row of
+        standardized returns ``z``, updating the cached Cholesky factor by a
+        rank-one update per row (O(k N^2) for k rows instead of O(N^3)),
+        then rescales both back to a unit diagonal. Marginals are kept.
+
+        Args:
+            new_returns: Rows of returns, either a frame with one column per
+                symbol or an array in ``self.symbols`` order
+            decay: Weight kept by the existing correlation per observation
+
+        Returns:
+            The updated engine
+        """
+        self._check_fitted()
+        if not 0 < decay < 1:
+            raise ValueError("decay must be in (0, 1)")
+
+        if isinstance(new_returns, pd.DataFrame):
+            new_returns = new_returns.reindex(columns=self.symbols).to_numpy(dtype=np.float64)
+        rows = np.atleast_2d(np.asarray(new_returns, dtype=np.float64))
+
+        stds = np.where(self.stds > 0, self.stds, np.inf)
+        z = np.nan_to_num((rows - self.means) / stds, nan=0.0) * np.sqrt(1 - decay)
+
+        # Work on a copy so a failed update leaves the cached factor intact
+        corr = self.correlation
+        factor = self._cholesky.copy()
+        for x in z:
+            corr = decay * corr + np.outer(x, x)
+            factor *= np.sqrt(decay)
+            cholesky_rank_one_update(factor, x)
+
+        d = 1 / np.sqrt(np.diag(corr))
+        self.correlation = corr * np.outer(d, d)
+        self._cholesky = factor * d[:, None]
+        self._bump_generation()
+        return self
+
+    def _orthant_probability(self, conditions: Tuple[Condition, ...], horizon: int) -> float:
+        """P(all conditions hold) for ``horizon``-step returns, memoized."""
+        key = (self.generation, horizon, conditions)
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            return cached
+
+        index = {s: i for i, s in enumerate(self.symbols)}
+        missing = [s for s, _, _ in conditions if s not in index]
+        if missing:
+            raise KeyError(f"Symbols not in the fitted model: {missing}")
+
+        idx = np.array([index[s] for s, _, _ in conditions])
+        thresholds = np.array([t for _, _, t in conditions])
+        # ">" conditions become "<" on the negated variable
+        signs = np.array([1.0 if op == "<" else -1.0 for _, op, _ in conditions])
+
+        mean = self.means[idx] * horizon
+        std = self.stds[idx] * np.sqrt(horizon)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            upper = signs * (thresholds - mean) / std
+        # Degenerate marginals are a step function at the mean
+        upper = np.where(std > 0, upper, np.where(signs * (thresholds - mean) >= 0, np.inf, -np.inf))
+
+        if np.any(upper == -np.inf):
+            probability = 0.0
+        else:
+            keep = upper < np.inf
+            if not keep.any():
+                probability = 1.0
+            elif keep.sum() == 1:
+                from scipy.special import ndtr
+
+                probability = float(ndtr(upper[keep][0]))
+            else:
+                from scipy.stats import multivariate_normal
+
+                corr = self.correlation[np.ix_(idx, idx)] * np.outer(signs, signs)
+                corr = corr[np.ix_(keep, keep)]
+                probability = float(
+                    multivariate_normal(
+                        mean=np.zeros(keep.sum()),
+                        cov=corr,
+                        allow_singular=True,
+                        seed=self.random_state,
+                    ).cdf(upper[keep])
+                )
+
+        probability = min(max(probability, 0.0), 1.0)
+        if len(self._query_cache) >= self.query_cache_size:
+            self._query_cache.pop(next(iter(self._query_cache)))
+        self._query_cache[key] = probability
+        return probability
+
+    def joint_probability(
+        self, conditions: Sequence[Union[str, Sequence]], horizon: int = 1
+    ) -> float:
+        """
+        Probability that every condition holds, e.g. P(NVDA < -3% and AMD < -3%).
+
+        Evaluated analytically as a multivariate normal orthant probability
+        over the copula, using the ``horizon``-step sum of returns.
+
+        Args:
+            conditions: Conditions accepted by ``parse_condition``
+            horizon: Number of steps the returns are summed over
+
+        Returns:
+            Joint probability in [0, 1]
+        """
+        self._check_fitted()
+        parsed = tuple(sorted(parse_condition(c) for c in conditions))
+        if not parsed:
+            return 1.0
+        return self._orthant_probability(parsed, horizon)
+
+    def conditional_probability(
+        self,
+        target: Sequence[Union[str, Sequence]],
+        given: Sequence[Union[str, Sequence]],
+        horizon: int = 1,
+    ) -> float:
+        """
+        Probability of ``target`` given ``given``, e.g. P(GS > 0 | UBS < 0).
+
+        Args:
+            target: Conditions that must hold
+            given: Conditions being conditioned on
+            horizon: Number of steps the returns are summed over
+
+        Returns:
+            Conditional probability in [0, 1] (0 when ``given`` has zero
+            probability)
+        """
+        given = list(given)
+        denominator = self.joint_probability(given, horizon)
+        if denominator <= 0:
+            return 0.0
+        numerator = self.joint_probability(list(target) + given, horizon)
+        return min(numerator / denominator, 1.0)
+
+    def _check_fitted(self) -> None:
+        if not self.is_fitted:
+            raise RuntimeError("ScenarioEngine must be fitted before simulating")
+
+    def _standard_normals(
+        self, rng: np.random.Generator, n_paths: int, n_steps: int
+    ) -> np.ndarray:
+        n_base = (n_paths + 1) // 2 if self.antithetic else n_paths
+        shape = (n_base, n_steps, self.n_assets)
+
+        if self.sampling == "qmc":
+            from scipy.special import ndtri
+            from scipy.stats import qmc
+
+            sobol = qmc.Sobol(d=n_steps * self.n_assets, scramble=True, seed=rng)
+            # Sobol points are balanced in power-of-two blocks only
+            u = sobol.random_base2(max(math.ceil(math.log2(max(n_base, 1))), 0))[:n_base]
+            np.clip(u, 1e-12, 1 - 1e-12, out=u)
+            z = ndtri(u).reshape(shape)
+        else:
+            z = rng.standard_normal(shape)
+
+        if self.antithetic:
+            z = np.concatenate([z, -z])[:n_paths]
+        return z
+
+    def _draw(self, rng: np.random.Generator, n_paths: int, n_steps: int) -> np.ndarray:
+        z = self._standard_normals(rng, n_paths, n_steps)
+        correlated = z @ self._cholesky.T
+        return (self.means + self.stds * correlated).astype(self.dtype, copy=False)
+
+    def iter_chunks(
+        self,
+        n_simulations: int,
+        n_steps: int,
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[np.ndarray]:
+        """
+        Yield scenario chunks of shape (<= chunk_size, n_steps, n_assets).
+
+        Args:
+            n_simulations: Total number of simulated paths
+            n_steps: Steps per path
+            chunk_size: Paths per chunk (defaults to the engine setting)
+        """
+        self._check_fitted()
+        chunk_size = chunk_size or self.chunk_size
+        sizes = [
+            min(chunk_size, n_simulations - start)
+            for start in range(0, n_simulations, chunk_size)
+        ]
+        seeds = np.random.SeedSequence(self.random_state).spawn(len(sizes))
+
+        if self.n_workers == 1:
+            for seed, n_paths in zip(seeds, sizes):
+                yield self._draw(np.random.default_rng(seed), n_paths, n_steps)
+        else:
+            yield from self._iter_chunks_parallel(seeds, sizes, n_steps)
+
+    def _iter_chunks_parallel(
+        self,
+        seeds: List[np.random.SeedSequence],
+        sizes: List[int],
+        n_steps: int,
+    ) -> Iterator[np.ndarray]:
+        """
+        Generate chunks on a worker pool, yielding them in chunk order.
+
+        At most ``2 * n_workers`` chunks are in flight so memory stays bounded
+        when the consumer is slower than the workers.
+        """
+        if self.executor == "thread":
+            pool = ThreadPoolExecutor(max_workers=self.n_workers)
+
+            def submit(seed: np.random.SeedSequence, n_paths: int) -> Future:
+                return pool.submit(self._draw, np.random.default_rng(seed), n_paths, n_steps)
+        else:
+            pool = ProcessPoolExecutor(
+                max_workers=self.n_workers,
+                initializer=_init_worker,
+                initargs=(self,),
+            )
+
+            def submit(seed: np.random.SeedSequence, n_paths: int) -> Future:
+                return pool.submit(_simulate_chunk, seed, n_paths, n_steps)
+
+        tasks = zip(seeds, sizes)
+        pending: deque = deque()
+        with pool:
+            try:
+                for seed, n_paths in itertools.islice(tasks, 2 * self.n_workers):
+                    pending.append(submit(seed, n_paths))
+                while pending:
+                    chunk = pending.popleft().result()
+                    for seed, n_paths in itertools.islice(tasks, 1):
+                        pending.append(submit(seed, n_paths))
+                    yield chunk
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def simulate(self, n_simulations: int, n_steps: int) -> np.ndarray:
+        """
+        Materialize the full scenario tensor in memory.
+
+        Returns:
+            Array of shape (n_simulations, n_steps, n_assets)
+        """
+        self._check_fitted()
+        out = np.empty((n_simulations, n_steps, self.n_assets), dtype=self.dtype)
+        start = 0
+        for chunk in self.iter_chunks(n_simulations, n_steps):
+            out[start:start + len(chunk)] = chunk
+            start += len(chunk)
+        return out
+
+    def replicate_chunk_size(self, n_simulations: int) -> int:
+        """
+        Chunk size that splits a run into at least ``n_replicates`` chunks.
+
+        Quasi-Monte Carlo chunks are rounded down to a power of two to keep
+        the balance properties of the Sobol points.
+        """
+        size = min(self.chunk_size, max(math.ceil(n_simulations / self.n_replicates), 1))
+        return self._qmc_chunk_size(size)
+
+    def _qmc_chunk_size(self, size: int) -> int:
+        """``size`` rounded down to a power of two under ``qmc`` sampling."""
+        if self.sampling == "qmc":
+            return 2 ** int(math.log2(max(size, 1)))
+        return size
+
+    def stream(
+        self,
+        n_simulations: int,
+        n_steps: int,
+        output_path: Optional[Union[str, Path]] = None,
+        chunk_size: Optional[int] = None,
+    ) -> ScenarioSummary:
+        """
+        Simulate in bounded memory, optionally writing paths to a memmap.
+
+        Mean, sketch quantiles and tail probabilities of the horizon return
+        are accumulated in the same pass that generates the paths, together
+        with their standard errors across chunks. With fewer than two chunks
+        the i.i.d. standard errors are reported instead.
+
+        Args:
+            n_simulations: Total number of simulated paths
+            n_steps: Steps per path
+            output_path: Optional ``.npy`` file to write the full tensor to;
+                read it back with ``np.load(path, mmap_mode="r")``
+            chunk_size: Paths per chunk (defaults to splitting the run into
+                ``n_replicates`` chunks of at most ``self.chunk_size`` paths)
+
+        Returns:
+            ScenarioSummary with the aggregates and the output path. Under
+            ``qmc`` every chunk is the same power of two, so
+            ``n_simulations`` is rounded up to a whole number of chunks and
+            the summary reports the count actually simulated.
+        """
+        self._check_fitted()
+        chunk_size = self._qmc_chunk_size(chunk_size or self.replicate_chunk_size(n_simulations))
+        if self.sampling == "qmc":
+            n_simulations = math.ceil(n_simulations / chunk_size) * chunk_size
+
+        memmap = None
+        if output_path is not None:
+            output_path = Path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            memmap = np.lib.format.open_memmap(
+                output_path,
+                mode="w+",
+                dtype=self.dtype,
+                shape=(n_simulations, n_steps, self.n_assets),
+            )
+
+        horizon_mean = self.means * n_steps
+        horizon_std = self.stds * np.sqrt(n_steps)
+        sketch = QuantileSketch(
+            horizon_mean - 8 * horizon_std,
+            horizon_mean + 8 * horizon_std,
+            self.sketch_bins,
+        )
+        total = np.zeros(self.n_assets)
+        total_sq = np.zeros(self.n_assets)
+        tail_counts = {t: np.zeros(self.n_assets, dtype=np.int64) for t in self.tail_thresholds}
+        chunk_sizes: List[int] = []
+        chunk_means: List[np.ndarray] = []
+        chunk_tails: Dict[float, List[np.ndarray]] = {t: [] for t in self.tail_thresholds}
+
+        start = 0
+        for chunk in self.iter_chunks(n_simulations, n_steps, chunk_size):
+            if memmap is not None:
+                memmap[start:start + len(chunk)] = chunk
+            start += len(chunk)
+
+            horizon = chunk.sum(axis=1, dtype=np.float64)
+            total += horizon.sum(axis=0)
+            total_sq += (horizon**2).sum(axis=0)
+            sketch.update(horizon)
+            chunk_sizes.append(len(chunk))
+            chunk_means.append(horizon.mean(axis=0))
+            for threshold, counts in tail_counts.items():
+                hits = (horizon <= threshold if threshold < 0 else horizon >= threshold).sum(axis=0)
+                counts += hits
+                chunk_tails[threshold].append(hits / len(chunk))
+
+        if memmap is not None:
+            memmap.flush()
+            del memmap
+
+        n = max(n_simulations, 1)
+        mean = total / n
+        tails = {t: c / n for t, c in tail_counts.items()}
+        if len(chunk_sizes) >= 2:
+            mean_se = _batch_std_error(chunk_means, chunk_sizes)
+            tail_se = {t: _batch_std_error(chunk_tails[t], chunk_sizes) for t in tails}
+        else:
+            mean_se = np.sqrt(np.maximum(total_sq / n - mean**2, 0.0) / n)
+            tail_se = {t: np.sqrt(p * (1 - p) / n) for t, p in tails.items()}
+
+        estimates = sketch.quantiles(self.quantile_levels)
+        return ScenarioSummary(
+            symbols=list(self.symbols),
+            n_simulations=n_simulations,
+            n_steps=n_steps,
+            mean=mean,
+            mean_std_error=mean_se,
+            quantiles={q: estimates[i] for i, q in enumerate(self.quantile_levels)},
+            tail_probabilities=tails,
+            tail_std_errors=tail_se,
+            sampling=self.sampling,
+            antithetic=self.antithetic,
+            output_path=str(output_path) if output_path is not None else None,
+        )
@@ -0,0 +1,275 @@
+"""Universe-scale screening with vector scores and partial top-k selection."""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .panel import right_align
+
+
+SCORE_FIELDS = ("alpha", "probability", "volume", "change", "bars")
+# Volume at which the liquidity half of the probability score saturates
+VOLUME_SCALE = 1e7
+
+
+def classify(symbol: str, classes: Optional[Mapping[str, Sequence[str]]] = None) -> str:
+    """
+    Asset class of a symbol.
+
+    Configured lists win; otherwise Yahoo-style suffixes are recognised
+    (``=X`` forex, ``-USD`` crypto) and anything else is a stock.
+    """
+    for name, symbols in (classes or {}).items():
+        if symbol in symbols:
+            return name
+    if symbol.endswith("=X"):
+        return "forex"
+    if symbol.endswith("-USD"):
+        return "crypto"
+    return "stock"
+
+
+def score_panel(close: np.ndarray, volume: np.ndarray, window: int = 30) -> Dict[str, np.ndarray]:
+    """
+    BetafishSearch scores for every symbol of a (time x symbol) panel.
+
+    Mirrors the Rust search over each symbol's last ``window`` bars:
+    alpha is the Sharpe ratio of simple returns (population std) times
+    sqrt(n), change is in percent and probability blends |alpha| with
+    average volume.
+
+    Args:
+        close: (time x symbol) closes, NaN where a symbol has no bar
+        volume: (time x symbol) volumes aligned with ``close``
+        window: Trailing bars per symbol
+
+    Returns:
+        Dict of ``SCORE_FIELDS`` to per-symbol arrays; ``bars`` counts the
+        full history
+    """
+    close, volume = right_align(np.asarray(close, np.float64), np.asarray(volume, np.float64))
+    n_cols = close.shape[1]
+    bars = (~np.isnan(close)).sum(axis=0)
+    if close.shape[0] == 0:
+        close = volume = np.full((1, n_cols), np.nan)
+
+    recent = close[-window:]
+    recent_volume = np.where(np.isnan(recent), np.nan, volume[-window:])
+    n_window = np.minimum(bars, recent.shape[0])
+    # Oldest bar inside each symbol's window (any row when it has none)
+    first = recent[np.minimum(recent.shape[0] - n_window, recent.shape[0] - 1), np.arange(n_cols)]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = recent[1:] / recent[:-1] - 1
+        n = np.isfinite(returns).sum(axis=0)
+        returns = np.where(np.isfinite(returns), returns, 0.0)
+        mean = returns.sum(axis=0) / n
+        std = np.sqrt(np.maximum((returns ** 2).sum(axis=0) / n - mean ** 2, 0.0))
+        alpha = np.where((n > 0) & (std > 0), mean / std * np.sqrt(n), 0.0)
+
+        change = np.where(n_window > 1, (recent[-1] - first) / first * 100, 0.0)
+        avg_volume = np.nansum(recent_volume, axis=0) / n_window
+
+    alpha_score = np.minimum(np.abs(alpha), 10.0) / 10.0
+    volume_score = np.clip(np.nan_to_num(avg_volume) / VOLUME_SCALE, 0.0, 1.0)
+    probability = np.clip(0.7 * alpha_score + 0.3 * volume_score, 0.0, 1.0)
+
+    return {
+        "alpha": alpha,
+        "probability": probability,
+        "volume": avg_volume,
+        "change": change,
+        "bars": bars.astype(np.int64),
+    }
+
+
+def top_k(values: np.ndarray, k: int, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Indices of the ``k`` largest values, best first.
+
+    ``np.argpartition`` selects them in O(n) and only those ``k`` are
+    sorted. NaNs and entries outside ``mask`` are never returned.
+    """
+    candidates = np.flatnonzero(~np.isnan(values) if mask is None else mask & ~np.isnan(values))
+    if k <= 0 or candidates.size == 0:
+        return candidates[:0]
+    if candidates.size > k:
+        part = np.argpartition(-values[candidates], k - 1)[:k]
+        candidates = candidates[part]
+    return candidates[np.argsort(-values[candidates], kind="stable")]
+
+
+@dataclass
+class ScreenResult:
+    """Per-symbol scores of one screen, as aligned arrays."""
+
+    symbols: np.ndarray
+    asset_class: np.ndarray
+    scores: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name == "asset_class":
+            return self.asset_class
+        if name == "score":
+            return self.scores["alpha"] * self.scores["probability"]
+        return self.scores[name]
+
+    def rows(self, index: np.ndarray) -> List[Dict]:
+        """Records for the given positions, in that order."""
+        return [
+            {
+                "symbol": str(self.symbols[i]),
+                "asset_class": str(self.asset_class[i]),
+                **{name: self.scores[name][i].item() for name in SCORE_FIELDS},
+            }
+            for i in index
+        ]
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {"asset_class": self.asset_class, **self.scores},
+            index=pd.Index(self.symbols, name="symbol"),
+        )
+
+
+class Filter:
+    """
+    Boolean mask over a ``ScreenResult``; combine with ``&``, ``|`` and ``~``.
+
+    Example:
+        ``(asset_class("stock") | asset_class("crypto")) & min_volume(1e6)``
+    """
+
+    def __init__(self, predicate: Callable[[ScreenResult], np.ndarray]):
+        self.predicate = predicate
+
+    def __call__(self, result: ScreenResult) -> np.ndarray:
+        return np.asarray(self.predicate(result), dtype=bool)
+
+    def __and__(self, other: "Filter") -> "Filter":
+        return Filter(lambda r: self(r) & other(r))
+
+    def __or__(self, other: "Filter") -> "Filter":
+        return Filter(lambda r: self(r) | other(r))
+
+    def __invert__(self) -> "Filter":
+        return Filter(lambda r: ~self(r))
+
+
+def asset_class(*classes: str) -> Filter:
+    """Symbols in any of ``classes``."""
+    return Filter(lambda r: np.isin(r.asset_class, classes))
+
+
+def min_volume(volume: float) -> Filter:
+    """Liquidity floor on average volume over the window."""
+    # Symbols without volume data count as zero volume
+    return Filter(lambda r: np.nan_to_num(r["volume"]) >= volume)
+
+
+def min_bars(bars: int) -> Filter:
+    """Symbols with at least ``bars`` bars of history."""
+    return Filter(lambda r: r["bars"] >= bars)
+
+
+def where(name: str, low: float = -np.inf, high: float = np.inf) -> Filter:
+    """Symbols whose ``name`` score lies in ``[low, high]``."""
+    return Filter(lambda r: (r[name] >= low) & (r[name] <= high))
+
+
+@dataclass
+class Screener:
+    """
+    Scores a whole universe at once and returns top-k lists.
+
+    The lists match the Rust searches (``strongest_movers`` by alpha,
+    ``highest_volume``, ``highest_probable_alpha`` by alpha times
+    probability) but are computed from (time x symbol) arrays, so
+    thousands of symbols cost a few vector passes instead of a loop and a
+    full sort per list.
+    """
+
+    window: int = 30
+    top_n: int = 10
+    min_bars: int = 5
+    min_volume: float = 0.0
+    asset_classes: Dict[str, List[str]] = field(default_factory=dict)
+
+    RANKINGS = {
+        "strongest_movers": "alpha",
+        "highest_volume": "volume",
+        "highest_probable_alpha": "score",
+    }
+
+    @classmethod
+    def from_config(cls, config) -> "Screener":
+        """Build from the ``screener`` section of a ``Config``."""
+        section = config.get("screener", {}) or {}
+        return cls(
+            window=section.get("window", 30),
+            top_n=section.get("top_n", 10),
+            min_bars=section.get("min_bars", 5),
+            min_volume=section.get("min_volume", 0.0),
+            asset_classes=section.get("asset_classes", {}) or {},
+        )
+
+    @property
+    def default_filter(self) -> Filter:
+        return min_bars(self.min_bars) & min_volume(self.min_volume)
+
+    def score(self, close: pd.DataFrame, volume: pd.DataFrame) -> ScreenResult:
+        """
+        Score every column of wide close/volume frames.
+
+        Args:
+            close: Wide closes (``panel.wide``), one column per symbol
+            volume: Wide volumes on the same axes
+
+        Returns:
+            Aligned per-symbol scores
+        """
+        volume = volume.reindex(index=close.index, columns=close.columns)
+        symbols = np.asarray(close.columns.astype(str))
+        classes = np.array([classify(s, self.asset_classes) for s in symbols], dtype=object)
+        return ScreenResult(
+            symbols=symbols,
+            asset_class=classes,
+            scores=score_panel(close.to_numpy(), volume.to_numpy(), self.window),
+        )
+
+    def screen(
+        self,
+        close: pd.DataFrame,
+        volume: pd.DataFrame,
+        filters: Optional[Filter] = None,
+        k: Optional[int] = None,
+    ) -> Dict[str, List[Dict]]:
+        """
+        Top-k lists of the symbols passing ``filters``.
+
+        Args:
+            close: Wide closes, one column per symbol
+            volume: Wide volumes on the same axes
+            filters: Mask applied on top of the ``min_bars``/``min_volume``
+                defaults
+            k: List length, ``top_n`` by default
+
+        Returns:
+            Ranking name -> records (symbol, asset_class and scores), best
+            first
+        """
+        result = self.score(close, volume)
+        mask = self.default_filter(result)
+        if filters is not None:
+            mask &= filters(result)
+
+        k = self.top_n if k is None else k
+        return {
+            name: result.rows(top_k(result[key], k, mask))
+            for name, key in self.RANKINGS.items()
+        }
@@ -0,0 +1,70 @@
+"""Zero-copy access to copula simulations exported by the Rust model."""
+
+from pathlib import Path
+from typing import List, Union
+
+import numpy as np
+import pandas as pd
+
+
+COPULA_SIMULATIONS_FILE = "copula_simulations.bin"
+SIMULATIONS_MAGIC = b"COPSIM1\0"
+
+
+class SimulationMatrix:
+    """
+    ``n_simulations x n_assets`` copula draws (``Simulations::write_to``).
+
+    ``values`` is a read-only memory map of the file, so loading does not
+    copy or parse the draws; symbols give the column order.
+    """
+
+    def __init__(self, symbols: List[str], values: np.ndarray):
+        self.symbols = symbols
+        self.values = values
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "SimulationMatrix":
+        """
+        Map a simulations file written by the Rust model.
+
+        Args:
+            path: Path to the ``.bin`` file
+
+        Returns:
+            Matrix backed by the file
+        """
+        with open(path, "rb") as f:
+            header = f.read(32)
+            if header[:8] != SIMULATIONS_MAGIC:
+                raise ValueError(f"{path} is not a copula simulations file")
+            n_sims, n_assets, data_offset = (
+                int(v) for v in np.frombuffer(header, dtype="<u8", count=3, offset=8)
+            )
+            names = f.read(data_offset - 32)
+
+        symbols = []
+        pos = 0
+        for _ in range(n_assets):
+            length = int(np.frombuffer(names, dtype="<u4", count=1, offset=pos)[0])
+            symbols.append(names[pos + 4:pos + 4 + length].decode())
+            pos += 4 + length
+
+        if n_sims * n_assets == 0:
+            values = np.empty((n_sims, n_assets), dtype="<f8")
+        else:
+            values = np.memmap(
+                path, dtype="<f8", mode="r", offset=data_offset, shape=(n_sims, n_assets)
+            )
+        return cls(symbols, values)
+
+    def column(self, symbol: str) -> np.ndarray:
+        """Draws for one symbol (a strided view, no copy)."""
+        return self.values[:, self.symbols.index(symbol)]
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame view with one column per symbol."""
+        return pd.DataFrame(self.values, columns=self.symbols, copy=False)
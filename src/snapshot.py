@@ -0,0 +1,245 @@
+"""Bulk export and import of the Redis bar store for fast cold starts."""
+
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+
+SNAPSHOT_FILE = "redis_snapshot.npz"
+SNAPSHOT_FORMAT = "redis-snapshot-1"
+# Plain string keys saved alongside the bars
+META_PATTERNS = ("meta:*", "indicators:*")
+NO_EXPIRY = -1
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _expire_at(now_ms: int, pttl: int) -> int:
+    """Absolute expiry in ms from a PTTL reply (-1 no expiry, -2 missing)."""
+    return now_ms + pttl if pttl >= 0 else NO_EXPIRY
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def _pack(values: List[bytes]) -> Dict[str, np.ndarray]:
+    """Concatenate byte strings into one buffer plus end offsets."""
+    lengths = np.fromiter((len(v) for v in values), dtype=np.int64, count=len(values))
+    return {
+        "data": np.frombuffer(b"".join(values), dtype=np.uint8),
+        "offsets": np.cumsum(lengths),
+    }
+
+
+def _unpack(data: np.ndarray, offsets: np.ndarray) -> List[bytes]:
+    raw = data.tobytes()
+    starts = np.concatenate(([0], offsets[:-1]))
+    return [raw[s:e] for s, e in zip(starts.tolist(), offsets.tolist())]
+
+
+def _scan(client, pattern: str) -> List[str]:
+    return sorted(_text(k) for k in client.scan_iter(match=pattern, count=1000))
+
+
+def export_snapshot(
+    client,
+    path: Union[str, Path],
+    symbols: Optional[Iterable[str]] = None,
+    batch_size: int = 10_000,
+    window: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Write every stored bar and meta key to one compressed columnar file.
+
+    Bars are found through the ``symbol:{symbol}`` indexes (SCAN, never
+    KEYS) and read with pipelined MGET/PTTL batches. Values are kept as
+    the exact stored JSON, one concatenated buffer with offsets; expiries
+    are saved as absolute epoch milliseconds so a restore keeps the
+    original deadlines however long the file sat on disk.
+
+    Args:
+        client: ``redis.Redis`` connection
+        path: Output ``.npz`` file
+        symbols: Symbols to export, every indexed symbol by default
+        batch_size: Keys per pipelined round trip
+        window: Analysis window in days the data was downloaded for,
+            checked by ``import_snapshot``
+
+    Returns:
+        Counts of exported bars, symbols and meta keys
+    """
+    if symbols is None:
+        symbols = [k.split(":", 1)[1] for k in _scan(client, "symbol:*")]
+    symbols = list(symbols)
+
+    now = _now_ms()
+    row_symbol, timestamps, keys = [], [], []
+    index_expire_at = np.full(len(symbols), NO_EXPIRY, dtype=np.int64)
+
+    pipe = client.pipeline(transaction=False)
+    for symbol in symbols:
+        pipe.zrange(f"symbol:{symbol}", 0, -1, withscores=True)
+        pipe.pttl(f"symbol:{symbol}")
+    replies = pipe.execute()
+
+    for i, symbol in enumerate(symbols):
+        members, pttl = replies[2 * i], replies[2 * i + 1]
+        index_expire_at[i] = _expire_at(now, pttl)
+        for member, score in members:
+            row_symbol.append(i)
+            timestamps.append(int(score))
+            keys.append(_text(member))
+
+    values: List[bytes] = []
+    expire_at: List[int] = []
+    present: List[bool] = []
+    for start in range(0, len(keys), batch_size):
+        chunk = keys[start:start + batch_size]
+        pipe = client.pipeline(transaction=False)
+        pipe.mget(chunk)
+        for key in chunk:
+            pipe.pttl(key)
+        replies = pipe.execute()
+        for value, pttl in zip(replies[0], replies[1:]):
+            # Index members can outlive their expired records
+            present.append(value is not None)
+            values.append(value.encode() if isinstance(value, str) else value or b"")
+            expire_at.append(_expire_at(now, pttl))
+
+    keep = np.array(present, dtype=bool)
+    meta_keys = [k for pattern in META_PATTERNS for k in _scan(client, pattern)]
+    pipe = client.pipeline(transaction=False)
+    for key in meta_keys:
+        pipe.get(key)
+        pipe.pttl(key)
+    replies = pipe.execute()
+    meta_values = [v.encode() if isinstance(v, str) else v or b"" for v in replies[0::2]]
+    meta_expire_at = [_expire_at(now, pttl) for pttl in replies[1::2]]
+
+    bars = _pack([v for v, ok in zip(values, present) if ok])
+    meta = _pack(meta_values)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        path,
+        format=np.array(SNAPSHOT_FORMAT),
+        created_at=np.array(now, dtype=np.int64),
+        window=np.array(-1 if window is None else window, dtype=np.int64),
+        symbols=np.array(symbols, dtype=str),
+        index_expire_at=index_expire_at,
+        symbol_index=np.array(row_symbol, dtype=np.int32)[keep],
+        timestamp=np.array(timestamps, dtype=np.int64)[keep],
+        expire_at=np.array(expire_at, dtype=np.int64)[keep],
+        value_data=bars["data"],
+        value_offsets=bars["offsets"],
+        meta_keys=np.array(meta_keys, dtype=str),
+        meta_expire_at=np.array(meta_expire_at, dtype=np.int64),
+        meta_data=meta["data"],
+        meta_offsets=meta["offsets"],
+    )
+
+    return {
+        "bars": int(keep.sum()),
+        "symbols": len(symbols),
+        "meta_keys": len(meta_keys),
+    }
+
+
+def import_snapshot(
+    client,
+    path: Union[str, Path],
+    batch_size: int = 10_000,
+    window: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Bulk-load a snapshot written by ``export_snapshot``.
+
+    Writes go through large non-transactional pipelines. Every key gets
+    its saved absolute expiry (SET PXAT / PEXPIREAT), and entries whose
+    deadline has already passed are skipped rather than written and
+    expired.
+
+    Args:
+        client: ``redis.Redis`` connection
+        path: Snapshot ``.npz`` file
+        batch_size: Commands per pipeline flush
+        window: Expected analysis window in days; a snapshot saved for
+            another window is refused
+
+    Returns:
+        Counts of restored bars, symbols, meta keys and skipped expired bars
+    """
+    with np.load(path) as snap:
+        if str(snap["format"]) != SNAPSHOT_FORMAT:
+            raise ValueError(f"{path} is not a {SNAPSHOT_FORMAT} file")
+        saved_window = int(snap["window"]) if "window" in snap.files else -1
+        if window is not None and saved_window != window:
+            saved = f"{saved_window}-day" if saved_window >= 0 else "an unknown"
+            raise ValueError(f"{path} holds {saved} window, not {window}-day")
+        symbols = [str(s) for s in snap["symbols"]]
+        index_expire_at = snap["index_expire_at"]
+        symbol_index = snap["symbol_index"]
+        timestamps = snap["timestamp"]
+        expire_at = snap["expire_at"]
+        values = _unpack(snap["value_data"], snap["value_offsets"])
+        meta_keys = [str(k) for k in snap["meta_keys"]]
+        meta_expire_at = snap["meta_expire_at"]
+        meta_values = _unpack(snap["meta_data"], snap["meta_offsets"])
+
+    now = _now_ms()
+    live = (expire_at == NO_EXPIRY) | (expire_at > now)
+    pipe = client.pipeline(transaction=False)
+    pending = 0
+
+    def flush(force: bool = False) -> None:
+        nonlocal pipe, pending
+        if pending and (force or pending >= batch_size):
+            pipe.execute()
+            pipe = client.pipeline(transaction=False)
+            pending = 0
+
+    for i in np.flatnonzero(live).tolist():
+        symbol = symbols[symbol_index[i]]
+        timestamp = int(timestamps[i])
+        key = f"equity:{symbol}:{timestamp}"
+        deadline = int(expire_at[i])
+        if deadline == NO_EXPIRY:
+            pipe.set(key, values[i])
+        else:
+            pipe.set(key, values[i], pxat=deadline)
+        pipe.zadd(f"symbol:{symbol}", {key: timestamp})
+        pending += 2
+        flush()
+
+    for i, symbol in enumerate(symbols):
+        deadline = int(index_expire_at[i])
+        if deadline != NO_EXPIRY:
+            pipe.pexpireat(f"symbol:{symbol}", deadline)
+            pending += 1
+        # The Java API builds ETags from this counter; restored data is new data
+        pipe.incr(f"version:{symbol}")
+        pending += 1
+
+    for key, value, deadline in zip(meta_keys, meta_values, meta_expire_at.tolist()):
+        if deadline == NO_EXPIRY:
+            pipe.set(key, value)
+        elif deadline > now:
+            pipe.set(key, value, pxat=deadline)
+        else:
+            continue
+        pending += 1
+        flush()
+
+    flush(force=True)
+
+    return {
+        "bars": int(live.sum()),
+        "symbols": len(symbols),
+        "meta_keys": len(meta_keys),
+        "expired": int((~live).sum()),
+    }
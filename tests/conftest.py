@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+DAY_MS = 86_400_000
+
+
+def make_bars(symbol: str, timestamps, seed: int = 0, start: float = 100.0) -> pd.DataFrame:
+    """Long-format random-walk bars for one symbol."""
+    rng = np.random.default_rng(seed)
+    n = len(timestamps)
+    close = start * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame(
+        {
+            "symbol": symbol,
+            "timestamp": np.asarray(timestamps, dtype=np.int64),
+            "close": close,
+            "volume": rng.uniform(1e5, 1e6, n).round(),
+        }
+    )
+
+
+@pytest.fixture
+def mixed_calendar():
+    """A weekday-only stock next to a 24/7 crypto pair over 120 days."""
+    days = np.arange(120)
+    weekdays = days[days % 7 < 5]
+    stock = make_bars("NVDA", weekdays * DAY_MS, seed=1)
+    crypto = make_bars("ETHUSD", days * DAY_MS, seed=2, start=2000.0)
+    return stock, crypto
@@ -0,0 +1,65 @@
+import fakeredis
+import pytest
+
+from src.events import EVENTS_KEY, BarSubscriber
+
+
+class Crash(Exception):
+    pass
+
+
+def _publish(client, symbols):
+    for i, symbol in enumerate(symbols):
+        client.xadd(EVENTS_KEY, {"symbol": symbol, "timestamp": 1000 + i, "count": 1})
+
+
+def _collect(subscriber, limit):
+    seen = []
+
+    def handle(events):
+        seen.extend(events)
+
+    subscriber.run(handle, should_stop=lambda: len(seen) >= limit)
+    return seen
+
+
+def _crash_before_ack(subscriber):
+    def handle(events):
+        raise Crash()
+
+    with pytest.raises(Crash):
+        subscriber.run(handle)
+
+
+@pytest.fixture
+def client():
+    return fakeredis.FakeStrictRedis()
+
+
+def test_restart_replays_pending_entries(client):
+    first = BarSubscriber(client, consumer="worker-1", block_ms=10, claim_idle_ms=None)
+    _publish(client, ["NVDA", "AMD"])
+    _crash_before_ack(first)
+    assert client.xpending(EVENTS_KEY, "pipeline")["pending"] == 2
+
+    restarted = BarSubscriber(client, consumer="worker-1", block_ms=10, claim_idle_ms=None)
+    events = _collect(restarted, 2)
+
+    assert [e.symbol for e in events] == ["NVDA", "AMD"]
+    assert client.xpending(EVENTS_KEY, "pipeline")["pending"] == 0
+
+
+def test_default_consumer_name_is_stable(client):
+    assert BarSubscriber(client).consumer == BarSubscriber(client).consumer
+
+
+def test_idle_entries_of_other_consumers_are_claimed(client):
+    gone = BarSubscriber(client, consumer="old-host", block_ms=10)
+    _publish(client, ["GS"])
+    _crash_before_ack(gone)
+
+    other = BarSubscriber(client, consumer="new-host", block_ms=10, claim_idle_ms=0)
+    events = _collect(other, 1)
+
+    assert [e.symbol for e in events] == ["GS"]
+    assert client.xpending(EVENTS_KEY, "pipeline")["pending"] == 0
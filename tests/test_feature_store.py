@@ -0,0 +1,36 @@
+import fakeredis
+import numpy as np
+import pandas as pd
+
+from conftest import DAY_MS, make_bars
+from src.feature_store import DiskBackend, FeatureStore, RedisBackend
+
+
+def _values(frame: pd.DataFrame, symbol: str) -> np.ndarray:
+    rows = frame[frame["symbol"] == symbol].sort_values("timestamp")
+    return rows.drop(columns=["symbol", "timestamp"]).to_numpy()
+
+
+def test_entry_does_not_depend_on_batch(tmp_path, mixed_calendar):
+    stock, crypto = mixed_calendar
+    both = pd.concat([stock, crypto], ignore_index=True)
+
+    batched = FeatureStore(DiskBackend(tmp_path / "a")).get_or_compute(both, window=60)
+    alone = FeatureStore(DiskBackend(tmp_path / "b")).get_or_compute(stock, window=60)
+
+    np.testing.assert_array_equal(_values(batched, "NVDA"), _values(alone, "NVDA"))
+    assert np.isfinite(_values(batched, "NVDA")[:, -1]).all()
+
+
+def test_reads_fresh_entries_and_recomputes_stale(mixed_calendar):
+    stock, _ = mixed_calendar
+    store = FeatureStore(RedisBackend(fakeredis.FakeStrictRedis()))
+
+    first = store.get_or_compute(stock, window=30)
+    assert len(first) == 30
+    assert store.get("NVDA", 30).last_timestamp == stock["timestamp"].max()
+
+    newer = make_bars("NVDA", [stock["timestamp"].max() + DAY_MS], seed=9)
+    updated = store.get_or_compute(pd.concat([stock, newer], ignore_index=True), window=30)
+    assert updated["timestamp"].max() == newer["timestamp"].iloc[0]
+    assert store.get("NVDA", 30, last_bar=int(newer["timestamp"].iloc[0])) is not None
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from src.features import FeatureEngine
+from src.indicators import IndicatorState
+
+
+def _by_timestamp(frame: pd.DataFrame, symbol: str) -> pd.DataFrame:
+    return frame[frame["symbol"] == symbol].set_index("timestamp").drop(columns="symbol")
+
+
+def test_mixed_calendar_matches_symbol_alone(mixed_calendar):
+    stock, crypto = mixed_calendar
+    engine = FeatureEngine()
+
+    together = engine.compute(pd.concat([stock, crypto], ignore_index=True))
+    alone = engine.compute(stock)
+
+    mixed = _by_timestamp(together, "NVDA")
+    single = _by_timestamp(alone, "NVDA")
+    assert len(mixed) == len(stock)
+    pd.testing.assert_frame_equal(mixed, single, check_dtype=False)
+
+    # Full windows exist once the stock has enough of its own bars
+    for name in ("sma_10", "sma_20", "sma_50", "volatility_20d", "return_20d"):
+        assert mixed[name].notna().sum() > 0, name
+
+
+def test_returns_count_own_bars(mixed_calendar):
+    stock, crypto = mixed_calendar
+    frame = FeatureEngine(return_horizons=(5,)).compute(pd.concat([stock, crypto]))
+    nvda = _by_timestamp(frame, "NVDA")
+
+    close = stock["close"].to_numpy()
+    expected = close[5:] / close[:-5] - 1
+    np.testing.assert_allclose(nvda["return_5d"].to_numpy()[5:], expected)
+
+
+def test_indicator_state_matches_compute_panel(mixed_calendar):
+    stock, crypto = mixed_calendar
+    engine = FeatureEngine()
+    frame = _by_timestamp(engine.compute(pd.concat([crypto, stock])), "NVDA")
+
+    state = IndicatorState(engine)
+    rows = state.backfill(stock["close"].tolist(), stock["volume"].tolist())
+    incremental = pd.DataFrame(rows, index=frame.index)[engine.feature_names]
+
+    np.testing.assert_allclose(
+        incremental.to_numpy(), frame[engine.feature_names].to_numpy(), rtol=1e-9, atol=1e-9
+    )
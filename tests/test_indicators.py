@@ -0,0 +1,58 @@
+import math
+
+import fakeredis
+import numpy as np
+import pytest
+
+from src.features import FeatureEngine
+from src.indicators import IndicatorState, RollingStats
+
+
+def _same(a, b):
+    assert a.keys() == b.keys()
+    for name in a:
+        if math.isnan(a[name]):
+            assert math.isnan(b[name]), name
+        else:
+            assert a[name] == pytest.approx(b[name], rel=1e-12, abs=1e-12), name
+
+
+def test_checkpoint_round_trip_continues_identically(mixed_calendar):
+    stock, _ = mixed_calendar
+    closes, volumes = stock["close"].tolist(), stock["volume"].tolist()
+    client = fakeredis.FakeStrictRedis()
+
+    original = IndicatorState(FeatureEngine())
+    original.backfill(closes[:60], volumes[:60], stock["timestamp"].tolist()[:60])
+    original.save(client, "NVDA")
+    restored = IndicatorState.load(client, "NVDA")
+
+    assert restored.last_timestamp == original.last_timestamp
+    for close, volume in zip(closes[60:], volumes[60:]):
+        _same(original.update(close, volume), restored.update(close, volume))
+
+
+def test_load_missing_checkpoint():
+    assert IndicatorState.load(fakeredis.FakeStrictRedis(), "NONE") is None
+
+
+def test_load_ignores_checkpoint_of_other_engine():
+    client = fakeredis.FakeStrictRedis()
+    IndicatorState(FeatureEngine()).save(client, "NVDA")
+
+    assert IndicatorState.load(client, "NVDA", FeatureEngine()) is not None
+    assert IndicatorState.load(client, "NVDA", FeatureEngine(rsi_period=7)) is None
+
+
+def test_rolling_stats_needs_full_window():
+    stats = RollingStats(3)
+    for value in (1.0, 2.0):
+        stats.update(value)
+    assert stats.mean is None
+
+    stats.update(3.0)
+    assert stats.mean == pytest.approx(2.0)
+    assert stats.std == pytest.approx(np.std([1.0, 2.0, 3.0]))
+
+    stats.update(None)
+    assert stats.mean is None
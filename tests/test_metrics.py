@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from src.metrics import horizon_metrics, records_panel, summarize
+
+
+def _records(closes, volume=100.0):
+    return [{"close": c, "volume": volume} for c in closes]
+
+
+def test_records_panel_right_aligns_short_histories():
+    symbols, close, volume = records_panel({"A": _records([1, 2, 3]), "B": _records([5]), "C": []})
+
+    assert symbols == ["A", "B"]
+    assert close[-1].tolist() == [3, 5]
+    assert np.isnan(close[:2, 1]).all()
+
+
+def test_horizon_metrics_match_direct_computation():
+    rng = np.random.default_rng(0)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 60)))
+    volumes = rng.uniform(1, 2, 60)
+    _, close, volume = records_panel(
+        {"A": [{"close": c, "volume": v} for c, v in zip(closes, volumes)]}
+    )
+
+    m = horizon_metrics(close, volume, [14, 100])
+
+    window = closes[-15:]
+    log_returns = np.diff(np.log(window))
+    assert m[14]["change"][0] == pytest.approx(window[-1] / window[0] - 1)
+    assert m[14]["avg_volume"][0] == pytest.approx(volumes[-15:].mean())
+    assert m[14]["volatility"][0] == pytest.approx(log_returns.std(ddof=1) * np.sqrt(252))
+    assert m[14]["max_drawdown"][0] == pytest.approx((window / np.maximum.accumulate(window) - 1).min())
+    # Longer than the history: the whole history
+    assert m[100]["change"][0] == pytest.approx(closes[-1] / closes[0] - 1)
+    assert m[100]["bars"][0] == 60
+
+
+def test_summarize_keeps_legacy_keys():
+    summary = summarize({"A": _records([100, 110]), "B": _records([50, 40, 45])}, horizons=[14])
+
+    assert summary["symbols"] == ["A", "B"]
+    assert summary["total_records"] == 5
+    assert summary["changes_14d"] == {"A": 10.0, "B": -10.0}
+    assert summary["metrics"]["B"]["14d"]["max_drawdown"] == -20.0
@@ -0,0 +1,74 @@
+import fakeredis
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import DAY_MS, make_bars
+from src.events import BarEvent
+from src.pipeline import FinancialMLPipeline
+
+
+BARS = make_bars("NVDA", np.arange(300) * DAY_MS, seed=3)
+
+
+class FakeJava:
+    """Serves the first ``available`` bars of ``BARS`` and records requests."""
+
+    def __init__(self):
+        self.available = 0
+        self.requests = []
+
+    def __call__(self, symbol, limit=100, start=None, end=None):
+        self.requests.append({"symbol": symbol, "limit": limit, "start": start})
+        bars = BARS.iloc[: self.available]
+        if start is not None:
+            bars = bars[bars["timestamp"] >= start]
+        return bars.tail(limit).reset_index(drop=True)
+
+
+@pytest.fixture
+def java():
+    return FakeJava()
+
+
+@pytest.fixture
+def new_pipeline(java, monkeypatch):
+    """Pipelines sharing one Redis and the fake Java backend, as across restarts."""
+    client = fakeredis.FakeStrictRedis()
+    monkeypatch.setattr(FinancialMLPipeline, "_redis_client", lambda self: client)
+    monkeypatch.setattr(FinancialMLPipeline, "load_flat_forest", lambda self: None)
+
+    def build():
+        pipeline = FinancialMLPipeline()
+        pipeline.get_data_from_java = java
+        return pipeline
+
+    return build
+
+
+def _event(n):
+    return BarEvent("NVDA", int(BARS["timestamp"].iloc[n - 1]))
+
+
+def test_restart_resumes_from_indicator_checkpoint(java, new_pipeline):
+    java.available = 250
+    new_pipeline().apply_bar_events([_event(250)])
+    assert java.requests[-1]["start"] is None
+
+    java.available = 260
+    update = new_pipeline().apply_bar_events([_event(260)])["NVDA"]
+
+    assert java.requests[-1]["start"] == BARS["timestamp"].iloc[249] + 1
+    assert update["timestamp"] == BARS["timestamp"].iloc[259]
+
+
+def test_bar_events_evict_only_their_symbols(java, new_pipeline):
+    pipeline = new_pipeline()
+    for symbol in ("NVDA", "AMD"):
+        pipeline.response_cache.put((symbol, None, None, 100, 0), pd.DataFrame({"close": [1.0]}))
+
+    java.available = 10
+    pipeline.apply_bar_events([_event(10)])
+
+    assert pipeline.response_cache.lookup(("NVDA", None, None, 100, 0)) is None
+    assert pipeline.response_cache.lookup(("AMD", None, None, 100, 0)) is not None
@@ -0,0 +1,54 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.scenarios import ScenarioEngine
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(3)
+    mixed = rng.multivariate_normal([0.001, 0.0, 0.0005], [[1, 0.5, 0.2], [0.5, 1, 0.3], [0.2, 0.3, 1]], 250)
+    return pd.DataFrame(mixed * 0.01, columns=["AMD", "GS", "NVDA"])
+
+
+def test_qmc_stream_uses_equal_power_of_two_chunks(returns):
+    engine = ScenarioEngine(random_state=1, sampling="qmc", n_replicates=8).fit_returns(returns)
+
+    seen = []
+    original = engine._draw
+
+    def draw(rng, n_paths, n_steps):
+        seen.append(n_paths)
+        return original(rng, n_paths, n_steps)
+
+    engine._draw = draw
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        summary = engine.stream(1000, n_steps=5)
+
+    assert len(set(seen)) == 1
+    assert seen[0] & (seen[0] - 1) == 0
+    assert summary.n_simulations == sum(seen) >= 1000
+
+
+def test_qmc_uneven_chunks_do_not_warn(returns):
+    engine = ScenarioEngine(random_state=1, sampling="qmc", chunk_size=100).fit_returns(returns)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        paths = engine.simulate(250, n_steps=3)
+    assert paths.shape == (250, 3, 3)
+
+
+def test_update_does_not_mutate_cached_factor(returns):
+    engine = ScenarioEngine(random_state=1).fit_returns(returns.iloc[:200])
+    held = engine._cholesky
+    before = held.copy()
+
+    engine.update(returns.iloc[200:].to_numpy(), decay=0.9)
+
+    np.testing.assert_array_equal(held, before)
+    np.testing.assert_allclose(engine._cholesky @ engine._cholesky.T, engine.correlation, atol=1e-10)
+    np.testing.assert_allclose(np.diag(engine.correlation), 1.0)
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import DAY_MS, make_bars
+from src.panel import normalize, wide_views
+from src.screener import Screener, asset_class, classify, min_bars, min_volume, score_panel, top_k
+
+
+def _views(*frames):
+    views = wide_views(normalize(pd.concat(frames, ignore_index=True), np.float64), ["close", "volume"])
+    return views["close"], views["volume"]
+
+
+def _rust_alpha(closes):
+    returns = np.diff(closes) / closes[:-1]
+    std = returns.std()
+    return 0.0 if std == 0 else returns.mean() / std * np.sqrt(len(returns))
+
+
+def test_top_k_is_partial_and_ordered():
+    values = np.array([3.0, np.nan, 9.0, 1.0, 7.0, 5.0])
+    assert top_k(values, 3).tolist() == [2, 4, 5]
+    assert top_k(values, 10).tolist() == [2, 4, 5, 0, 3]
+    assert top_k(values, 2, mask=values < 8).tolist() == [4, 5]
+    assert top_k(values, 0).size == 0
+
+
+def test_scores_use_each_symbols_own_last_bars(mixed_calendar):
+    stock, crypto = mixed_calendar
+    close, volume = _views(stock, crypto)
+    scores = score_panel(close.to_numpy(), volume.to_numpy(), window=30)
+
+    j = list(close.columns).index("NVDA")
+    own = stock["close"].to_numpy()[-30:]
+    assert scores["alpha"][j] == pytest.approx(_rust_alpha(own))
+    assert scores["change"][j] == pytest.approx((own[-1] - own[0]) / own[0] * 100)
+    assert scores["volume"][j] == pytest.approx(stock["volume"].to_numpy()[-30:].mean())
+    assert scores["bars"][j] == len(stock)
+
+
+def test_filters_compose(mixed_calendar):
+    stock, crypto = mixed_calendar
+    short = make_bars("GS", np.arange(3) * DAY_MS, seed=4)
+    close, volume = _views(stock, crypto, short)
+    screener = Screener(asset_classes={"crypto": ["ETHUSD"]})
+
+    everything = screener.screen(close, volume)
+    assert {r["symbol"] for r in everything["highest_volume"]} == {"NVDA", "ETHUSD"}
+
+    crypto_only = screener.screen(close, volume, asset_class("crypto"))
+    assert [r["symbol"] for r in crypto_only["strongest_movers"]] == ["ETHUSD"]
+
+    stocks = screener.screen(close, volume, ~asset_class("crypto") & min_bars(1) | min_volume(1e12))
+    assert [r["symbol"] for r in stocks["highest_volume"]] == ["NVDA"]
+
+
+def test_classify_falls_back_to_suffixes():
+    assert classify("EURUSD=X") == "forex"
+    assert classify("ETH-USD") == "crypto"
+    assert classify("NVDA") == "stock"
+    assert classify("MNQ", {"index": ["MNQ"]}) == "index"
@@ -0,0 +1,63 @@
+import json
+import time
+
+import fakeredis
+import pytest
+
+from src.snapshot import export_snapshot, import_snapshot
+
+
+def _store(client, symbol, timestamp, ttl_ms=None):
+    key = f"equity:{symbol}:{timestamp}"
+    client.set(key, json.dumps({"symbol": symbol, "timestamp": timestamp}), px=ttl_ms)
+    client.zadd(f"symbol:{symbol}", {key: timestamp})
+    return key
+
+
+@pytest.fixture
+def client():
+    return fakeredis.FakeStrictRedis()
+
+
+def test_round_trip_keeps_values_and_deadlines(client, tmp_path):
+    kept = _store(client, "NVDA", 1000, ttl_ms=3_600_000)
+    _store(client, "NVDA", 2000)
+    client.set("meta:last_run", "ok")
+    path = tmp_path / "snap.npz"
+
+    counts = export_snapshot(client, path, window=14)
+    assert counts == {"bars": 2, "symbols": 1, "meta_keys": 1}
+
+    deadline = client.pexpiretime(kept)
+    client.flushall()
+    restored = import_snapshot(client, path, window=14)
+
+    assert restored["bars"] == 2 and restored["expired"] == 0
+    assert client.zrange("symbol:NVDA", 0, -1) == [kept.encode(), b"equity:NVDA:2000"]
+    assert json.loads(client.get(kept))["timestamp"] == 1000
+    assert abs(client.pexpiretime(kept) - deadline) <= 1
+    assert client.get("meta:last_run") == b"ok"
+    assert client.get("version:NVDA") == b"1"
+
+
+def test_expired_bars_are_skipped(client, tmp_path):
+    _store(client, "GS", 1000, ttl_ms=50)
+    _store(client, "GS", 2000)
+    path = tmp_path / "snap.npz"
+    export_snapshot(client, path)
+
+    time.sleep(0.1)
+    client.flushall()
+    restored = import_snapshot(client, path)
+
+    assert restored["expired"] == 1
+    assert client.zrange("symbol:GS", 0, -1) == [b"equity:GS:2000"]
+
+
+def test_window_mismatch_is_refused(client, tmp_path):
+    _store(client, "AMD", 1000)
+    path = tmp_path / "snap.npz"
+    export_snapshot(client, path, window=14)
+
+    with pytest.raises(ValueError, match="14-day"):
+        import_snapshot(client, path, window=240)